@@ -7,70 +7,178 @@ import urllib2
 import io
 import cStringIO
 import json
-from subprocess import *
-import subprocess
+import copy
+import importlib
+import datetime
 import dateutil.parser
+import dateutil.tz
 from warnings import warn
 from BaseSpacePy.model import *
+from BaseSpacePy.model.BaseModel import UNSET
 from BaseSpacePy.api.BaseSpaceException import RestMethodException, ServerResponseException
+from BaseSpacePy.api.ConnectionPool import ConnectionPool, FileRegion
+from BaseSpacePy.api.RetryPolicy import RetryPolicy
+from BaseSpacePy.api.RequestCoalescer import RequestCoalescer
 
 
 class APIClient:
-    def __init__(self, AccessToken, apiServerAndVersion, userAgent=None, timeout=10):
+    def __init__(self, AccessToken, apiServerAndVersion, userAgent=None, timeout=10, connectionPool=None, retryPolicy=None, rateLimiter=None, responseCache=None, metadataCache=None, coalesceRequests=False, lazyDeserialization=False):
         '''
         Initialize the API instance
         
         :param AccessToken: an access token
         :param apiServerAndVersion: the URL of the BaseSpace api server with api version
         :param timeout: (optional) the timeout in seconds for each request made, default 10
+        :param connectionPool: (optional) a ConnectionPool of keep-alive connections to use for requests, default is a new pool
+        :param retryPolicy: (optional) a RetryPolicy for failed requests, default is a RetryPolicy with default settings (up to 5 attempts, see RetryPolicy)
+        :param rateLimiter: (optional) a RateLimiter consulted before each request (including retries), default None (no limit)
+        :param responseCache: (optional) a ResponseCache for GET responses, default None (no caching)
+        :param metadataCache: (optional) a MetadataCache for the responses of immutable resources (used by BaseAPI), default None (no caching)
+        :param coalesceRequests: (optional) let concurrent identical GET requests share a single call to the server, default False
+        :param lazyDeserialization: (optional) deserialize nested objects, lists and datetimes of models on first access, default False
         '''
         self.apiKey = AccessToken
         self.apiServerAndVersion = apiServerAndVersion
         self.userAgent = userAgent
         self.timeout = timeout
+        if connectionPool is None:
+            connectionPool = ConnectionPool()
+        self.connectionPool = connectionPool
+        if retryPolicy is None:
+            retryPolicy = RetryPolicy()
+        self.retryPolicy = retryPolicy
+        self.rateLimiter = rateLimiter
+        self.responseCache = responseCache
+        self.metadataCache = metadataCache
+        self.coalescer = RequestCoalescer() if coalesceRequests else None
+        self.lazyDeserialization = lazyDeserialization
+
+    def __retryingCall__(self, method, url, body, headers):
+        '''
+        Makes a request on a pooled connection, retrying failures according to the retry policy.
+        Idempotent requests (GET, PUT) are retried after connection errors and retryable http statuses;
+        other requests are retried only when the server refuses them with 429 or 503.
+        
+        :param method: the http method, eg. GET
+        :param url: the full url, including server address, api version and query string
+        :param body: the request body, a string or a file-like object (which is rewound before a retry), or None
+        :param headers: a dictionary of header key/values to include in call
+        :raises ServerResponseException: if the connection to the server fails on the last attempt
+        :returns: a tuple of (http status code, dictionary of response headers, response body string)
+        '''
+        idempotent = method in ['GET', 'PUT']
+        state = self.retryPolicy.begin()
+        while True:
+            if self.rateLimiter is not None:
+                self.rateLimiter.acquire('api')
+            try:
+                status, respHeaders, response = self.connectionPool.request(method, url, body, headers, self.timeout)
+            except ServerResponseException as e:
+                if not (idempotent and state.retry(exc=e)):
+                    raise
+            else:
+                if not (idempotent or status in [429, 503]):
+                    return status, respHeaders, response
+                if not state.retry(status=status, retryAfter=respHeaders.get('retry-after')):
+                    return status, respHeaders, response
+            if hasattr(body, 'seek'):
+                body.seek(0)
+
+    def __getCall__(self, url, headers):
+        '''
+        Performs a GET call, using the response cache if there is one
+        
+        :param url: the full url, including server address, api version and query string
+        :param headers: a dictionary of header key/values to include in call
+        :raises ServerResponseException: for errors in parsing json response from server
+        :returns: the server response deserialized to a python object (dict)
+        '''
+        if self.responseCache is not None:
+            return self.__cachedGetCall__(url, headers)
+        # http errors are treated as a response (handled in caller)
+        status, respHeaders, response = self.__retryingCall__('GET', url, None, headers)
+        try:
+            return json.loads(response)
+        except ValueError as e:
+            raise ServerResponseException('Error decoding json in server response')
+
+    def __cachedGetCall__(self, url, headers):
+        '''
+        Performs a GET call using the response cache. A fresh cached response is returned without a request;
+        a stale response with an ETag or Last-Modified header is revalidated with a conditional GET.
+        
+        :param url: the full url, including server address, api version and query string
+        :param headers: a dictionary of header key/values to include in call
+        :raises ServerResponseException: for errors in parsing json response from server
+        :returns: the server response deserialized to a python object (dict)
+        '''
+        cache = self.responseCache
+        key = cache.makeKey(url, self.apiKey)
+        entry = cache.get(key)
+        if entry is not None:
+            if entry.isFresh():
+                cache.recordHit()
+                return entry.data
+            if entry.hasValidators():
+                headers = dict(headers)
+                if entry.etag:
+                    headers['If-None-Match'] = entry.etag
+                if entry.lastModified:
+                    headers['If-Modified-Since'] = entry.lastModified
+        status, respHeaders, response = self.__retryingCall__('GET', url, None, headers)
+        if status == 304 and entry is not None:
+            cache.refresh(entry)
+            cache.recordHit(revalidated=True)
+            return entry.data
+        cache.recordMiss()
+        try:
+            data = json.loads(response)
+        except ValueError as e:
+            raise ServerResponseException('Error decoding json in server response')
+        if status == 200 and 'no-store' not in respHeaders.get('cache-control', ''):
+            cache.put(key, data, len(response), respHeaders.get('etag'), respHeaders.get('last-modified'))
+        return data
 
     def __forcePostCall__(self, resourcePath, postData, headers):
         '''
-        For forcing a REST POST request using pycurl (seems to be used when POSTing with no post data)
+        For forcing a REST POST request (seems to be used when POSTing with no post data)
                 
         :param resourcePath: the url to call, including server address and api version
         :param postData: a dictionary of data to post
         :param headers: a dictionary of header key/values to include in call
         :returns: server response (a string containing json)
         '''
-        import requests
-        # pycurl is hard to get working, so best to cauterise it into only the functions where it is needed
-        # import pycurl
-        # postData = [(p,postData[p]) for p in postData]
-        # headerPrep  = [k + ':' + headers[k] for k in headers.keys()]
-        # response = cStringIO.StringIO()
-        # c = pycurl.Curl()
-        # c.setopt(pycurl.URL,resourcePath + '?' + post)
-        # c.setopt(pycurl.HTTPHEADER, headerPrep)
-        # c.setopt(pycurl.POST, 1)
-        # c.setopt(pycurl.POSTFIELDS, post)
-        # c.setopt(c.WRITEFUNCTION, response.write)
-        # c.perform()
-        # c.close()
-        # return response.getvalue()
         encodedPost =  urllib.urlencode(postData)
         resourcePath = "%s?%s" % (resourcePath, encodedPost)
-        response = requests.post(resourcePath, data=json.dumps(postData), headers=headers)
-        return response.text
+        status, respHeaders, response = self.__retryingCall__('POST', resourcePath, json.dumps(postData), headers)
+        return response
 
     def __putCall__(self, resourcePath, headers, transFile):
         '''
-        Performs a REST PUT call to the API server.
+        Performs a REST PUT call to the API server, streaming the request body on a pooled connection.
         
         :param resourcePath: the url to call, including server address and api version        
-        :param headers: a dictionary of header key/values to include in call        
-        :param transFile: the name of the file containing only data to be PUT
-        :returns: server response (a string containing upload status message (from curl?) followed by json response)
+        :param headers: a dictionary of header key/values to include in call, including Content-MD5
+        :param transFile: the data to be PUT: the name of a file, a FileRegion of a file, or a string buffer
+        :raises ServerResponseException: for errors in parsing json response from server
+        :returns: a tuple of the server response deserialized to a python object (dict), and the http status code
         '''
-        headerPrep  = [k + ':' + headers[k] for k in headers.keys()]        
-        cmd = 'curl -H "x-access-token:' + self.apiKey + '" -H "Content-MD5:' + headers['Content-MD5'].strip() +'" -T "'+ transFile +'" -X PUT ' + resourcePath
-        p = Popen(cmd, shell=True, stdin=PIPE, stdout=PIPE, stderr=STDOUT, close_fds=True)
-        return p.stdout.read()
+        headers = dict(headers)
+        if 'Content-MD5' in headers:
+            headers['Content-MD5'] = headers['Content-MD5'].strip()
+        if isinstance(transFile, basestring) and os.path.isfile(transFile):
+            transFile = FileRegion(transFile)
+        headers['Content-Length'] = str(len(transFile))
+        try:
+            status, respHeaders, response = self.__retryingCall__('PUT', resourcePath, transFile, headers)
+        finally:
+            if isinstance(transFile, FileRegion):
+                transFile.close()
+        try:
+            data = json.loads(response)
+        except ValueError as e:
+            raise ServerResponseException('Error decoding json in server response')
+        return data, status
 
     def callAPI(self, resourcePath, method, queryParams, postData, headerParams=None, forcePost=False):
         '''
@@ -80,13 +188,17 @@ class APIClient:
         If a Content-Type header isn't included, one will be added with 'application/json' (except for PUT and forcePost calls).
         Query parameters with values of None aren't sent to the server.
         Server errors are to be handled by the caller (returned response contains error codes/msgs).
+        Requests are made on keep-alive connections from the client's ConnectionPool, and failed requests are retried according to the client's RetryPolicy.
+        If the client has a RateLimiter, each request waits for the limiter's api budget.
+        If the client has a ResponseCache, GET responses are served from (and stored in) the cache, and other calls invalidate the cached responses of their resource.
+        If request coalescing is on, a GET identical to one already in flight in another thread waits for and shares that call's response.
         
         :param resourcePath: the url to call, not including server address and api version
         :param method: REST method, including GET, POST (and forcePost, see below), and PUT (DELETE not yet supported)
         :param queryParams: dictionary of query parameters to be added to url, except for forcePost where they are added as 'postData'; not used for PUT calls
-        :param postData: for POST calls, a dictionary to post; not used for forcePost calls; for PUT calls, name of file to put
+        :param postData: for POST calls, a dictionary to post; not used for forcePost calls; for PUT calls, name of file or FileRegion to put
         :param headerParams: (optional) a dictionary of header data, default None
-        :param forcePost: (optional) 'force' a POST call using curl (instead of urllib), default False
+        :param forcePost: (optional) 'force' a POST call even without post data, default False
 
         :raises RestMethodException: for unrecognized REST method
         :raises ServerResponseException: for errors in parsing json response from server, and for urlerrors from the opening url
@@ -105,6 +217,14 @@ class APIClient:
         # include access token in header 
         headers['Authorization'] = 'Bearer ' + self.apiKey
         
+        # POSTs and PUTs modify the resource, so its cached responses are out of date
+        if method != 'GET':
+            modifiedResource = '/'.join(resourcePath.split('/')[:3])
+            if self.responseCache is not None:
+                self.responseCache.invalidate(modifiedResource)
+            if self.metadataCache is not None:
+                self.metadataCache.invalidate(modifiedResource)
+
         data = None
         if method == 'GET':
             if queryParams:
@@ -114,7 +234,7 @@ class APIClient:
                     if value != None:
                         sentQueryParams[param] = value
                 url = url + '?' + urllib.urlencode(sentQueryParams)
-            request = urllib2.Request(url=url, headers=headers)
+            httpMethod = 'GET'
         elif method in ['POST', 'PUT', 'DELETE']:
             if queryParams:
                 # Need to remove None values, these should not be sent
@@ -125,31 +245,35 @@ class APIClient:
                 forcePostUrl = url 
                 url = url + '?' + urllib.urlencode(sentQueryParams)
             data = postData
-            if data:
+            if data is not None and method != 'PUT':
                 if type(postData) not in [str, int, float, bool]:
                     data = json.dumps(postData)
+                else:
+                    data = str(postData)
             if not forcePost:
-                if data and not len(data): 
+                if method != 'PUT' and data is not None and not len(data):
                     data='\n' # temp fix, in case is no data in the file, to prevent post request from failing
-                request = urllib2.Request(url=url, headers=headers, data=data)#,timeout=self.timeout)
-            else:                                    # use pycurl to force a post call, even w/o data
+                # as with urllib, a POST without data is sent as a GET
+                httpMethod = 'POST' if data is not None else 'GET'
+            else:                                    # force a post call, even w/o data
                 response = self.__forcePostCall__(forcePostUrl, sentQueryParams, headers)
-            if method in ['PUT', 'DELETE']: #urllib doesnt do put and delete, default to pycurl here
+            if method in ['PUT', 'DELETE']:
                 if method == 'DELETE':
                     raise NotImplementedError("DELETE REST API calls aren't currently supported")
-                response = self.__putCall__(url, headers, data)
-                response =  response.split()[-1] # discard upload status msg (from curl put?)                
+                data, status = self.__putCall__(url, headers, data)
+                return data
         else:
             raise RestMethodException('Method ' + method + ' is not recognized.')
 
         # Make the request
+        if method == 'GET':
+            if self.coalescer is not None:
+                key = ('json', url, self.coalescer.makeKey(headers))
+                return self.coalescer.call(key, lambda: self.__getCall__(url, headers), copy=copy.deepcopy, timeout=self.timeout)
+            return self.__getCall__(url, headers)
         if not forcePost and not method in ['PUT', 'DELETE']: # the normal case
-            try:
-             response = urllib2.urlopen(request, timeout=self.timeout).read()
-            except urllib2.HTTPError as e:                
-                response = e.read() # treat http error as a response (handle in caller)                
-            except urllib2.URLError as e:
-                raise ServerResponseException('URLError: ' + str(e))            
+            # http errors are treated as a response (handled in caller)
+            status, respHeaders, response = self.__retryingCall__(httpMethod, url, data, headers)
         try:
             data = json.loads(response)
         except ValueError as e:
@@ -159,93 +283,170 @@ class APIClient:
     def deserialize(self, obj, objClass):
         """
         Deserialize a JSON string into a BaseSpacePy object.
+        
+        The swaggerTypes of each model class are compiled once into a deserialization plan,
+        which resolves nested model classes, list element types and DynamicType tables ahead of time.
+
+        In lazy mode (lazyDeserialization), only native attributes (str, int, float, bool, dict) are set right away;
+        the model keeps the decoded json of its other attributes (nested objects, lists and datetimes), and deserializes
+        each of them on its first access. This is faster when only a few attributes of each object are read.
 
         :param obj: A dictionary (or object?) to be deserialized into a class (objClass); or a value to be passed into a new native python type (objClass)
         :param objClass: A class object or native python type for the deserialized object, or a string of a class name or native python type. (eg, Project.Project, int, 'Project', 'int') 
         :returns: A deserialized object
         """        
-        # Create an object class from objClass, if a string was passed in
-        # Avoid native python types 'file'
-        if type(objClass) == str:            
+        if type(objClass) == str:
+            objClass = _resolveType(objClass)
+        return _deserialize(obj, objClass, self.lazyDeserialization)
+
+
+# python types that may be named (case-insensitively) in swaggerTypes, eg. 'str' or 'Str'
+_NATIVE_TYPES = {'str': str, 'int': int, 'float': float, 'bool': bool, 'dict': dict, 'list': list, 'long': long, 'unicode': unicode}
+
+# swaggerTypes that are deserialized right away, also in lazy mode
+_EAGER_TYPES = ('str', 'int', 'float', 'bool', 'dict')
+
+# the timestamp format of BaseSpace, eg. 2014-08-07T18:54:52.0000000 (optionally with a trailing Z for UTC)
+_TIMESTAMP = re.compile(r'(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)(?:\.(\d+))?(Z?)$')
+_UTC = dateutil.tz.tzutc()
+
+# cache of resolved swaggerType names, and of deserialization plans keyed by model class and lazy mode
+_RESOLVED_TYPES = {}
+_DESERIALIZATION_PLANS = {}
+
+
+def _parseDatetime(value):
+    '''
+    Parses a BaseSpace timestamp into a datetime, with the same result as dateutil.parser.parse;
+    values in other formats are parsed by dateutil
+    '''
+    try:
+        match = _TIMESTAMP.match(value)
+    except TypeError:
+        match = None
+    if match is None:
+        return dateutil.parser.parse(value)
+    year, month, day, hour, minute, second, fraction, utc = match.groups()
+    microsecond = int(fraction[:6].ljust(6, '0')) if fraction else 0
+    try:
+        return datetime.datetime(int(year), int(month), int(day), int(hour), int(minute), int(second), microsecond,
+                                 _UTC if utc else None)
+    except ValueError:
+        return dateutil.parser.parse(value)
+
+
+def _resolveType(name):
+    '''
+    Returns the native python type or model class for a swaggerType name, eg. 'int' or 'Project'
+    '''
+    try:
+        return _RESOLVED_TYPES[name]
+    except KeyError:
+        pass
+    # avoid the native python type 'file'
+    if name != 'File' and name.lower() in _NATIVE_TYPES:
+        resolved = _NATIVE_TYPES[name.lower()]
+    else:
+        resolved = getattr(importlib.import_module('BaseSpacePy.model.' + name), name)
+    _RESOLVED_TYPES[name] = resolved
+    return resolved
+
+
+def _deserialize(obj, objClass, lazy=False):
+    '''
+    Deserializes a decoded json value into an instance of a model class, or into a native python type
+    '''
+    # If the instance is a native python type, return it        
+    if objClass in (str, int, float, bool):
+        return objClass(obj)
+    try:
+        plan, deferred = _DESERIALIZATION_PLANS[objClass, lazy]
+    except KeyError:
+        plan, deferred = _buildPlan(objClass, lazy)
+    instance = objClass()
+    for attr, convert in plan:
+        if attr in obj:
+            value = convert(obj[attr])
+            if value is not UNSET:
+                setattr(instance, attr, value)
+    if deferred:
+        # keep only the values still to be converted, rather than the whole decoded json
+        pending = dict((attr, obj[attr]) for attr in deferred if attr in obj)
+        if pending:
+            instance._lazy = (pending, deferred)
+    return instance
+
+
+def _buildPlan(objClass, lazy=False):
+    '''
+    Compiles the swaggerTypes of a model class into a list of (attribute name, converter function) tuples,
+    and (in lazy mode) a dictionary of the converters of the attributes that are deserialized on first access.
+    
+    For every swaggerType of the model, the converter sets native python types directly,
+    or recursively deserializes model instances; for dynamic types, substitutes the real class after looking up the 'Type' value;
+    deserializes all members of lists, including lists of lists (though not list of list of list...);
+    and converts datetimes to datetime objects.
+    '''
+    instance = objClass()
+    dynamicTypes = dict((key, _resolveType(name)) for key, name in getattr(instance, '_dynamicType', {}).iteritems())
+    plan = []
+    deferred = {}
+    for attr, attrType in instance.swaggerTypes.iteritems():
+        convert = _makeConverter(attrType, dynamicTypes, lazy)
+        if lazy and attrType not in _EAGER_TYPES:
+            deferred[attr] = convert
+        else:
+            plan.append((attr, convert))
+    _DESERIALIZATION_PLANS[objClass, lazy] = plan, deferred
+    return plan, deferred
+
+
+def _makeConverter(attrType, dynamicTypes, lazy=False):
+    '''
+    Returns a function that converts a decoded json value to the provided swaggerType;
+    nested models are deserialized in lazy mode if lazy is True
+    '''
+    if attrType in ('str', 'int', 'float', 'bool'):
+        nativeType = _NATIVE_TYPES[attrType]
+        def convertNative(value):
             try:
-                if (not str(objClass)=='File'): 
-                    objClass = eval(objClass.lower())
-                else:
-                    objClass = eval(objClass + '.' + objClass)
-            except NameError: # not a native type, must be model class
-                objClass = eval(objClass + '.' + objClass)
-        
-        # Create an instance of the object class
-        # If the instance is a native python type, return it        
-        if objClass in [str, int, float, bool]:
-            return objClass(obj)
-        instance = objClass()
-        
-        # For every swaggerType in the instance that is also in the passed-in obj,
-        # set the instance value for native python types,
-        # or recursively deserialize class instances.
-        # For dynamic types, substitute real class after looking up 'Type' value.
-        # For lists, deserialize all members of a list, including lists of lists (though not list of list of list...).
-        # For datetimes, convert to a readable output string 
-        for attr, attrType in instance.swaggerTypes.iteritems():
-            if attr in obj:
-                value = obj[attr]
-                if attrType in ['str', 'int', 'float', 'bool']:
-                    attrType = eval(attrType)
-                    try:
-                        value = attrType(value)
-                    except UnicodeEncodeError:
-                        value = unicode(value)
-                    setattr(instance, attr, value)                            
-                elif attrType == 'DynamicType':                                                
-                    try:
-                        model_name = instance._dynamicType[value['Type']]                
-                    except KeyError:
-                        pass
-                        # suppress this warning, which is caused by a bug in BaseSpace
-                        #warn("Warning - unrecognized dynamic type: " + value['Type'])                                                                                    
-                    else:
-                        setattr(instance, attr, self.deserialize(value, model_name))
-                elif 'list<' in attrType:
-                    match = re.match('list<(.*)>', attrType)
-                    subClass = match.group(1)                    
-                    subValues = []                       
-
-                    # lists of dynamic type
-                    if subClass == 'DynamicType':                             
-                        for subValue in value:                            
-                            try:
-                                new_type = instance._dynamicType[subValue['Type']]                                
-                            except KeyError:
-                                pass 
-                                # suppress this warning, which is caused by a bug in BaseSpace
-                                #warn("Warning - unrecognized (list of) dynamic types: " + subValue['Type'])                                
-                            else:
-                                subValues.append(self.deserialize(subValue, new_type)) 
-                        setattr(instance, attr, subValues)
-                    # typical lists
-                    else:                                                                             
-                        for subValue in value:
-                            subValues.append(self.deserialize(subValue, subClass))
-                        setattr(instance, attr, subValues)
-                # list of lists (e.g. map[] property type)
-                elif 'listoflists<' in attrType:
-                    match = re.match('listoflists<(.*)>', attrType)
-                    subClass = match.group(1)                    
-                    outvals = []                
-                    for outval in value:
-                        invals = []
-                        for inval in outval:
-                            invals.append(self.deserialize(inval, subClass))
-                        outvals.append(invals)
-                    setattr(instance, attr, outvals)
-                                            
-                elif attrType=='dict':                                          
-                    setattr(instance, attr, value)
-                elif attrType=='datetime':
-                    dt = dateutil.parser.parse(value)
-                    setattr(instance, attr, dt)
-                else:
-                    # recursive call with attribute type
-                    setattr(instance, attr, self.deserialize(value, attrType))
-        return instance
+                return nativeType(value)
+            except UnicodeEncodeError:
+                return unicode(value)
+        return convertNative
+    if attrType == 'DynamicType':
+        def convertDynamic(value):
+            try:
+                modelClass = dynamicTypes[value['Type']]
+            except KeyError:
+                # suppress this warning, which is caused by a bug in BaseSpace
+                #warn("Warning - unrecognized dynamic type: " + value['Type'])
+                return UNSET
+            return _deserialize(value, modelClass, lazy)
+        return convertDynamic
+    if attrType.startswith('list<') and attrType.endswith('>'):
+        subClass = attrType[len('list<'):-1]
+        if subClass == 'DynamicType':
+            def convertDynamicList(value):
+                subValues = []
+                for subValue in value:
+                    modelClass = dynamicTypes.get(subValue['Type'])
+                    # skip unrecognized dynamic types, which are caused by a bug in BaseSpace
+                    if modelClass is not None:
+                        subValues.append(_deserialize(subValue, modelClass, lazy))
+                return subValues
+            return convertDynamicList
+        subType = _resolveType(subClass)
+        if subType is dict:
+            return list
+        return lambda value: [_deserialize(subValue, subType, lazy) for subValue in value]
+    # list of lists (e.g. map[] property type)
+    if attrType.startswith('listoflists<') and attrType.endswith('>'):
+        subType = _resolveType(attrType[len('listoflists<'):-1])
+        return lambda value: [[_deserialize(inval, subType, lazy) for inval in outval] for outval in value]
+    if attrType == 'dict':
+        return lambda value: value
+    if attrType == 'datetime':
+        return _parseDatetime
+    modelClass = _resolveType(attrType)
+    return lambda value: _deserialize(value, modelClass, lazy)
@@ -0,0 +1,94 @@
+from multiprocessing.pool import ThreadPool
+
+# BaseSpaceAPI metadata methods that may be called asynchronously
+ASYNC_METHODS = set([
+    'getAppSessionById', 'getAppSessionPropertiesById', 'getAppSessionPropertyByName', 'getAppSessionInputsById',
+    'getUserById',
+    'getProjectById', 'getProjectPropertiesById', 'getProjectByUser',
+    'getAppResultById', 'getAppResultPropertiesById', 'getAppResultFilesById', 'getAppResultsByProject',
+    'getSampleById', 'getSamplePropertiesById', 'getSampleFilesById', 'getSamplesByProject',
+    'getRunById', 'getRunPropertiesById', 'getRunFilesById', 'getRunSamplesById', 'getAccessibleRunsByUser',
+    'getFileById', 'getFilePropertiesById',
+    'getGenomeById', 'getAvailableGenomes',
+    'getIntervalCoverage', 'getCoverageMetaInfo', 'getVariantMetadata', 'filterVariantSet',
+    'getResourceProperties',
+    ])
+
+
+class AsyncBaseSpaceAPI(object):
+    '''
+    Concurrent client for the metadata methods of a BaseSpaceAPI instance.
+
+    Each mirrored method (eg. getSampleById) takes the same arguments as the BaseSpaceAPI method,
+    but returns immediately with an AsyncResult; call get() on the result to wait for the
+    deserialized model object (or to raise the exception from the call).
+    Requests are made by a bounded pool of worker threads sharing the api's keep-alive ConnectionPool.
+
+    Example::
+
+        asyncApi = AsyncBaseSpaceAPI(myAPI, concurrency=50)
+        pending = [asyncApi.getSampleById(Id) for Id in sampleIds]
+        samples = asyncApi.gather(pending)
+        asyncApi.close()
+    '''
+    def __init__(self, api, concurrency=10):
+        '''
+        :param api: a BaseSpaceAPI instance, used to make the requests and deserialize the responses
+        :param concurrency: (optional) the maximum number of requests in flight at once, default 10
+        '''
+        self.api = api
+        self.concurrency = concurrency
+        # keep a connection alive for every worker, until close()
+        self._connectionPool = api.getConnectionPool()
+        self._connectionPool.reserve(concurrency)
+        self._reserved = concurrency
+        self._pool = ThreadPool(concurrency)
+
+    def __getattr__(self, name):
+        if name in ASYNC_METHODS:
+            def asyncMethod(*args, **kwargs):
+                return self.submit(name, *args, **kwargs)
+            asyncMethod.__name__ = name
+            asyncMethod.__doc__ = getattr(self.api, name).__doc__
+            return asyncMethod
+        raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__, name))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def submit(self, methodName, *args, **kwargs):
+        '''
+        Schedules a call to a BaseSpaceAPI metadata method.
+
+        :param methodName: the name of the BaseSpaceAPI method, eg. 'getSampleById'
+        :param args: positional arguments for the method
+        :param kwargs: keyword arguments for the method
+        :raises AttributeError: if the method isn't one of the supported metadata methods
+        :returns: an AsyncResult, whose get() returns the method's return value
+        '''
+        if methodName not in ASYNC_METHODS:
+            raise AttributeError("'%s' is not an asynchronous BaseSpaceAPI method" % methodName)
+        return self._pool.apply_async(getattr(self.api, methodName), args, kwargs)
+
+    def gather(self, results, timeout=None):
+        '''
+        Waits for a list of AsyncResults and returns their values, in the same order.
+
+        :param results: a list of AsyncResults returned by the asynchronous methods
+        :param timeout: (optional) the maximum number of seconds to wait for each result, default None (wait forever)
+        :raises: the exception raised by the first failed call, if any
+        :returns: a list of the return values of the calls
+        '''
+        return [r.get(timeout) for r in results]
+
+    def close(self):
+        '''
+        Waits for all scheduled calls to complete, then stops the worker threads
+        '''
+        self._pool.close()
+        self._pool.join()
+        self._connectionPool.unreserve(self._reserved)
+        self._reserved = 0
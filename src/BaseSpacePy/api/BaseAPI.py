@@ -7,7 +7,11 @@ import httplib
 import cStringIO
 import json
 import os
+import copy
 import inspect
+from collections import deque
+from itertools import islice
+from multiprocessing.pool import ThreadPool
 
 from BaseSpacePy.api.APIClient import APIClient
 from BaseSpacePy.api.BaseSpaceException import *
@@ -19,14 +23,21 @@ class BaseAPI(object):
     Parent class for BaseSpaceAPI and BillingAPI classes
     '''
 
-    def __init__(self, AccessToken, apiServerAndVersion, userAgent, timeout=10, verbose=False):
+    def __init__(self, AccessToken, apiServerAndVersion, userAgent, timeout=10, verbose=False, connectionPool=None, retryPolicy=None, rateLimiter=None, responseCache=None, metadataCache=None, coalesceRequests=False, lazyDeserialization=False):
         '''
         :param AccessToken: the current access token
         :param apiServerAndVersion: the api server URL with api version
         :param timeout: (optional) the timeout in seconds for each request made, default 10 
         :param verbose: (optional) prints verbose output, default False
+        :param connectionPool: (optional) a ConnectionPool to share keep-alive connections with other API instances, default is a new pool
+        :param retryPolicy: (optional) a RetryPolicy for failed requests, default is a RetryPolicy with default settings (up to 5 attempts, see RetryPolicy)
+        :param rateLimiter: (optional) a RateLimiter to share request budgets with other API instances and worker processes, default None (no limit)
+        :param responseCache: (optional) a ResponseCache for GET responses, default None (no caching)
+        :param metadataCache: (optional) a MetadataCache to persist the responses of immutable resources, default None (no caching)
+        :param coalesceRequests: (optional) let concurrent identical GET requests share a single server call and deserialized result, default False
+        :param lazyDeserialization: (optional) deserialize nested objects, lists and datetimes of returned models on first access, default False
         '''
-        self.apiClient = APIClient(AccessToken, apiServerAndVersion, userAgent=userAgent, timeout=timeout)
+        self.apiClient = APIClient(AccessToken, apiServerAndVersion, userAgent=userAgent, timeout=timeout, connectionPool=connectionPool, retryPolicy=retryPolicy, rateLimiter=rateLimiter, responseCache=responseCache, metadataCache=metadataCache, coalesceRequests=coalesceRequests, lazyDeserialization=lazyDeserialization)
         self.verbose   = verbose
 
     def __json_print__(self, label, var):
@@ -40,7 +51,7 @@ class BaseAPI(object):
             pass  # we could disable ascii-enforcing, as shown above, but 
                   # this will massively increase the volume of logs
 
-    def __singleRequest__(self, myModel, resourcePath, method, queryParams, headerParams, postData=None, forcePost=False):
+    def __singleRequest__(self, myModel, resourcePath, method, queryParams, headerParams, postData=None, forcePost=False, cacheIf=None, raw=False, fields=None):
         '''
         Call a REST API and deserialize response into an object, handles errors from server.
         
@@ -52,9 +63,12 @@ class BaseAPI(object):
         :param postData: (optional) data to POST, default None
         :param version: (optional) print detailed output, default False
         :param forcePost: (optional) use a POST call with pycurl instead of urllib, default False (used only when POSTing with no post data?)
+        :param cacheIf: (optional) for GET calls of immutable resources, a function of the decoded json Response (a dictionary) that returns True if the resource won't change and may be stored in the MetadataCache, default None (not cacheable)
+        :param raw: (optional) return the decoded json Response (a dictionary) instead of a model instance, default False
+        :param fields: (optional) a list of attribute names; return a dictionary with only these keys of the decoded json Response instead of a model instance, default None
 
         :raises ServerResponseException: if server returns an error or has no response
-        :returns: an instance of the Response model from the provided myModel
+        :returns: an instance of the Response model from the provided myModel, or a dictionary if raw or fields are provided
         '''
         if self.verbose: 
             print ""
@@ -64,6 +78,27 @@ class BaseAPI(object):
             print '    # Hdrs:      ' + str(headerParams)
             print '    # forcePost: ' + str(forcePost)
             self.__json_print__('    # postData:  ',postData)
+        coalescer = self.apiClient.coalescer
+        if coalescer is not None and method == 'GET':
+            # concurrent identical requests share one call; callers that waited for it get their own copy of its result
+            key = ('model', myModel, resourcePath, coalescer.makeKey(queryParams), coalescer.makeKey(headerParams), self.apiClient.apiKey,
+                   raw, None if fields is None else tuple(fields))
+            return coalescer.call(key, lambda: self.__doSingleRequest__(myModel, resourcePath, method, queryParams, headerParams, postData, forcePost, cacheIf, raw, fields),
+                                  copy=copy.deepcopy, timeout=self.apiClient.timeout)
+        return self.__doSingleRequest__(myModel, resourcePath, method, queryParams, headerParams, postData, forcePost, cacheIf, raw, fields)
+
+    def __doSingleRequest__(self, myModel, resourcePath, method, queryParams, headerParams, postData=None, forcePost=False, cacheIf=None, raw=False, fields=None):
+        '''
+        Makes the call for __singleRequest__ (see its parameters), without request coalescing
+        '''
+        cache = self.apiClient.metadataCache
+        if cacheIf is not None and cache is not None:
+            cacheKey = cache.makeKey(self.apiClient.apiServerAndVersion, resourcePath, queryParams, self.apiClient.apiKey)
+            response = cache.get(cacheKey)
+            if response is not None:
+                if raw or fields is not None:
+                    return self.__projectFields__(response['Response'], fields)
+                return self.apiClient.deserialize(response, myModel).Response
         response = self.apiClient.callAPI(resourcePath, method, queryParams, postData, headerParams, forcePost=forcePost)
         if self.verbose:
             self.__json_print__('    # Response:  ',response)
@@ -77,13 +112,30 @@ class BaseAPI(object):
         elif response.has_key('ErrorCode'):
             raise ServerResponseException(response["MessageFormatted"])
                  
+        if cacheIf is not None and cache is not None and isinstance(response.get('Response'), dict) and cacheIf(response['Response']):
+            cache.put(cacheKey, resourcePath, response)
+        if raw or fields is not None:
+            # skip model construction
+            return self.__projectFields__(response.get('Response', response), fields)
         responseObject = self.apiClient.deserialize(response, myModel)
         if hasattr(responseObject, "Response"):
             return responseObject.Response
         else:
             return responseObject
 
-    def __listRequest__(self, myModel, resourcePath, method, queryParams, headerParams):
+    def __projectFields__(self, item, fields):
+        '''
+        Returns a deep copy of a decoded json object, or of only its requested fields (those that are present).
+        The decoded json may be shared with the response cache, so callers never get any of its (nested) objects.
+
+        :param item: a decoded json object (dictionary)
+        :param fields: a list of keys, or None for all keys
+        '''
+        if fields is None:
+            return copy.deepcopy(item)
+        return dict((field, copy.deepcopy(item[field])) for field in fields if field in item)
+
+    def __listRequest__(self, myModel, resourcePath, method, queryParams, headerParams, raw=False, fields=None):
         '''
         Call a REST API that returns a list and deserialize response into a list of objects of the provided model.
         Handles errors from server.
@@ -93,9 +145,11 @@ class BaseAPI(object):
         :param method: the REST method type, eg. GET
         :param queryParams: a dictionary of query parameters
         :param headerParams: a dictionary of header parameters
+        :param raw: (optional) return the decoded json items (dictionaries) instead of model instances, default False
+        :param fields: (optional) a list of attribute names; return dictionaries with only these keys of the decoded json items instead of model instances, default None
 
         :raises ServerResponseException: if server returns an error or has no response        
-        :returns: a list of instances of the provided model
+        :returns: a list of instances of the provided model, or of dictionaries if raw or fields are provided
         '''
         if self.verbose: 
             print ""
@@ -103,6 +157,82 @@ class BaseAPI(object):
             print '    # Path:      ' + str(resourcePath)
             print '    # QPars:     ' + str(queryParams)
             print '    # Hdrs:      ' + str(headerParams)
+        items = self.__listResponse__(resourcePath, method, queryParams, headerParams)['Items']
+        return self.__convertItems__(items, myModel, raw, fields)
+
+    def __iterListRequest__(self, myModel, resourcePath, method, queryParams, headerParams, pageSize=None, raw=False, fields=None, prefetch=0):
+        '''
+        Call a REST API that returns a list, page by page, and return a generator of the objects of the provided model.
+        Only one page of the list is held in memory at a time, or prefetch + 1 pages when prefetching. Handles errors from server.
+
+        With prefetch, once the first page has returned the TotalCount of the list, the following pages are requested
+        concurrently by a pool of threads, up to prefetch pages ahead of the page being consumed. Items are yielded in the order of the list.
+
+        :param myModel: a Model type to return
+        :param resourcePath: the api url path to call (without server and version)
+        :param method: the REST method type, eg. GET
+        :param queryParams: a dictionary of query parameters; Offset is the position of the first item (default 0)
+        :param headerParams: a dictionary of header parameters
+        :param pageSize: (optional) the number of items to request per page, default the Limit in queryParams, or 1000
+        :param raw: (optional) yield the decoded json items (dictionaries) instead of model instances, default False
+        :param fields: (optional) a list of attribute names; yield dictionaries with only these keys of the decoded json items instead of model instances, default None
+        :param prefetch: (optional) the number of pages to request ahead, concurrently, default 0 (request each page when it's needed)
+
+        :raises ServerResponseException: if server returns an error or has no response
+        :returns: a generator of instances of the provided model, or of dictionaries if raw or fields are provided
+        '''
+        if pageSize is None:
+            pageSize = int(queryParams.get('Limit', 1000))
+        if pageSize < 1:
+            raise ValueError('pageSize must be at least 1')
+        offset = int(queryParams.get('Offset', 0))
+        caller = inspect.stack()[1][3] if self.verbose else None
+        def fetchPage(offset):
+            pageParams = dict(queryParams)
+            pageParams['Offset'] = offset
+            pageParams['Limit'] = pageSize
+            if self.verbose:
+                print ""
+                print "* " + caller + "  (" + str(method) + ")"
+                print '    # Path:      ' + str(resourcePath)
+                print '    # QPars:     ' + str(pageParams)
+                print '    # Hdrs:      ' + str(headerParams)
+            page = self.__listResponse__(resourcePath, method, pageParams, headerParams)
+            return page, self.__convertItems__(page['Items'], myModel, raw, fields)
+        def prefetchItems(offset, totalCount):
+            offsets = iter(xrange(offset, totalCount, pageSize))
+            pool = ThreadPool(prefetch)
+            try:
+                pending = deque(pool.apply_async(fetchPage, (nextOffset,)) for nextOffset in islice(offsets, prefetch))
+                while pending:
+                    page, items = pending.popleft().get()
+                    # keep the read-ahead window full while the caller consumes this page
+                    for nextOffset in islice(offsets, 1):
+                        pending.append(pool.apply_async(fetchPage, (nextOffset,)))
+                    for item in items:
+                        yield item
+            finally:
+                pool.close()
+                pool.join()
+        def iterItems(offset):
+            while True:
+                page, items = fetchPage(offset)
+                for item in items:
+                    yield item
+                offset += page.get('DisplayedCount', len(items))
+                totalCount = page.get('TotalCount')
+                if not items or (totalCount is not None and offset >= totalCount) or (totalCount is None and len(items) < pageSize):
+                    return
+                if prefetch > 0 and totalCount is not None:
+                    for item in prefetchItems(offset, totalCount):
+                        yield item
+                    return
+        return iterItems(offset)
+
+    def __listResponse__(self, resourcePath, method, queryParams, headerParams):
+        '''
+        Makes the call of a list request, handles errors from server, and returns the decoded json Response (a ResourceList dictionary)
+        '''
         response = self.apiClient.callAPI(resourcePath, method, queryParams, None, headerParams)
         if self.verbose:
             self.__json_print__('    # Response:  ',response)
@@ -112,9 +242,17 @@ class BaseAPI(object):
             raise ServerResponseException(str(response['ResponseStatus']['ErrorCode'] + ": " + response['ResponseStatus']['Message']))
         elif response['ResponseStatus'].has_key('Message'):
             raise ServerResponseException(str(response['ResponseStatus']['Message']))
-        
-        respObj = self.apiClient.deserialize(response, ListResponse.ListResponse)
-        return [self.apiClient.deserialize(c, myModel) for c in respObj._convertToObjectList()]
+        return response['Response']
+
+    def __convertItems__(self, items, myModel, raw, fields):
+        '''
+        Converts the decoded json items of a list response to model instances, or to dictionaries of the requested fields
+        '''
+        if raw or fields is not None:
+            return [self.__projectFields__(c, fields) for c in items]
+        # deserialize the items straight from the decoded json response
+        deserialize = self.apiClient.deserialize
+        return [deserialize(c, myModel) for c in items]
 
     def __makeCurlRequest__(self, data, url):
         '''
@@ -159,6 +297,92 @@ class BaseAPI(object):
         '''        
         self.apiClient.timeout = time
         
+    def getConnectionPool(self):
+        '''
+        Returns the ConnectionPool of keep-alive connections used for each request made
+        '''
+        return self.apiClient.connectionPool
+
+    def setConnectionPool(self, connectionPool):
+        '''
+        Specify the ConnectionPool of keep-alive connections used for each request made,
+        eg. to share a pool between a BaseSpaceAPI and a BillingAPI instance
+        
+        :param connectionPool: a ConnectionPool instance
+        '''
+        self.apiClient.connectionPool = connectionPool
+
+    def getRetryPolicy(self):
+        '''
+        Returns the RetryPolicy for failed requests
+        '''
+        return self.apiClient.retryPolicy
+
+    def setRetryPolicy(self, retryPolicy):
+        '''
+        Specify the RetryPolicy for failed requests
+        
+        :param retryPolicy: a RetryPolicy instance
+        '''
+        self.apiClient.retryPolicy = retryPolicy
+
+    def getRateLimiter(self):
+        '''
+        Returns the RateLimiter consulted before each request, or None if requests aren't rate limited
+        '''
+        return self.apiClient.rateLimiter
+
+    def setRateLimiter(self, rateLimiter):
+        '''
+        Specify the RateLimiter consulted before each request
+        
+        :param rateLimiter: a RateLimiter instance, or None to stop rate limiting
+        '''
+        self.apiClient.rateLimiter = rateLimiter
+
+    def getResponseCache(self):
+        '''
+        Returns the ResponseCache for GET responses, or None if responses aren't cached
+        '''
+        return self.apiClient.responseCache
+
+    def setResponseCache(self, responseCache):
+        '''
+        Specify the ResponseCache for GET responses
+        
+        :param responseCache: a ResponseCache instance, or None to stop caching
+        '''
+        self.apiClient.responseCache = responseCache
+
+    def getMetadataCache(self):
+        '''
+        Returns the MetadataCache for the responses of immutable resources, or None if they aren't cached
+        '''
+        return self.apiClient.metadataCache
+
+    def setMetadataCache(self, metadataCache):
+        '''
+        Specify the MetadataCache for the responses of immutable resources
+        
+        :param metadataCache: a MetadataCache instance, or None to stop caching
+        '''
+        self.apiClient.metadataCache = metadataCache
+
+    def getCoalescedCallCount(self):
+        '''
+        Returns the number of GET calls saved by request coalescing (0 if coalescing is off)
+        '''
+        if self.apiClient.coalescer is None:
+            return 0
+        return self.apiClient.coalescer.getSavedCallCount()
+
+    def __waitForStorageRequest__(self):
+        '''
+        Waits for the RateLimiter's storage budget (if any) before a request to file storage (S3)
+        '''
+        if self.apiClient.rateLimiter is not None:
+            self.apiClient.rateLimiter.acquire('storage')
+
     def getAccessToken(self):
         '''
         Returns the current access token. 
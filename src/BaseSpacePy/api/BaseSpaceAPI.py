@@ -4,6 +4,7 @@ import urllib2
 import shutil
 import urllib
 import httplib
+import hashlib
 import cStringIO
 import json
 import os
@@ -13,12 +14,16 @@ import socket
 import ConfigParser
 import urlparse
 import logging
+from multiprocessing.pool import ThreadPool
 
 from BaseSpacePy.api.APIClient import APIClient
 from BaseSpacePy.api.BaseAPI import BaseAPI
 from BaseSpacePy.api.BaseSpaceException import *
+from BaseSpacePy.api.ChangeFeed import ChangeFeed
+from BaseSpacePy.api.ContentUrlCache import ContentUrlCache
 from BaseSpacePy.model.MultipartFileTransfer import MultipartUpload as mpu
 from BaseSpacePy.model.MultipartFileTransfer import MultipartDownload as mpd
+from BaseSpacePy.model.MultipartFileTransfer import UploadJournal
 from BaseSpacePy.model.QueryParameters import QueryParameters as qp
 from BaseSpacePy.model import *
 
@@ -31,13 +36,17 @@ webAuthorize               = '/oauth/authorize'
 # resource types permitted by the generic properties API:
 # https://developer.basespace.illumina.com/docs/content/documentation/rest-api/api-reference#Properties
 PROPERTY_RESOURCE_TYPES = set([ "samples", "appresults", "runs", "appsessions", "projects" ])
+# the size in bytes of each read from a download stream, and of each write to the local file
+DOWNLOAD_BUFFER_SIZE = 1024*1024
+# files of this size in bytes or more are downloaded with multipart download by fileDownload
+MULTIPART_MIN_DOWNLOAD_SIZE = 5000000
 
 
 class BaseSpaceAPI(BaseAPI):
     '''
     The main API class used for all communication with the REST server
     '''
-    def __init__(self, clientKey=None, clientSecret=None, apiServer=None, version=None, appSessionId='', AccessToken='', userAgent=None, timeout=10, verbose=0, profile='DEFAULT'):
+    def __init__(self, clientKey=None, clientSecret=None, apiServer=None, version=None, appSessionId='', AccessToken='', userAgent=None, timeout=10, verbose=0, profile='DEFAULT', connectionPool=None, retryPolicy=None, rateLimiter=None, responseCache=None, metadataCache=None, coalesceRequests=False, lazyDeserialization=False, contentUrlCache=None):
         '''
         The following arguments are required in either the constructor or a config file (~/.basespacepy.cfg):        
         
@@ -49,6 +58,14 @@ class BaseSpaceAPI(BaseAPI):
         :param AccessToken: optional, though will be needed for most methods (except to obtain a new access token)
         :param timeout: optional, timeout period in seconds for api calls, default 10 
         :param profile: optional, name of profile in config file, default 'DEFAULT'
+        :param connectionPool: optional, a ConnectionPool of keep-alive connections to (re)use for api calls, default is a new pool
+        :param retryPolicy: optional, a RetryPolicy for failed api calls and downloads, default is a RetryPolicy with default settings (up to 5 attempts, see RetryPolicy); use RetryPolicy(maxAttempts=1) for a single attempt
+        :param rateLimiter: optional, a RateLimiter with budgets for api and storage calls, shared with multipart transfer workers, default None (no limit)
+        :param responseCache: optional, a ResponseCache to reuse GET responses (with ETag revalidation), default None (no caching)
+        :param metadataCache: optional, a MetadataCache to persist completed Runs, Files and AppResults across processes, default None (no caching)
+        :param coalesceRequests: optional, let concurrent identical GET calls (eg. from AsyncBaseSpaceAPI or bulk fetches) share one server call, default False
+        :param lazyDeserialization: optional, deserialize the nested objects, lists and datetimes of returned models only when they are first read, which speeds up scans of large listings that read few attributes, default False
+        :param contentUrlCache: optional, a ContentUrlCache of the storage urls of file contents, shared by the parts of multipart downloads, default is a new cache
         '''
         
         cred = self._setCredentials(clientKey, clientSecret, apiServer, version, appSessionId, AccessToken, profile)
@@ -64,7 +81,8 @@ class BaseSpaceAPI(BaseAPI):
         self.weburl         = cred['apiServer'].replace('api.','')
         
         apiServerAndVersion = urlparse.urljoin(cred['apiServer'], cred['apiVersion'])
-        super(BaseSpaceAPI, self).__init__(cred['accessToken'], apiServerAndVersion, userAgent, timeout, verbose)
+        super(BaseSpaceAPI, self).__init__(cred['accessToken'], apiServerAndVersion, userAgent, timeout, verbose, connectionPool, retryPolicy, rateLimiter, responseCache, metadataCache, coalesceRequests, lazyDeserialization)
+        self.contentUrlCache = ContentUrlCache() if contentUrlCache is None else contentUrlCache
 
     def _setCredentials(self, clientKey, clientSecret, apiServer, apiVersion, appSessionId, accessToken, profile):
         '''
@@ -477,12 +495,48 @@ class BaseSpaceAPI(BaseAPI):
         appresult = ars.Items[0]
         return appresult
 
-    def getAppResultById(self, Id, queryPars=None):
+    def __bulkRequest__(self, getById, Ids, queryPars, workerCount, raw=False, fields=None):
+        '''
+        Calls a get-by-Id method for a list of Ids concurrently, with a bounded number of worker threads.
+        Repeated Ids are fetched only once. A failure for one Id doesn't abort the other requests.
+        
+        :param getById: a BaseSpaceAPI method that takes an Id and a QueryParameters object, eg. self.getSampleById
+        :param Ids: a list of Ids
+        :param queryPars: an (optional) object of type QueryParameters, passed to each request
+        :param workerCount: the maximum number of requests in flight at once
+        :param raw: (optional) passed to getById, default False
+        :param fields: (optional) passed to getById, default None
+        :returns: a list in the same order as Ids, with the returned object for each Id, or the exception raised when fetching that Id
+        '''
+        uniqueIds = []
+        seen = set()
+        for Id in Ids:
+            if Id not in seen:
+                seen.add(Id)
+                uniqueIds.append(Id)
+        if not uniqueIds:
+            return []
+        def fetch(Id):
+            try:
+                return getById(Id, queryPars, raw=raw, fields=fields)
+            except Exception as e:
+                return e
+        pool = ThreadPool(min(workerCount, len(uniqueIds)))
+        try:
+            results = dict(zip(uniqueIds, pool.map(fetch, uniqueIds)))
+        finally:
+            pool.close()
+            pool.join()
+        return [results[Id] for Id in Ids]
+
+    def getAppResultById(self, Id, queryPars=None, raw=False, fields=None):
         '''
         Returns an AppResult object corresponding to Id
         
         :param Id: The Id of the AppResult
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: an AppResult instance
         '''        
         queryParams = self._validateQueryParameters(queryPars)
@@ -491,7 +545,21 @@ class BaseSpaceAPI(BaseAPI):
         method = 'GET'
         resourcePath = resourcePath.replace('{Id}', Id)        
         headerParams = {}
-        return self.__singleRequest__(AppResultResponse.AppResultResponse,resourcePath, method, queryParams, headerParams)
+        return self.__singleRequest__(AppResultResponse.AppResultResponse,resourcePath, method, queryParams, headerParams,
+                                      cacheIf=lambda ar: str(ar.get('Status', '')).lower() == 'complete', raw=raw, fields=fields)
+
+    def getAppResultsByIds(self, Ids, queryPars=None, workerCount=10, raw=False, fields=None):
+        '''
+        Returns AppResult objects for a list of AppResult Ids, fetched concurrently
+        
+        :param Ids: A list of AppResult Ids; repeated Ids are fetched only once
+        :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param workerCount: (optional) The maximum number of concurrent requests, default 10
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
+        :returns: a list of AppResult instances in the same order as Ids; for Ids that couldn't be fetched, the exception raised is in its place
+        '''
+        return self.__bulkRequest__(self.getAppResultById, Ids, queryPars, workerCount, raw=raw, fields=fields)
 
     def getAppResultPropertiesById(self, Id, queryPars=None):
         '''
@@ -509,12 +577,14 @@ class BaseSpaceAPI(BaseAPI):
         headerParams = {}
         return self.__singleRequest__(PropertiesResponse.PropertiesResponse, resourcePath, method, queryParams, headerParams)
 
-    def getAppResultFilesById(self, Id, queryPars=None):
+    def getAppResultFilesById(self, Id, queryPars=None, raw=False, fields=None):
         '''
         Returns a list of File object for an AppResult
         
         :param Id: The id of the AppResult
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a list of File instances 
         '''
         queryParams = self._validateQueryParameters(queryPars)                
@@ -523,9 +593,29 @@ class BaseSpaceAPI(BaseAPI):
         method = 'GET'        
         headerParams = {}
         resourcePath = resourcePath.replace('{Id}',Id)
-        return self.__listRequest__(File.File,resourcePath, method, queryParams, headerParams)
+        return self.__listRequest__(File.File,resourcePath, method, queryParams, headerParams, raw=raw, fields=fields)
 
-    def getAppResultFiles(self, Id, queryPars=None):
+    def iterAppResultFilesById(self, Id, queryPars=None, pageSize=None, raw=False, fields=None, prefetch=0):
+        '''
+        Iterates over the File objects of an AppResult, requesting one page at a time
+        
+        :param Id: The id of the AppResult
+        :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param pageSize: (optional) The number of items to request per page, default the Limit of queryPars, or 1000
+        :param raw: (optional) yield decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; yield dictionaries with only these keys instead of model instances, default None
+        :param prefetch: (optional) The number of pages to request ahead, concurrently, once the first page has returned the total count, default 0
+        :returns: a generator of File instances 
+        '''
+        queryParams = self._validateQueryParameters(queryPars)                
+        resourcePath = '/appresults/{Id}/files'
+        resourcePath = resourcePath.replace('{format}', 'json')
+        method = 'GET'        
+        headerParams = {}
+        resourcePath = resourcePath.replace('{Id}',Id)
+        return self.__iterListRequest__(File.File,resourcePath, method, queryParams, headerParams, pageSize=pageSize, raw=raw, fields=fields, prefetch=prefetch)
+
+    def getAppResultFiles(self, Id, queryPars=None, raw=False, fields=None):
         '''
         * Deprecated in favor of getAppResultFileById() *
         
@@ -533,39 +623,69 @@ class BaseSpaceAPI(BaseAPI):
         
         :param Id: The id of the AppResult
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a list of File instances 
         '''
-        return self.getAppResultFilesById(Id, queryPars)
+        return self.getAppResultFilesById(Id, queryPars, raw=raw, fields=fields)
 
-    def downloadAppResultFilesByExtension(self, Id, extension, localDir, appResultName="", queryPars=None):
+    def downloadAppResultFilesByExtension(self, Id, extension, localDir, appResultName="", queryPars=None, workerCount=10):
         '''
-        Convenience method to dowload all the files in an AppSession's AppResult that match a file extension
-        Uses fileDownload without in its simplest form - may need to be refined later.
+        Convenience method to dowload all the files in an AppSession's AppResult that match a file extension.
+        The last suffix of the extension is passed to the server with the Extensions query parameter, the file listing is
+        requested page by page, and the small matching files are downloaded concurrently with fileDownload; then
+        the large ones are downloaded one at a time, each with a multipart download of workerCount threads.
 
         :param Id: The AppSession Id
-        :param pattern: The regexp pattern to look for in the generated files
+        :param extension: The file extension (eg. '.bam' or 'vcf.gz'); file names must end with it
         :param localDir: The local directory where files will be downloaded to
-        :param queryPars: the additional query parameters to pass into the appresult call (primarily to remove limits)
+        :param appResultName: (optional) The name of the AppResult, if the AppSession has more than one
+        :param queryPars: the additional query parameters to pass into the appresult call (its Limit is used as the page size of the file listing)
+        :param workerCount: (optional) The maximum number of concurrent downloads (or parts of a large file), default 10
+        :raises ServerResponseException: if any download fails, listing the failed files, after all the other small and large files were downloaded
         :returns a list of File instances
         '''
         appResult = self.getAppResultFromAppSessionId(Id, appResultName)
         appResultId = appResult.Content.Id
-        appResultFiles = self.getAppResultFiles(appResultId, queryPars)
-        allDownloads = []
-        for appResultFile in appResultFiles:
-            fileName = appResultFile.Name
-            if fileName.endswith(extension):
-                fileId = appResultFile.Id
-                download = self.fileDownload(fileId, localDir)
-                allDownloads.append(download)
-        return allDownloads
-
-    def getProjectById(self, Id, queryPars=None):
+        queryParams = dict(self._validateQueryParameters(queryPars))
+        # the server may match only the last suffix of a multi-dot extension (eg. 'gz' of 'vcf.gz'), so filter on the whole extension here
+        queryParams['Extensions'] = extension.rsplit('.', 1)[-1]
+        matches = [f for f in self.iterAppResultFilesById(appResultId, qp(queryParams)) if f.Name.endswith(extension)]
+        if not matches:
+            return []
+        # multipart downloads fork worker processes by default, which mustn't happen from the pool's threads:
+        # download large files after the pool is done, with worker threads
+        small = [f for f in matches if getattr(f, 'Size', None) is not None and f.Size < MULTIPART_MIN_DOWNLOAD_SIZE]
+        smallIds = set(f.Id for f in small)
+        large = [f for f in matches if f.Id not in smallIds]
+        downloaded = {}
+        errors = []
+        def download(appResultFile, **kwargs):
+            try:
+                downloaded[appResultFile.Id] = self.fileDownload(appResultFile.Id, localDir, **kwargs)
+            except Exception as e:
+                errors.append(appResultFile.Id + ' (' + appResultFile.Name + '): ' + str(e))
+        if small:
+            pool = ThreadPool(min(workerCount, len(small)))
+            try:
+                pool.map(download, small)
+            finally:
+                pool.close()
+                pool.join()
+        for appResultFile in large:
+            download(appResultFile, processCount=workerCount, engine='thread')
+        if errors:
+            raise ServerResponseException('Failed to download ' + str(len(errors)) + ' of ' + str(len(matches)) + ' files: ' + '; '.join(errors))
+        return [downloaded[appResultFile.Id] for appResultFile in matches]
+
+    def getProjectById(self, Id, queryPars=None, raw=False, fields=None):
         '''
         Request a project object by Id
         
         :param Id: The Id of the project
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a Project instance
         '''
         queryParams = self._validateQueryParameters(queryPars)                
@@ -574,7 +694,7 @@ class BaseSpaceAPI(BaseAPI):
         method = 'GET'
         resourcePath = resourcePath.replace('{Id}', Id)        
         headerParams = {}
-        return self.__singleRequest__(ProjectResponse.ProjectResponse, resourcePath, method, queryParams, headerParams)
+        return self.__singleRequest__(ProjectResponse.ProjectResponse, resourcePath, method, queryParams, headerParams, raw=raw, fields=fields)
 
     def getProjectPropertiesById(self, Id, queryPars=None):
         '''
@@ -592,11 +712,13 @@ class BaseSpaceAPI(BaseAPI):
         headerParams = {}
         return self.__singleRequest__(PropertiesResponse.PropertiesResponse,resourcePath, method, queryParams, headerParams)
            
-    def getProjectByUser(self, queryPars=None):
+    def getProjectByUser(self, queryPars=None, raw=False, fields=None):
         '''
         Returns a list available projects for the current User.
                 
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a list of Project instances
         '''
         queryParams = self._validateQueryParameters(queryPars)               
@@ -604,13 +726,33 @@ class BaseSpaceAPI(BaseAPI):
         resourcePath = resourcePath.replace('{format}', 'json')
         method = 'GET'        
         headerParams = {}
-        return self.__listRequest__(Project.Project,resourcePath, method, queryParams, headerParams)
+        return self.__listRequest__(Project.Project,resourcePath, method, queryParams, headerParams, raw=raw, fields=fields)
+
+    def iterProjectByUser(self, queryPars=None, pageSize=None, raw=False, fields=None, prefetch=0):
+        '''
+        Iterates over the available projects for the current User, requesting one page at a time
+                
+        :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param pageSize: (optional) The number of items to request per page, default the Limit of queryPars, or 1000
+        :param raw: (optional) yield decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; yield dictionaries with only these keys instead of model instances, default None
+        :param prefetch: (optional) The number of pages to request ahead, concurrently, once the first page has returned the total count, default 0
+        :returns: a generator of Project instances
+        '''
+        queryParams = self._validateQueryParameters(queryPars)               
+        resourcePath = '/users/current/projects'
+        resourcePath = resourcePath.replace('{format}', 'json')
+        method = 'GET'        
+        headerParams = {}
+        return self.__iterListRequest__(Project.Project,resourcePath, method, queryParams, headerParams, pageSize=pageSize, raw=raw, fields=fields, prefetch=prefetch)
        
-    def getAccessibleRunsByUser(self, queryPars=None):
+    def getAccessibleRunsByUser(self, queryPars=None, raw=False, fields=None):
         '''
         Returns a list of accessible runs for the current User
                 
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a list of Run instances
         '''        
         queryParams = self._validateQueryParameters(queryPars)               
@@ -618,14 +760,34 @@ class BaseSpaceAPI(BaseAPI):
         resourcePath = resourcePath.replace('{format}', 'json')
         method = 'GET'        
         headerParams = {}
-        return self.__listRequest__(Run.Run, resourcePath, method, queryParams, headerParams)
+        return self.__listRequest__(Run.Run, resourcePath, method, queryParams, headerParams, raw=raw, fields=fields)
+
+    def iterAccessibleRunsByUser(self, queryPars=None, pageSize=None, raw=False, fields=None, prefetch=0):
+        '''
+        Iterates over the accessible runs for the current User, requesting one page at a time
+                
+        :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param pageSize: (optional) The number of items to request per page, default the Limit of queryPars, or 1000
+        :param raw: (optional) yield decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; yield dictionaries with only these keys instead of model instances, default None
+        :param prefetch: (optional) The number of pages to request ahead, concurrently, once the first page has returned the total count, default 0
+        :returns: a generator of Run instances
+        '''        
+        queryParams = self._validateQueryParameters(queryPars)               
+        resourcePath = '/users/current/runs'
+        resourcePath = resourcePath.replace('{format}', 'json')
+        method = 'GET'        
+        headerParams = {}
+        return self.__iterListRequest__(Run.Run, resourcePath, method, queryParams, headerParams, pageSize=pageSize, raw=raw, fields=fields, prefetch=prefetch)
     
-    def getRunById(self, Id, queryPars=None):
+    def getRunById(self, Id, queryPars=None, raw=False, fields=None):
         '''        
         Request a run object by Id
         
         :param Id: The Id of the run
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a Run instance
         '''        
         queryParams = self._validateQueryParameters(queryPars)                
@@ -633,7 +795,8 @@ class BaseSpaceAPI(BaseAPI):
         method = 'GET'
         resourcePath = resourcePath.replace('{Id}', Id)            
         headerParams = {}
-        return self.__singleRequest__(RunResponse.RunResponse,resourcePath, method, queryParams, headerParams)
+        return self.__singleRequest__(RunResponse.RunResponse,resourcePath, method, queryParams, headerParams,
+                                      cacheIf=lambda run: str(run.get('Status', '')).lower() == 'complete', raw=raw, fields=fields)
     
     def getRunPropertiesById(self, Id, queryPars=None):
         '''        
@@ -650,12 +813,14 @@ class BaseSpaceAPI(BaseAPI):
         headerParams = {}
         return self.__singleRequest__(PropertiesResponse.PropertiesResponse,resourcePath, method, queryParams, headerParams)
 
-    def getRunFilesById(self, Id, queryPars=None):
+    def getRunFilesById(self, Id, queryPars=None, raw=False, fields=None):
         '''        
         Request the files associated with a Run, using the Run's Id
         
         :param Id: The Id of the run
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a list of Run instances
         '''        
         queryParams = self._validateQueryParameters(queryPars)                
@@ -663,14 +828,35 @@ class BaseSpaceAPI(BaseAPI):
         method = 'GET'
         resourcePath = resourcePath.replace('{Id}', Id)            
         headerParams = {}         
-        return self.__listRequest__(File.File,resourcePath, method, queryParams, headerParams)
+        return self.__listRequest__(File.File,resourcePath, method, queryParams, headerParams, raw=raw, fields=fields)
 
-    def getRunSamplesById(self, Id, queryPars=None):
+    def iterRunFilesById(self, Id, queryPars=None, pageSize=None, raw=False, fields=None, prefetch=0):
+        '''        
+        Iterates over the files associated with a Run, using the Run's Id, requesting one page at a time
+        
+        :param Id: The Id of the run
+        :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param pageSize: (optional) The number of items to request per page, default the Limit of queryPars, or 1000
+        :param raw: (optional) yield decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; yield dictionaries with only these keys instead of model instances, default None
+        :param prefetch: (optional) The number of pages to request ahead, concurrently, once the first page has returned the total count, default 0
+        :returns: a generator of File instances
+        '''        
+        queryParams = self._validateQueryParameters(queryPars)                
+        resourcePath = '/runs/{Id}/files'        
+        method = 'GET'
+        resourcePath = resourcePath.replace('{Id}', Id)            
+        headerParams = {}         
+        return self.__iterListRequest__(File.File,resourcePath, method, queryParams, headerParams, pageSize=pageSize, raw=raw, fields=fields, prefetch=prefetch)
+
+    def getRunSamplesById(self, Id, queryPars=None, raw=False, fields=None):
         '''        
         Request the Samples associated with a Run, using the Run's Id
         
         :param Id: The Id of the run
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a list of Sample instances
         '''        
         queryParams = self._validateQueryParameters(queryPars)                
@@ -678,15 +864,36 @@ class BaseSpaceAPI(BaseAPI):
         method = 'GET'
         resourcePath = resourcePath.replace('{Id}', Id)            
         headerParams = {}         
-        return self.__listRequest__(Sample.Sample,resourcePath, method, queryParams, headerParams)
+        return self.__listRequest__(Sample.Sample,resourcePath, method, queryParams, headerParams, raw=raw, fields=fields)
+
+    def iterRunSamplesById(self, Id, queryPars=None, pageSize=None, raw=False, fields=None, prefetch=0):
+        '''        
+        Iterates over the Samples associated with a Run, using the Run's Id, requesting one page at a time
+        
+        :param Id: The Id of the run
+        :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param pageSize: (optional) The number of items to request per page, default the Limit of queryPars, or 1000
+        :param raw: (optional) yield decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; yield dictionaries with only these keys instead of model instances, default None
+        :param prefetch: (optional) The number of pages to request ahead, concurrently, once the first page has returned the total count, default 0
+        :returns: a generator of Sample instances
+        '''        
+        queryParams = self._validateQueryParameters(queryPars)                
+        resourcePath = '/runs/{Id}/samples'        
+        method = 'GET'
+        resourcePath = resourcePath.replace('{Id}', Id)            
+        headerParams = {}         
+        return self.__iterListRequest__(Sample.Sample,resourcePath, method, queryParams, headerParams, pageSize=pageSize, raw=raw, fields=fields, prefetch=prefetch)
   
-    def getAppResultsByProject(self, Id, queryPars=None, statuses=None):
+    def getAppResultsByProject(self, Id, queryPars=None, statuses=None, raw=False, fields=None):
         '''
         Returns a list of AppResult object associated with the project with Id
         
         :param Id: The project id
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
         :param statuses: An (optional) list of AppResult statuses to filter by, eg., 'complete'
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a list of AppResult instances
         '''
         queryParams = self._validateQueryParameters(queryPars) 
@@ -698,14 +905,40 @@ class BaseSpaceAPI(BaseAPI):
             queryParams['Statuses'] = ",".join(statuses)
         headerParams = {}
         resourcePath = resourcePath.replace('{Id}',Id)
-        return self.__listRequest__(AppResult.AppResult,resourcePath, method, queryParams, headerParams)
+        return self.__listRequest__(AppResult.AppResult,resourcePath, method, queryParams, headerParams, raw=raw, fields=fields)
 
-    def getSamplesByProject(self, Id, queryPars=None):
+    def iterAppResultsByProject(self, Id, queryPars=None, statuses=None, pageSize=None, raw=False, fields=None, prefetch=0):
+        '''
+        Iterates over the AppResult objects associated with the project with Id, requesting one page at a time
+        
+        :param Id: The project id
+        :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param pageSize: (optional) The number of items to request per page, default the Limit of queryPars, or 1000
+        :param statuses: An (optional) list of AppResult statuses to filter by, eg., 'complete'
+        :param raw: (optional) yield decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; yield dictionaries with only these keys instead of model instances, default None
+        :param prefetch: (optional) The number of pages to request ahead, concurrently, once the first page has returned the total count, default 0
+        :returns: a generator of AppResult instances
+        '''
+        queryParams = self._validateQueryParameters(queryPars) 
+        if statuses is None:
+            statuses = []               
+        resourcePath = '/projects/{Id}/appresults'        
+        method = 'GET'        
+        if len(statuses): 
+            queryParams['Statuses'] = ",".join(statuses)
+        headerParams = {}
+        resourcePath = resourcePath.replace('{Id}',Id)
+        return self.__iterListRequest__(AppResult.AppResult,resourcePath, method, queryParams, headerParams, pageSize=pageSize, raw=raw, fields=fields, prefetch=prefetch)
+
+    def getSamplesByProject(self, Id, queryPars=None, raw=False, fields=None):
         '''
         Returns a list of samples associated with a project with Id
         
         :param Id: The id of the project
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a list of Sample instances
         '''
         queryParams = self._validateQueryParameters(queryPars)                
@@ -714,14 +947,49 @@ class BaseSpaceAPI(BaseAPI):
         method = 'GET'        
         headerParams = {}
         resourcePath = resourcePath.replace('{Id}',Id)
-        return self.__listRequest__(Sample.Sample,resourcePath, method, queryParams, headerParams)
+        return self.__listRequest__(Sample.Sample,resourcePath, method, queryParams, headerParams, raw=raw, fields=fields)
+
+    def iterSamplesByProject(self, Id, queryPars=None, pageSize=None, raw=False, fields=None, prefetch=0):
+        '''
+        Iterates over the samples associated with a project with Id, requesting one page at a time
+        
+        :param Id: The id of the project
+        :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param pageSize: (optional) The number of items to request per page, default the Limit of queryPars, or 1000
+        :param raw: (optional) yield decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; yield dictionaries with only these keys instead of model instances, default None
+        :param prefetch: (optional) The number of pages to request ahead, concurrently, once the first page has returned the total count, default 0
+        :returns: a generator of Sample instances
+        '''
+        queryParams = self._validateQueryParameters(queryPars)                
+        resourcePath = '/projects/{Id}/samples'
+        resourcePath = resourcePath.replace('{format}', 'json')
+        method = 'GET'        
+        headerParams = {}
+        resourcePath = resourcePath.replace('{Id}',Id)
+        return self.__iterListRequest__(Sample.Sample,resourcePath, method, queryParams, headerParams, pageSize=pageSize, raw=raw, fields=fields, prefetch=prefetch)
+
+    def getProjectChanges(self, Id, watermarkPath, raw=False):
+        '''
+        Returns the Samples and AppResults of a project that were created, or that were in progress and have changed,
+        since the previous call with the same watermark file, and their new files. See ChangeFeed.
+        The first call for a project returns all of its Samples and AppResults.
+
+        :param Id: The id of the project
+        :param watermarkPath: The path of a json file where the watermarks of polled projects are saved
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :returns: a dictionary with lists of 'Samples' and 'AppResults', and 'Files': a dictionary of lists of new File instances by Sample or AppResult Id
+        '''
+        return ChangeFeed(self, watermarkPath).pollProject(Id, raw)
 
-    def getSampleById(self, Id, queryPars=None):
+    def getSampleById(self, Id, queryPars=None, raw=False, fields=None):
         '''
         Returns a Sample object
         
         :param Id: The id of the sample
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a Sample instance
         '''
         queryParams = self._validateQueryParameters(queryPars)        
@@ -729,7 +997,20 @@ class BaseSpaceAPI(BaseAPI):
         method = 'GET'
         resourcePath = resourcePath.replace('{Id}', Id)        
         headerParams = {}
-        return self.__singleRequest__(SampleResponse.SampleResponse, resourcePath, method, queryParams, headerParams)
+        return self.__singleRequest__(SampleResponse.SampleResponse, resourcePath, method, queryParams, headerParams, raw=raw, fields=fields)
+    
+    def getSamplesByIds(self, Ids, queryPars=None, workerCount=10, raw=False, fields=None):
+        '''
+        Returns Sample objects for a list of Sample Ids, fetched concurrently
+        
+        :param Ids: A list of Sample Ids; repeated Ids are fetched only once
+        :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param workerCount: (optional) The maximum number of concurrent requests, default 10
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
+        :returns: a list of Sample instances in the same order as Ids; for Ids that couldn't be fetched, the exception raised is in its place
+        '''
+        return self.__bulkRequest__(self.getSampleById, Ids, queryPars, workerCount, raw=raw, fields=fields)
     
     def getSamplePropertiesById(self, Id, queryPars=None):
         '''
@@ -747,12 +1028,14 @@ class BaseSpaceAPI(BaseAPI):
         return self.__singleRequest__(PropertiesResponse.PropertiesResponse,
                                       resourcePath, method, queryParams, headerParams)
 
-    def getSampleFilesById(self, Id, queryPars=None):
+    def getSampleFilesById(self, Id, queryPars=None, raw=False, fields=None):
         '''
         Returns a list of File objects associated with a Sample
         
         :param Id: A Sample id
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a list of File instances
         '''
         queryParams = self._validateQueryParameters(queryPars)
@@ -761,9 +1044,29 @@ class BaseSpaceAPI(BaseAPI):
         headerParams = {}
         resourcePath = resourcePath.replace('{Id}',Id)
         return self.__listRequest__(File.File,
-                                    resourcePath, method, queryParams, headerParams)
+                                    resourcePath, method, queryParams, headerParams, raw=raw, fields=fields)
+
+    def iterSampleFilesById(self, Id, queryPars=None, pageSize=None, raw=False, fields=None, prefetch=0):
+        '''
+        Iterates over the File objects associated with a Sample, requesting one page at a time
+        
+        :param Id: A Sample id
+        :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param pageSize: (optional) The number of items to request per page, default the Limit of queryPars, or 1000
+        :param raw: (optional) yield decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; yield dictionaries with only these keys instead of model instances, default None
+        :param prefetch: (optional) The number of pages to request ahead, concurrently, once the first page has returned the total count, default 0
+        :returns: a generator of File instances
+        '''
+        queryParams = self._validateQueryParameters(queryPars)
+        resourcePath = '/samples/{Id}/files'        
+        method = 'GET'        
+        headerParams = {}
+        resourcePath = resourcePath.replace('{Id}',Id)
+        return self.__iterListRequest__(File.File,
+                                        resourcePath, method, queryParams, headerParams, pageSize=pageSize, raw=raw, fields=fields, prefetch=prefetch)
 
-    def getFilesBySample(self, Id, queryPars=None):
+    def getFilesBySample(self, Id, queryPars=None, raw=False, fields=None):
         '''
         * Deprecated in favor of getSampleFilesById() *
         
@@ -771,16 +1074,20 @@ class BaseSpaceAPI(BaseAPI):
         
         :param Id: A Sample id
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a list of File instances
         '''
-        return self.getSampleFilesById(Id, queryPars)        
+        return self.getSampleFilesById(Id, queryPars, raw=raw, fields=fields)        
     
-    def getFileById(self, Id, queryPars=None):
+    def getFileById(self, Id, queryPars=None, raw=False, fields=None):
         '''
         Returns a file object by Id
         
         :param Id: The id of the file
         :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
         :returns: a File instance
         '''
         queryParams = self._validateQueryParameters(queryPars)                
@@ -789,7 +1096,21 @@ class BaseSpaceAPI(BaseAPI):
         resourcePath = resourcePath.replace('{Id}', Id)            
         headerParams = {}
         return self.__singleRequest__(FileResponse.FileResponse,
-                                      resourcePath, method, queryParams, headerParams)
+                                      resourcePath, method, queryParams, headerParams,
+                                      cacheIf=lambda f: str(f.get('UploadStatus', '')).lower() == 'complete', raw=raw, fields=fields)
+        
+    def getFilesByIds(self, Ids, queryPars=None, workerCount=10, raw=False, fields=None):
+        '''
+        Returns File objects for a list of File Ids, fetched concurrently
+        
+        :param Ids: A list of File Ids; repeated Ids are fetched only once
+        :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param workerCount: (optional) The maximum number of concurrent requests, default 10
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; return dictionaries with only these keys instead of model instances, default None
+        :returns: a list of File instances in the same order as Ids; for Ids that couldn't be fetched, the exception raised is in its place
+        '''
+        return self.__bulkRequest__(self.getFileById, Ids, queryPars, workerCount, raw=raw, fields=fields)
         
     def getFilePropertiesById(self, Id, queryPars=None):
         '''
@@ -838,6 +1159,24 @@ class BaseSpaceAPI(BaseAPI):
         return self.__listRequest__(GenomeV1.GenomeV1,
                                     resourcePath, method, queryParams, headerParams)
 
+    def iterAvailableGenomes(self, queryPars=None, pageSize=None, raw=False, fields=None, prefetch=0):
+        '''
+        Iterates over all available genomes, requesting one page at a time
+        
+        :param queryPars: An (optional) object of type QueryParameters for custom sorting and filtering
+        :param pageSize: (optional) The number of items to request per page, default the Limit of queryPars, or 1000
+        :param raw: (optional) yield decoded json dictionaries instead of model instances, default False
+        :param fields: (optional) a list of attribute names, eg. ['Id', 'Name']; yield dictionaries with only these keys instead of model instances, default None
+        :param prefetch: (optional) The number of pages to request ahead, concurrently, once the first page has returned the total count, default 0
+        :returns: a generator of GenomeV1 instances
+        '''        
+        queryParams = self._validateQueryParameters(queryPars)
+        resourcePath = '/genomes'
+        method = 'GET'
+        headerParams = {}
+        return self.__iterListRequest__(GenomeV1.GenomeV1,
+                                        resourcePath, method, queryParams, headerParams, pageSize=pageSize, raw=raw, fields=fields, prefetch=prefetch)
+
     def getIntervalCoverage(self, Id, Chrom, StartPos, EndPos):
         '''
         Returns metadata about an alignment, including max coverage and cov granularity.
@@ -1124,7 +1463,7 @@ class BaseSpaceAPI(BaseAPI):
         :param Id: file id 
         :param partNumber: the file part to be uploaded
         :param md5: md5 sum of datastream
-        :param data: the name of the file containing only data to be uploaded
+        :param data: the data to be uploaded: the name of a file containing only the part data, or a FileRegion of the part in the local file
         :returns: A dictionary of the server response, with a 'Response' key that contains a dict, which contains an 'ETag' key and value on success. On failure, this method returns None 
         '''
         method                       = 'PUT'
@@ -1152,7 +1491,7 @@ class BaseSpaceAPI(BaseAPI):
         return self.__singleRequest__(FileResponse.FileResponse,
                                       resourcePath, method, queryParams, headerParams, postData=postData, forcePost=1)
 
-    def multipartFileUpload(self, resourceType, resourceId, localPath, fileName, directory, contentType, tempDir=None, processCount=10, partSize=25):
+    def multipartFileUpload(self, resourceType, resourceId, localPath, fileName, directory, contentType, tempDir=None, processCount=10, partSize=25, retryPolicy=None, engine='process', resume=False, journalPath=None):
         '''
         Method for multi-threaded file-upload for parallel transfer of very large files (currently only runs on unix systems)
         
@@ -1162,9 +1501,13 @@ class BaseSpaceAPI(BaseAPI):
         :param fileName: The desired filename on the server
         :param directory: The desired directory name on the server (empty string will place it in the root directory)
         :param contentType: The content type of the file
-        :param tempdir: (optional) Temp directory to use for temporary file chunks to upload
+        :param tempdir: (optional, deprecated) No longer used; file parts are uploaded directly from the local file
         :param processCount: (optional) The number of processes to be used, default 10
         :param partSize: (optional) The size in MB of individual upload parts (must be >5 Mb and <=25 Mb), default 25
+        :param retryPolicy: (optional) A RetryPolicy for failed part uploads, default is up to 20 attempts with backoff
+        :param engine: (optional) 'process' to upload parts in processCount worker processes, or 'thread' to use worker threads (without forking), default 'process'
+        :param resume: (optional) record the BaseSpace File Id and the md5 and ETag of each uploaded part in a journal, and resume an interrupted upload of the same local file (unmodified) to the same destination with the same partSize by uploading only its missing parts to its BaseSpace File, default False
+        :param journalPath: (optional) the path of the journal file when resuming, default is localPath with a '.upload.journal' extension
         :returns: a File instance, which has been updated after the upload has completed.
         '''
         if resourceType not in PROPERTY_RESOURCE_TYPES:
@@ -1172,13 +1515,37 @@ class BaseSpaceAPI(BaseAPI):
         # First create file object in BaseSpace, then create multipart upload object and start upload
         if partSize <= 5 or partSize > 25:
             raise UploadPartSizeException("Multipart upload partSize must be >5 MB and <=25 MB")
-        if tempDir is None:
-            tempDir = mkdtemp()
-        bsFile = self.__initiateMultipartFileUpload__(resourceType, resourceId, fileName, directory, contentType)
-        myMpu = mpu(self, localPath, bsFile, processCount, partSize, temp_dir=tempDir)                
+        initiate = lambda: self.__initiateMultipartFileUpload__(resourceType, resourceId, fileName, directory, contentType)
+        return self.__multipartUpload__(initiate, resourceType, resourceId, localPath, fileName, directory, tempDir, processCount, partSize, retryPolicy, engine, resume, journalPath)
+
+    def __multipartUpload__(self, initiate, resourceType, resourceId, localPath, fileName, directory, tempDir, processCount, partSize, retryPolicy, engine, resume, journalPath):
+        '''
+        Uploads a local file to a new multipart BaseSpace File; when resuming, re-attaches to the File of an interrupted upload
+        of the same local file to the same destination instead, unless it was completed (then returned) or aborted meanwhile
+        
+        :param initiate: a function that creates and returns the new multipart File
+        :returns: a File instance, which has been updated after the upload has completed.
+        '''
+        journal = None
+        bsFile = None
+        if resume:
+            key = {'Path': os.path.abspath(localPath), 'Size': os.path.getsize(localPath), 'MTime': os.path.getmtime(localPath),
+                   'PartSize': partSize, 'ResourceType': resourceType, 'ResourceId': resourceId, 'Name': fileName, 'Directory': directory}
+            journal = UploadJournal(journalPath or localPath + '.upload.journal', key)
+            fileId = journal.get_file_id()
+            if fileId is not None:
+                bsFile = self.getFileById(fileId)
+                if getattr(bsFile, 'UploadStatus', None) == 'complete':
+                    journal.remove()
+                    return bsFile
+                if getattr(bsFile, 'UploadStatus', None) != 'pending':
+                    bsFile = None
+        if bsFile is None:
+            bsFile = initiate()
+        myMpu = mpu(self, localPath, bsFile, processCount, partSize, temp_dir=tempDir, retry_policy=retryPolicy, engine=engine, journal=journal)                
         return myMpu.upload()                
 
-    def multipartFileUploadSample(self, Id, localPath, fileName, directory, contentType, tempDir=None, processCount=10, partSize=25):
+    def multipartFileUploadSample(self, Id, localPath, fileName, directory, contentType, tempDir=None, processCount=10, partSize=25, retryPolicy=None, engine='process', resume=False, journalPath=None):
         '''
         Method for multi-threaded file-upload for parallel transfer of very large files (currently only runs on unix systems)
 
@@ -1187,21 +1554,22 @@ class BaseSpaceAPI(BaseAPI):
         :param fileName: The desired filename on the server
         :param directory: The desired directory name on the server (empty string will place it in the root directory)
         :param contentType: The content type of the file
-        :param tempdir: (optional) Temp directory to use for temporary file chunks to upload
+        :param tempdir: (optional, deprecated) No longer used; file parts are uploaded directly from the local file
         :param processCount: (optional) The number of processes to be used, default 10
         :param partSize: (optional) The size in MB of individual upload parts (must be >5 Mb and <=25 Mb), default 25
+        :param retryPolicy: (optional) A RetryPolicy for failed part uploads, default is up to 20 attempts with backoff
+        :param engine: (optional) 'process' to upload parts in processCount worker processes, or 'thread' to use worker threads (without forking), default 'process'
+        :param resume: (optional) record the BaseSpace File Id and the md5 and ETag of each uploaded part in a journal, and resume an interrupted upload of the same local file (unmodified) to the same Sample with the same partSize by uploading only its missing parts to its BaseSpace File, default False
+        :param journalPath: (optional) the path of the journal file when resuming, default is localPath with a '.upload.journal' extension
         :returns: a File instance, which has been updated after the upload has completed.
         '''
         # First create file object in BaseSpace, then create multipart upload object and start upload
         if partSize <= 5 or partSize > 25:
             raise UploadPartSizeException("Multipart upload partSize must be >5 MB and <=25 MB")
-        if tempDir is None:
-            tempDir = mkdtemp()
-        bsFile = self.__initiateMultipartFileUploadSample__(Id, fileName, directory, contentType)
-        myMpu = mpu(self, localPath, bsFile, processCount, partSize, temp_dir=tempDir)
-        return myMpu.upload()
+        initiate = lambda: self.__initiateMultipartFileUpload__('samples', Id, fileName, directory, contentType)
+        return self.__multipartUpload__(initiate, 'samples', Id, localPath, fileName, directory, tempDir, processCount, partSize, retryPolicy, engine, resume, journalPath)
 
-    def fileDownload(self, Id, localDir, byteRange=None, createBsDir=False):
+    def fileDownload(self, Id, localDir, byteRange=None, createBsDir=False, processCount=10, engine='process'):
         '''
         Downloads a BaseSpace file to a local directory, and names the file with the BaseSpace file name.
         If the File has a directory in BaseSpace, it will be re-created locally in the provided localDir 
@@ -1217,11 +1585,13 @@ class BaseSpaceAPI(BaseAPI):
         :param localDir: The local directory to place the file in    
         :param byteRange: (optional) The byte range of the file to retrieve, provide a 2-element list with start and end byte values
         :param createBsDir: (optional) create BaseSpace File's directory inside localDir (default: False)
+        :param processCount: (optional) for multipart downloads, the number of workers, default 10
+        :param engine: (optional) for multipart downloads, 'process' to use worker processes or 'thread' to use worker threads, default 'process'
         :raises ByteRangeException: if the provided byte range is invalid
+        :raises ServerResponseException: if the download fails with a fatal error or after all retries of the api's RetryPolicy
         :returns: a File instance                
         '''
-        max_retries = 5
-        multipart_min_file_size = 5000000 # bytes
+        multipart_min_file_size = MULTIPART_MIN_DOWNLOAD_SIZE # bytes
         if byteRange:
             try:
                 rangeSize = byteRange[1] - byteRange[0] + 1
@@ -1240,21 +1610,20 @@ class BaseSpaceAPI(BaseAPI):
                 localDest = os.path.join(localDir, os.path.dirname(bsFile.Path))
                 if not os.path.exists(localDest):
                     os.makedirs(localDest)            
-            attempt = 0
-            while attempt < max_retries:
+            retryState = self.getRetryPolicy().begin()
+            while True:
                 try:
-                    self.__downloadFile__(Id, localDest, bsFile.Name, byteRange, standaloneRangeFile=True)
+                    self.__downloadFile__(Id, localDest, bsFile.Name, byteRange, standaloneRangeFile=True, fileSize=bsFile.Size)
                     break
                 except Exception as e:
-                    logging.warn("download failed (%s), retry attempt: %s" % (str(e), attempt+1))
-                    attempt += 1
-            if attempt == max_retries:
-                raise ServerResponseException("Max retries exceeded")
+                    logging.warn("download failed (%s), attempt: %s" % (str(e), retryState.attempts))
+                    if not retryState.retry(exc=e):
+                        raise ServerResponseException("Download failed after %d attempts: %s" % (retryState.attempts, str(e)))
             return bsFile
         else:                        
-            return self.multipartFileDownload(Id, localDir, createBsDir=createBsDir)
+            return self.multipartFileDownload(Id, localDir, processCount=processCount, createBsDir=createBsDir, engine=engine)
 
-    def __downloadFile__(self, Id, localDir, name, byteRange=None, standaloneRangeFile=False, lock=None): #@ReservedAssignment
+    def __downloadFile__(self, Id, localDir, name, byteRange=None, standaloneRangeFile=False, lock=None, fileSize=None, computeMd5=False, sync=False): #@ReservedAssignment
         '''
         Downloads a BaseSpace file to a local directory. 
         Supports byte-range requests; by default will seek() into local file for multipart downloads, 
@@ -1263,66 +1632,123 @@ class BaseSpaceAPI(BaseAPI):
         This method is for downloading relatively small files, eg. < 5 MB. 
         For larger files, use multipart download (which uses this method for file parts).                
         
+        The storage url of the file is taken from the api's ContentUrlCache, if any, so that the parts of a multipart
+        download share one url; if the storage server refuses the url (eg. because it expired), a new url is fetched
+        and the request is made again.
+        
         :param Id: The file id
         :param localDir: The local directory to place the file in
         :param name: The name of the local file
         :param byteRange: (Optional) The byte range of the file to retrieve, provide a 2-element list with start and end byte values
         :param standaloneRangeFile: (Optional) if True store only byte-range data in standalone file
-        :param lock: (Optional) Multiprocessing lock to prevent multiple processes from writing to same output file concurrently - only needed when using multipart download
+        :param lock: (Optional) no longer used; each part of a multipart download writes its own byte range of the file, without locking
+        :param fileSize: (Optional) the size of the file in BaseSpace, to check the size of a download without a byte range; if not provided, the size sent by the storage server is used
+        :param computeMd5: (Optional) compute the md5 of the downloaded data as it's written, and return it
+        :param sync: (Optional) sync the written data to disk before returning, eg. before recording it in a download journal
         :raises Exception: if REST API call to BaseSpace server fails
         :raises DownloadFailedException: if downloaded file size doesn't match the size in BaseSpace
-        :returns: None
+        :returns: the hex md5 of the downloaded data if computeMd5 is True, otherwise None
         '''
         if byteRange is None:
             byteRange = []
-        resourcePath = '/files/{Id}/content'
-        resourcePath = resourcePath.replace('{format}', 'json')
-        method = 'GET'
-        queryParams = {}
-        headerParams = {}
-        resourcePath = resourcePath.replace('{Id}', Id)
-        queryParams['redirect'] = 'meta' # we need to add this parameter to get the Amazon link directly 
-        
-        response = self.apiClient.callAPI(resourcePath, method, queryParams, None, headerParams)
-        if response['ResponseStatus'].has_key('ErrorCode'):
-            raise Exception('BaseSpace error: ' + str(response['ResponseStatus']['ErrorCode']) + ": " + response['ResponseStatus']['Message'])
-        
         # get the Amazon URL, then do the download; for range requests include
         # size to ensure reading until end of data stream. Create local file if
         # it doesn't exist (don't truncate in case other processes from 
         # multipart download also do this)
-        req = urllib2.Request(response['Response']['HrefContent'])
         filename = os.path.join(localDir, name)
-        if not os.path.exists(filename):
-            open(filename, 'a').close()
-        iter_size = 16*1024 # python default
-        if len(byteRange):
-            req.add_header('Range', 'bytes=%s-%s' % (byteRange[0], byteRange[1]))
-        flo = urllib2.urlopen(req, timeout=self.getTimeout()) # timeout prevents blocking                
+        flo = self.__openContentUrl__(Id, byteRange)
         totRead = 0
-        with open(filename, 'r+b', 0) as fp:
+        md5 = hashlib.md5() if computeMd5 else None
+        # write through a file descriptor of our own, positioned at the start of the byte range,
+        # so that the parts of a multipart download write to the file concurrently
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0666)
+        try:
             if len(byteRange) and standaloneRangeFile == False:
-                fp.seek(byteRange[0])
-            cur = flo.read(iter_size)
+                os.lseek(fd, byteRange[0], os.SEEK_SET)
+            cur = flo.read(DOWNLOAD_BUFFER_SIZE)
             while cur:
-                if lock is not None:
-                    with lock:
-                        fp.write(cur)
-                else:
-                    fp.write(cur)
+                written = 0
+                while written < len(cur):
+                    written += os.write(fd, buffer(cur, written))
+                if md5 is not None:
+                    md5.update(cur)
                 totRead += len(cur)
-                cur = flo.read(iter_size)
+                cur = flo.read(DOWNLOAD_BUFFER_SIZE)
+            if sync:
+                getattr(os, 'fdatasync', os.fsync)(fd)
+        finally:
+            os.close(fd)
+            flo.close()
         # check that actual downloaded byte size is correct
         if len(byteRange):
             expSize = byteRange[1] - byteRange[0] + 1
             if totRead != expSize:
                 raise DownloadFailedException("Ranged download size is not as expected: %d vs %d" % (totRead, expSize))
         else:
-            bsFile = self.getFileById(Id)
-            if totRead != bsFile.Size:
-                raise DownloadFailedException("Downloaded file size doesn't match file size in BaseSpace: %d vs %d" % (totRead, bsFile.Size))
+            if fileSize is None:
+                if flo.headers.get('content-length') is not None:
+                    fileSize = int(flo.headers['content-length'])
+                else:
+                    fileSize = self.getFileById(Id).Size
+            if totRead != fileSize:
+                raise DownloadFailedException("Downloaded file size doesn't match file size in BaseSpace: %d vs %d" % (totRead, fileSize))
+        if md5 is not None:
+            return md5.hexdigest()
 
-    def multipartFileDownload(self, Id, localDir, processCount=10, partSize=25, createBsDir=False, tempDir=""):
+    def __openContentUrl__(self, Id, byteRange=None):
+        '''
+        Opens a GET request of a file's content (or a byte range of it) from the storage server;
+        if the storage server refuses the url (eg. because it expired), a new url is fetched and the request is made again
+        
+        :param Id: The file id
+        :param byteRange: (Optional) The byte range of the file to retrieve, provide a 2-element list with start and end byte values
+        :raises Exception: if REST API call to BaseSpace server fails
+        :raises urllib2.HTTPError: if the storage server refuses the request
+        :returns: the response, a file-like object
+        '''
+        refreshed = False
+        while True:
+            url = self.__getContentUrl__(Id)
+            req = urllib2.Request(url)
+            if byteRange:
+                req.add_header('Range', 'bytes=%s-%s' % (byteRange[0], byteRange[1]))
+            self.__waitForStorageRequest__()
+            try:
+                return urllib2.urlopen(req, timeout=self.getTimeout()) # timeout prevents blocking                
+            except urllib2.HTTPError as e:
+                # a presigned url is refused once it has expired; get a new one, once
+                if e.code != 403 or refreshed or self.contentUrlCache is None:
+                    raise
+                self.contentUrlCache.invalidate(Id, url)
+                refreshed = True
+
+    def __getContentUrl__(self, Id):
+        '''
+        Returns the storage url of a file's content, from the ContentUrlCache if the api has one
+        
+        :param Id: The file id
+        :raises Exception: if REST API call to BaseSpace server fails
+        :returns: a URL
+        '''
+        if self.contentUrlCache is None:
+            return self.fileUrl(Id)
+        return self.contentUrlCache.get(Id, self.fileUrl)
+
+    def getContentUrlCache(self):
+        '''
+        Returns the ContentUrlCache of the storage urls of file contents, or None if they aren't cached
+        '''
+        return self.contentUrlCache
+
+    def setContentUrlCache(self, contentUrlCache):
+        '''
+        Specify the ContentUrlCache of the storage urls of file contents, eg. to share one between BaseSpaceAPI instances
+        
+        :param contentUrlCache: a ContentUrlCache instance, or None to request the url of a file for every download
+        '''
+        self.contentUrlCache = contentUrlCache
+
+    def multipartFileDownload(self, Id, localDir, processCount=10, partSize=25, createBsDir=False, tempDir="", retryPolicy=None, engine='process', resume=False, verify=False):
         '''
         Method for multi-threaded file-download for parallel transfer of very large files (currently only runs on unix systems)
         
@@ -1332,9 +1758,13 @@ class BaseSpaceAPI(BaseAPI):
         :param partSize: (optional) The size in MB of individual file parts to download, default 25
         :param createBsDir: (optional) create BaseSpace File's directory in local_dir, default False
         :param tempDir: (optional) Set temp directory to use debug mode, which stores downloaded file chunks in individual files, then completes by 'cat'ing chunks into large file
+        :param retryPolicy: (optional) A RetryPolicy for failed part downloads, default is up to 20 attempts with backoff
+        :param engine: (optional) 'process' to download parts in processCount worker processes, or 'thread' to use worker threads (without forking), default 'process'
+        :param resume: (optional) record complete parts in a journal next to the partial file, and resume an interrupted download of the same file (Id, size and ETag) and partSize by downloading only its missing parts; each part is synced to disk before it's journaled, default False
+        :param verify: (optional) when resuming, check the md5 of each journaled part in the partial file before trusting it, default False
         :returns: a File instance 
         '''
-        myMpd = mpd(self, Id, localDir, processCount, partSize, createBsDir, tempDir)
+        myMpd = mpd(self, Id, localDir, processCount, partSize, createBsDir, tempDir, retry_policy=retryPolicy, engine=engine, resume=resume, verify=verify)
         return myMpd.download()
 
     def fileUrl(self, Id):
@@ -1369,30 +1799,15 @@ class BaseSpaceAPI(BaseAPI):
         :returns: Dict with s3 url ('url' key) and etag ('etag' key)
         '''
         ret = {}
-        resourcePath = '/files/{Id}/content'
-        resourcePath = resourcePath.replace('{format}', 'json')
-        method = 'GET'
-        queryParams = {}
-        headerParams = {}
-        resourcePath = resourcePath.replace('{Id}', Id)
-        queryParams['redirect'] = 'meta' # we need to add this parameter to get the Amazon link directly 
-        
-        response = self.apiClient.callAPI(resourcePath, method, queryParams,None, headerParams)
-        if response['ResponseStatus'].has_key('ErrorCode'):
-            raise Exception('BaseSpace error: ' + str(response['ResponseStatus']['ErrorCode']) + ": " + response['ResponseStatus']['Message'])
-        
-        # record S3 URL
-        ret['url'] = response['Response']['HrefContent']
-        
         # TODO should use HEAD call here, instead do small GET range request
         # GET S3 url and record etag         
-        req = urllib2.Request(response['Response']['HrefContent'])
-        req.add_header('Range', 'bytes=%s-%s' % (0, 1))
-        flo = urllib2.urlopen(req, timeout=self.getTimeout()) # timeout prevents blocking  
+        flo = self.__openContentUrl__(Id, [0, 1])
         try:
-            etag = flo.headers['etag']
-        except KeyError:
-            etag = ''
+            # record the S3 URL that returned the etag, rather than fetching one again
+            ret['url'] = flo.geturl()
+            etag = flo.headers.get('etag', '')
+        finally:
+            flo.close()
         # strip quotes from etag
         if etag.startswith('"') and etag.endswith('"'):
             etag = etag[1:-1]
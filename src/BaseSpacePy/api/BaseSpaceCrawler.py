@@ -0,0 +1,204 @@
+import sys
+import csv
+import Queue
+import fnmatch
+from multiprocessing.pool import ThreadPool
+
+# the columns of a manifest, in the order they are written by writeManifest()
+MANIFEST_FIELDS = ['Id', 'Name', 'Path', 'Size', 'ParentType', 'ParentId', 'ParentName', 'ProjectId']
+
+# the File attributes requested for the manifest
+FILE_FIELDS = ['Id', 'Name', 'Path', 'Size']
+
+
+class BaseSpaceCrawler(object):
+    '''
+    Crawls BaseSpace projects and runs, listing the files of their Samples and AppResults concurrently,
+    and streams a manifest of the files found: one dictionary per file, with the keys in MANIFEST_FIELDS.
+    Files can be selected by extension and by path (shell-style patterns, eg. 'Data/*/L001/*').
+
+    Items are listed as raw dictionaries, without building model objects, by a bounded pool of worker threads sharing
+    the api's keep-alive ConnectionPool. The files of each Sample or AppResult are listed as soon as it is found, while
+    the Samples and AppResults of the projects are still being listed, and manifest entries are yielded a page of files
+    at a time, in no particular order.
+
+    Example::
+
+        crawler = BaseSpaceCrawler(myAPI, concurrency=20, extensions=['.bam', '.bai'], excludePaths=['*/tmp/*'])
+        crawler.writeManifest(crawler.crawlProjects(projectIds), 'manifest.csv')
+        crawler.close()
+    '''
+    def __init__(self, api, concurrency=10, extensions=None, excludeExtensions=None, paths=None, excludePaths=None, pageSize=1000):
+        '''
+        :param api: a BaseSpaceAPI instance, used to make the requests
+        :param concurrency: (optional) the maximum number of requests in flight at once, default 10
+        :param extensions: (optional) a list of file extensions (eg. ['.bam', 'vcf.gz']); include only files whose name ends with one of them, default None (all files)
+        :param excludeExtensions: (optional) a list of file extensions; exclude files whose name ends with one of them, default None
+        :param paths: (optional) a list of shell-style patterns; include only files whose Path matches one of them, default None (all files)
+        :param excludePaths: (optional) a list of shell-style patterns; exclude files whose Path matches one of them, default None
+        :param pageSize: (optional) the number of items to request per page of each listing, default 1000
+        '''
+        self.api = api
+        self.concurrency = concurrency
+        self.extensions = tuple(ext.lower() for ext in extensions) if extensions else None
+        self.excludeExtensions = tuple(ext.lower() for ext in excludeExtensions) if excludeExtensions else None
+        self.paths = paths
+        self.excludePaths = excludePaths
+        self.pageSize = pageSize
+        # keep a connection alive for every worker, until close()
+        self._connectionPool = api.getConnectionPool()
+        self._connectionPool.reserve(concurrency)
+        self._reserved = concurrency
+        self._pool = ThreadPool(concurrency)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def isIncluded(self, name, path):
+        '''
+        Returns True if a file passes the extension and path filters of the crawler
+
+        :param name: the file name
+        :param path: the file path, relative to its Sample, AppResult or Run
+        '''
+        lowerName = name.lower()
+        if self.extensions is not None and not lowerName.endswith(self.extensions):
+            return False
+        if self.excludeExtensions is not None and lowerName.endswith(self.excludeExtensions):
+            return False
+        if self.paths is not None and not any(fnmatch.fnmatch(path, pattern) for pattern in self.paths):
+            return False
+        if self.excludePaths is not None and any(fnmatch.fnmatch(path, pattern) for pattern in self.excludePaths):
+            return False
+        return True
+
+    def crawlProject(self, Id):
+        '''
+        Lists the files of all Samples and AppResults of a project
+
+        :param Id: the project Id
+        :returns: a generator of manifest entries (dictionaries)
+        '''
+        return self.crawlProjects([Id])
+
+    def crawlProjects(self, Ids):
+        '''
+        Lists the files of all Samples and AppResults of a list of projects
+
+        :param Ids: a list of project Ids
+        :returns: a generator of manifest entries (dictionaries)
+        '''
+        results = Queue.Queue()
+        pending = 0
+        for projectId in Ids:
+            for iterChildren, parentType in [(self.api.iterSamplesByProject, 'Sample'), (self.api.iterAppResultsByProject, 'AppResult')]:
+                self.__submit__(self.__listParents__, (iterChildren, projectId, parentType), results)
+                pending += 1
+        # each listing reports its pages of entries, the file listings it started, and then that it's done
+        while pending:
+            try:
+                kind, value = results.get(True, 1) # a timeout keeps the wait interruptible
+            except Queue.Empty:
+                continue
+            if kind == 'entries':
+                for entry in value:
+                    yield entry
+            elif kind == 'started':
+                pending += 1
+            elif kind == 'done':
+                pending -= 1
+            else:
+                raise value[0], value[1], value[2]
+
+    def crawlRun(self, Id):
+        '''
+        Lists the files of a run; the pages of the run's file listing are requested concurrently
+
+        :param Id: the run Id
+        :returns: a generator of manifest entries (dictionaries)
+        '''
+        files = self.api.iterRunFilesById(Id, pageSize=self.pageSize, fields=FILE_FIELDS, prefetch=self.concurrency)
+        for f in files:
+            if self.isIncluded(f.get('Name', ''), f.get('Path', '')):
+                yield self.__makeEntry__(f, 'Run', Id, None, None)
+
+    def writeManifest(self, entries, path):
+        '''
+        Writes manifest entries to a CSV file, with a header row of MANIFEST_FIELDS
+
+        :param entries: an iterable of manifest entries, eg. from crawlProjects()
+        :param path: the path of the CSV file to write
+        :returns: the number of entries written
+        '''
+        count = 0
+        with open(path, 'wb') as fp:
+            writer = csv.DictWriter(fp, MANIFEST_FIELDS)
+            writer.writeheader()
+            for entry in entries:
+                writer.writerow(dict((key, unicode(value).encode('utf-8') if isinstance(value, basestring) else value)
+                                     for key, value in entry.iteritems()))
+                count += 1
+        return count
+
+    def close(self):
+        '''
+        Waits for all listings in progress to complete, then stops the worker threads
+        '''
+        self._pool.close()
+        self._pool.join()
+        self._connectionPool.unreserve(self._reserved)
+        self._reserved = 0
+
+    def __submit__(self, listing, args, results):
+        '''
+        Schedules a listing on the worker threads; the listing puts its results on the results queue, followed by
+        ('error', exc_info) if it fails, and ('done', None)
+        '''
+        self._pool.apply_async(self.__runListing__, (listing, args, results))
+
+    def __runListing__(self, listing, args, results):
+        try:
+            listing(args, results)
+        except Exception:
+            results.put(('error', sys.exc_info()))
+        finally:
+            results.put(('done', None))
+
+    def __listParents__(self, listing, results):
+        '''
+        Lists the Samples or AppResults of a project, starting the file listing of each one as soon as it is found
+        '''
+        iterChildren, projectId, parentType = listing
+        for child in iterChildren(projectId, pageSize=self.pageSize, fields=['Id', 'Name']):
+            # reported before the file listing starts, so that it's counted before it's done
+            results.put(('started', None))
+            self.__submit__(self.__listFiles__, (parentType, child['Id'], child.get('Name'), projectId), results)
+
+    def __listFiles__(self, parent, results):
+        '''
+        Puts the manifest entries of the files of a Sample or AppResult that pass the filters on the results queue, a page at a time
+        '''
+        parentType, parentId, parentName, projectId = parent
+        if parentType == 'Sample':
+            files = self.api.iterSampleFilesById(parentId, pageSize=self.pageSize, fields=FILE_FIELDS)
+        else:
+            files = self.api.iterAppResultFilesById(parentId, pageSize=self.pageSize, fields=FILE_FIELDS)
+        entries = []
+        for count, f in enumerate(files, 1):
+            if self.isIncluded(f.get('Name', ''), f.get('Path', '')):
+                entries.append(self.__makeEntry__(f, parentType, parentId, parentName, projectId))
+            if count % self.pageSize == 0 and entries:
+                results.put(('entries', entries))
+                entries = []
+        if entries:
+            results.put(('entries', entries))
+
+    def __makeEntry__(self, f, parentType, parentId, parentName, projectId):
+        '''
+        Returns the manifest entry of a file
+        '''
+        return {'Id': f.get('Id'), 'Name': f.get('Name'), 'Path': f.get('Path'), 'Size': f.get('Size'),
+                'ParentType': parentType, 'ParentId': parentId, 'ParentName': parentName, 'ProjectId': projectId}
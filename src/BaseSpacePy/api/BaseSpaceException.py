@@ -41,6 +41,12 @@ class ByteRangeException(Exception):
     def __str__(self):
         return repr(self.parameter)
     
+class DownloadFailedException(Exception):
+    def __init__(self, value):
+        self.parameter = 'Download failed: ' + value
+    def __str__(self):
+        return repr(self.parameter)
+
 class MultiProcessingTaskFailedException(Exception):
     def __init__(self, value):
         self.parameter = 'Multiprocessing task failed: ' + value
@@ -9,17 +9,19 @@ class BillingAPI(BaseAPI):
     '''
     The API class used for all communication with the BaseSpace Billng server
     '''
-    def __init__(self, apiServer, version, appSessionId='', AccessToken=''):        
+    def __init__(self, apiServer, version, appSessionId='', AccessToken='', connectionPool=None, rateLimiter=None):        
         '''
         :param apiServer: the URL of the BaseSpace api server
         :param version: the version of the BaseSpace API
         :param appSessionId: optional, though may be needed for AppSession-related methods
         :param AccessToken: optional, though will be needed for most methods (except to obtain a new access token)
+        :param connectionPool: optional, a ConnectionPool of keep-alive connections to (re)use for api calls, eg. the pool of a BaseSpaceAPI instance
+        :param rateLimiter: optional, a RateLimiter to share request budgets with other API instances, eg. the limiter of a BaseSpaceAPI instance
         '''        
         self.appSessionId   = appSessionId        
         self.version        = version        
         apiServerAndVersion = urlparse.urljoin(apiServer, version)        
-        super(BillingAPI, self).__init__(AccessToken, apiServerAndVersion)
+        super(BillingAPI, self).__init__(AccessToken, apiServerAndVersion, None, connectionPool=connectionPool, rateLimiter=rateLimiter)
 
     def createPurchase(self, products, appSessionId=''):
         '''
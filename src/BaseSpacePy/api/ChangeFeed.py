@@ -0,0 +1,133 @@
+import os
+import json
+from BaseSpacePy.api.APIClient import _parseDatetime
+from BaseSpacePy.model.QueryParameters import QueryParameters as qp
+from BaseSpacePy.model import *
+
+# statuses after which a Sample or AppResult (and its files) is no longer expected to change
+FINAL_STATUSES = set(['complete', 'aborted', 'error', 'failed'])
+
+
+class ChangeFeed(object):
+    '''
+    Incremental sync of the Samples and AppResults of BaseSpace projects, and of their files.
+
+    Each poll of a project returns only the Samples and AppResults created since the previous poll, and those
+    that were still in progress at the previous poll and have changed since (Status or DateModified), with the
+    files of these Samples and AppResults that weren't returned before.
+
+    A watermark is kept for each collection (the Samples, or the AppResults of a project): the newest DateCreated seen and
+    the Ids created at that time, which are used to stop listing the collection (sorted by DateCreated, newest first)
+    once older items are reached; and the Status, DateModified and returned file Ids of items that are still in progress,
+    which are fetched again on each poll. Watermarks are saved in a json file after each successful poll.
+    The first poll of a project returns all of its Samples and AppResults.
+
+    Example::
+
+        feed = ChangeFeed(myAPI, '/data/bs_feed.json')
+        changes = feed.pollProject(projectId)    # eg. every few minutes
+        for appResult in changes['AppResults']:
+            newFiles = changes['Files'][appResult.Id]
+    '''
+    def __init__(self, api, path, pageSize=100):
+        '''
+        :param api: a BaseSpaceAPI instance, used to make the requests
+        :param path: the path of the json file where watermarks are saved; it's created if it doesn't exist
+        :param pageSize: (optional) the number of items to request per page when listing a collection, default 100
+        '''
+        self.api = api
+        self.path = path
+        self.pageSize = pageSize
+        self.watermarks = {}
+        if os.path.exists(path):
+            with open(path) as fp:
+                self.watermarks = json.load(fp)
+
+    def pollProject(self, Id, raw=False):
+        '''
+        Returns the new and changed Samples and AppResults of a project since the previous poll, and their new files,
+        then saves the watermarks of the project
+
+        :param Id: the project Id
+        :param raw: (optional) return decoded json dictionaries instead of model instances, default False
+        :returns: a dictionary with lists of 'Samples' and 'AppResults', and 'Files': a dictionary of lists of new files by Sample or AppResult Id
+        '''
+        watermarks = dict(self.watermarks)
+        samples, sampleFiles = self.__pollCollection__(watermarks, 'projects/%s/samples' % Id,
+            lambda queryPars: self.api.iterSamplesByProject(Id, queryPars, pageSize=self.pageSize, raw=True),
+            self.api.getSamplesByIds, self.api.iterSampleFilesById)
+        appResults, appResultFiles = self.__pollCollection__(watermarks, 'projects/%s/appresults' % Id,
+            lambda queryPars: self.api.iterAppResultsByProject(Id, queryPars, pageSize=self.pageSize, raw=True),
+            self.api.getAppResultsByIds, self.api.iterAppResultFilesById)
+        self.__save__(watermarks)
+        files = dict(sampleFiles)
+        files.update(appResultFiles)
+        if not raw:
+            deserialize = self.api.apiClient.deserialize
+            samples = [deserialize(item, Sample.Sample) for item in samples]
+            appResults = [deserialize(item, AppResult.AppResult) for item in appResults]
+            files = dict((parentId, [deserialize(f, File.File) for f in parentFiles]) for parentId, parentFiles in files.iteritems())
+        return {'Samples': samples, 'AppResults': appResults, 'Files': files}
+
+    def reset(self, Id=None):
+        '''
+        Forgets the watermarks of a project, so that its next poll returns all of its Samples and AppResults
+
+        :param Id: (optional) the project Id, default None (all projects)
+        '''
+        prefix = 'projects/' if Id is None else 'projects/%s/' % Id
+        self.__save__(dict((key, value) for key, value in self.watermarks.iteritems() if not key.startswith(prefix)))
+
+    def __pollCollection__(self, watermarks, key, listNewestFirst, getByIds, iterFiles):
+        '''
+        Returns the new and changed items of a collection, and their new files (by item Id), and updates the collection's watermark
+        '''
+        watermark = watermarks.get(key, {'DateCreated': None, 'Ids': [], 'Pending': {}})
+        newestCreated = watermark['DateCreated']
+        newest = newestCreated and _parseDatetime(newestCreated)
+        newestIds = set(watermark['Ids'])
+        items = []
+        for item in listNewestFirst(qp({'SortBy': 'DateCreated', 'SortDir': 'Desc'})):
+            created = item.get('DateCreated') and _parseDatetime(item['DateCreated'])
+            if newest and created:
+                if created < newest:
+                    break
+                if created == newest and item['Id'] in newestIds:
+                    continue
+            items.append(item)
+        itemIds = set(item['Id'] for item in items)
+        # fetch the items that were in progress, and return those that have changed
+        pending = watermark['Pending']
+        pendingIds = [Id for Id in pending if Id not in itemIds]
+        for Id, item in zip(pendingIds, getByIds(pendingIds, raw=True)):
+            # items that couldn't be fetched stay pending
+            if not isinstance(item, Exception) and [item.get('Status'), item.get('DateModified')] != pending[Id]['State']:
+                items.append(item)
+
+        files = {}
+        newPending = dict((Id, pending[Id]) for Id in pendingIds)
+        for item in items:
+            returnedIds = set(pending[item['Id']]['Files']) if item['Id'] in pending else set()
+            files[item['Id']] = [f for f in iterFiles(item['Id'], pageSize=self.pageSize, raw=True) if f['Id'] not in returnedIds]
+            if str(item.get('Status', '')).lower() in FINAL_STATUSES:
+                newPending.pop(item['Id'], None)
+            else:
+                newPending[item['Id']] = {'State': [item.get('Status'), item.get('DateModified')],
+                                          'Files': sorted(returnedIds.union(f['Id'] for f in files[item['Id']]))}
+            created = item.get('DateCreated') and _parseDatetime(item['DateCreated'])
+            if created and (not newest or created > newest):
+                newest, newestCreated, newestIds = created, item['DateCreated'], set()
+            if created and created == newest:
+                newestIds.add(item['Id'])
+        watermarks[key] = {'DateCreated': newestCreated, 'Ids': sorted(newestIds), 'Pending': newPending}
+        return items, files
+
+    def __save__(self, watermarks):
+        '''
+        Replaces the saved watermarks, writing them to a temporary file first so that the file is never left incomplete
+        '''
+        tempPath = self.path + '.tmp'
+        with open(tempPath, 'w') as fp:
+            json.dump(watermarks, fp)
+        os.rename(tempPath, self.path)
+        self.watermarks = watermarks
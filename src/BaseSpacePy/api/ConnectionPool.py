@@ -0,0 +1,295 @@
+import os
+import time
+import socket
+import base64
+import urllib
+import httplib
+import threading
+import urlparse
+
+from BaseSpacePy.api.BaseSpaceException import ServerResponseException
+
+# the statuses of redirects that are followed for GET and HEAD requests
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+
+class ConnectionPool(object):
+    '''
+    A thread-safe pool of persistent (keep-alive) HTTP/HTTPS connections, keyed by scheme, host and port.
+
+    Connections are checked out for the duration of a single request and returned to the pool once the
+    response has been read, so that subsequent requests to the same host skip the TCP and TLS handshakes.
+    The pool detects when it is used from a forked child process and discards the parent's connections,
+    since sockets must not be shared between processes.
+
+    Worker pools that share the connection pool (eg. AsyncBaseSpaceAPI) reserve() idle connections for their
+    threads while they run, and unreserve() them when they close, so that maxSize itself is never changed.
+
+    Like urllib2, the pool honours the http_proxy, https_proxy and no_proxy environment variables:
+    https requests are tunneled through the proxy with CONNECT, and http requests are sent to the proxy
+    with the full url as the request path.
+    '''
+    def __init__(self, maxSize=10, idleTimeout=60):
+        '''
+        :param maxSize: (optional) the maximum number of idle connections kept per host (unless more are reserved), default 10
+        :param idleTimeout: (optional) idle connections older than this many seconds are closed instead of reused, default 60
+        '''
+        self.maxSize = maxSize
+        self.idleTimeout = idleTimeout
+        self._reset()
+
+    def __getstate__(self):
+        '''
+        Pickle only the pool configuration; connections and locks are recreated on unpickling
+        '''
+        return {'maxSize': self.maxSize, 'idleTimeout': self.idleTimeout}
+
+    def __setstate__(self, state):
+        self.maxSize = state['maxSize']
+        self.idleTimeout = state['idleTimeout']
+        self._reset()
+
+    def _reset(self):
+        '''
+        Forget all idle connections (without closing them) and create a new lock for the current process
+        '''
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._reserved = 0
+        self._pid = os.getpid()
+
+    def _checkPid(self):
+        '''
+        After a fork, the child must not reuse sockets that belong to the parent process
+        '''
+        if self._pid != os.getpid():
+            self._reset()
+
+    def getConnection(self, scheme, host, port, timeout):
+        '''
+        Returns an idle connection to the provided host, or a new connection if none are available.
+
+        :param scheme: 'http' or 'https'
+        :param host: the host name
+        :param port: the port number, or None for the scheme's default port
+        :param timeout: the socket timeout in seconds
+        :returns: a tuple of (httplib connection, True if the connection was reused)
+        '''
+        self._checkPid()
+        key = (scheme, host, port)
+        now = time.time()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn, lastUsed = idle.pop()
+                if now - lastUsed < self.idleTimeout:
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+        proxy = self.getProxy(scheme, host)
+        if proxy is None:
+            connHost, connPort = host, port
+        else:
+            connHost, connPort = proxy.hostname, proxy.port
+        if scheme == 'https':
+            conn = httplib.HTTPSConnection(connHost, connPort, timeout=timeout)
+            if proxy is not None:
+                conn.set_tunnel(host, port, self._proxyHeaders(proxy))
+        else:
+            conn = httplib.HTTPConnection(connHost, connPort, timeout=timeout)
+        return conn, False
+
+    def getProxy(self, scheme, host):
+        '''
+        Returns the proxy configured in the environment for a host (eg. by https_proxy), or None if there is none or the host is in no_proxy.
+
+        :param scheme: 'http' or 'https'
+        :param host: the host name
+        :returns: the proxy url, parsed by urlparse.urlsplit, or None
+        '''
+        proxy = urllib.getproxies().get(scheme)
+        if not proxy or urllib.proxy_bypass(host):
+            return None
+        if '://' not in proxy:
+            proxy = 'http://' + proxy
+        return urlparse.urlsplit(proxy)
+
+    def _proxyHeaders(self, proxy):
+        '''
+        Returns the headers that authenticate with a proxy whose url includes a user name and password
+        '''
+        if proxy.username is None:
+            return {}
+        credentials = urllib.unquote(proxy.username) + ':' + urllib.unquote(proxy.password or '')
+        return {'Proxy-Authorization': 'Basic ' + base64.b64encode(credentials)}
+
+    def releaseConnection(self, scheme, host, port, conn):
+        '''
+        Returns a connection to the pool for reuse, or closes it if the pool for its host is full.
+
+        :param scheme: 'http' or 'https'
+        :param host: the host name
+        :param port: the port number, or None for the scheme's default port
+        :param conn: the httplib connection, whose last response must have been fully read
+        '''
+        self._checkPid()
+        key = (scheme, host, port)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < max(self.maxSize, self._reserved):
+                idle.append((conn, time.time()))
+                return
+        conn.close()
+
+    def reserve(self, size):
+        '''
+        Keeps up to size more idle connections per host (if that is more than maxSize), eg. one for each thread of a worker pool,
+        until they are unreserved.
+
+        :param size: the number of connections to reserve
+        '''
+        self._checkPid()
+        with self._lock:
+            self._reserved += size
+
+    def unreserve(self, size):
+        '''
+        Releases connections reserved with reserve(); idle connections beyond maxSize are closed as they are released.
+
+        :param size: the number of connections that were reserved
+        '''
+        self._checkPid()
+        with self._lock:
+            self._reserved = max(self._reserved - size, 0)
+
+    def clear(self):
+        '''
+        Closes all idle connections
+        '''
+        self._checkPid()
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, lastUsed in conns:
+                conn.close()
+
+    def request(self, method, url, body=None, headers=None, timeout=10):
+        '''
+        Makes an HTTP request on a pooled connection and reads the whole response.
+
+        A request made on a reused connection that the server has meanwhile closed is transparently
+        retried once on a new connection. Redirects of GET and HEAD requests are followed (up to MAX_REDIRECTS),
+        without the Authorization header if they lead to another host; redirects of other requests are
+        refused, since their body can't always be re-sent.
+
+        :param method: the HTTP method, eg. GET
+        :param url: the full url, including scheme, host, path and query string
+        :param body: (optional) a string or a file-like object to send as the request body, default None
+        :param headers: (optional) a dictionary of header key/values, default None
+        :param timeout: (optional) the socket timeout in seconds, default 10
+
+        :raises ServerResponseException: if the connection to the server fails, or on a redirect that is not followed
+        :returns: a tuple of (http status code, dictionary of response headers with lower-case names, response body string)
+        '''
+        if headers is None:
+            headers = {}
+        for redirects in xrange(MAX_REDIRECTS + 1):
+            status, respHeaders, data = self._requestOnce(method, url, body, headers, timeout)
+            if status not in REDIRECT_STATUSES or 'location' not in respHeaders:
+                return status, respHeaders, data
+            if method not in ('GET', 'HEAD'):
+                raise ServerResponseException('Redirect (' + str(status) + ') of a ' + method + ' request to ' + respHeaders['location'] + ' was not followed')
+            location = urlparse.urljoin(url, respHeaders['location'])
+            if urlparse.urlsplit(location).netloc != urlparse.urlsplit(url).netloc:
+                headers = dict((key, value) for key, value in headers.items() if key.lower() != 'authorization')
+            url = location
+        raise ServerResponseException('Too many redirects (more than ' + str(MAX_REDIRECTS) + ') from ' + url)
+
+    def _requestOnce(self, method, url, body, headers, timeout):
+        '''
+        Makes one HTTP request, without following redirects, and reads the whole response
+        '''
+        parsed = urlparse.urlsplit(url)
+        scheme, host, port = parsed.scheme, parsed.hostname, parsed.port
+        proxy = self.getProxy(scheme, host)
+        if scheme == 'http' and proxy is not None:
+            # a plain http proxy expects the full url as the request path
+            path = url
+            headers = dict(headers, **self._proxyHeaders(proxy))
+        else:
+            path = parsed.path or '/'
+            if parsed.query:
+                path = path + '?' + parsed.query
+        while True:
+            conn, reused = self.getConnection(scheme, host, port, timeout)
+            try:
+                conn.request(method, path, body, headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (httplib.HTTPException, socket.error) as e:
+                conn.close()
+                # a stale keep-alive connection fails on first use; retry if the body can be re-sent
+                if reused and (body is None or isinstance(body, basestring) or hasattr(body, 'seek')):
+                    if hasattr(body, 'seek'):
+                        body.seek(0)
+                    continue
+                raise ServerResponseException('URLError: ' + str(e))
+            if resp.will_close:
+                conn.close()
+            else:
+                self.releaseConnection(scheme, host, port, conn)
+            return resp.status, dict(resp.getheaders()), data
+
+
+class FileRegion(object):
+    '''
+    A read-only, file-like view of a byte range of a local file, used to stream part of a file
+    as a request body without copying it into memory or into a temp file.
+    '''
+    def __init__(self, path, offset=0, length=None):
+        '''
+        :param path: the path of the local file
+        :param offset: (optional) the first byte of the region, default 0
+        :param length: (optional) the number of bytes in the region, default is until the end of the file
+        '''
+        self.path = path
+        self.offset = offset
+        if length is None:
+            length = os.path.getsize(path) - offset
+        self.length = length
+        self._fp = None
+        self._remaining = length
+
+    def __len__(self):
+        return self.length
+
+    def seek(self, pos, whence=0):
+        '''
+        Seek within the region; only rewinding to the start of the region is supported
+        '''
+        if pos != 0 or whence != 0:
+            raise IOError("FileRegion only supports seek(0)")
+        if self._fp is not None:
+            self._fp.seek(self.offset)
+        self._remaining = self.length
+
+    def read(self, size=-1):
+        '''
+        Read up to size bytes from the region, or the rest of the region if size is negative
+        '''
+        if self._fp is None:
+            self._fp = open(self.path, 'rb')
+            self._fp.seek(self.offset + self.length - self._remaining)
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._fp.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
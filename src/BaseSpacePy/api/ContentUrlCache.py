@@ -0,0 +1,125 @@
+import time
+import calendar
+import threading
+import urlparse
+
+# the number of locks that serialize the fetches of urls; files are assigned a lock by the hash of their Id
+FETCH_LOCK_STRIPES = 64
+
+
+class ContentUrlCache(object):
+    '''
+    An in-memory cache of the presigned storage urls of BaseSpace file contents (the HrefContent of /files/{Id}/content),
+    shared by all the part downloads of a file, so that each file's url is requested from the api once rather than once per part.
+
+    Urls are cached until shortly before they expire: the expiry is read from the url's signature parameters
+    (Expires, or X-Amz-Date with X-Amz-Expires), or is maxAge seconds after the url was fetched if the url has none.
+    An url that was refused by the storage server (eg. expired, 403) is replaced by invalidate(), so that the next
+    request for it fetches a new one. Concurrent requests for the url of the same file share one api call; fetches are
+    serialized by a fixed set of locks, so the cache holds no per-file state besides the urls.
+
+    Example::
+
+        cache = ContentUrlCache()
+        url = cache.get(fileId, myAPI.fileUrl)
+        cache.invalidate(fileId, url) # after the storage server refused url
+    '''
+    def __init__(self, maxAge=600, margin=60):
+        '''
+        :param maxAge: (optional) the number of seconds to keep an url without an expiry in its parameters, default 600
+        :param margin: (optional) the number of seconds before its expiry that an url is fetched again, default 60
+        '''
+        self.maxAge = maxAge
+        self.margin = margin
+        self._urls = {}
+        self._reset()
+
+    def __getstate__(self):
+        '''
+        Pickle the configuration and the cached urls; locks are recreated on unpickling
+        '''
+        return {'maxAge': self.maxAge, 'margin': self.margin, '_urls': dict(self._urls)}
+
+    def __setstate__(self, state):
+        self.maxAge = state['maxAge']
+        self.margin = state['margin']
+        self._urls = state['_urls']
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._fetchLocks = [threading.Lock() for i in xrange(FETCH_LOCK_STRIPES)]
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, Id, fetch):
+        '''
+        Returns the cached url of a file's content, or fetches and caches a new one if there is none or it's about to expire
+
+        :param Id: the file Id
+        :param fetch: a function of the file Id that returns a new url of its content, eg. BaseSpaceAPI.fileUrl
+        :returns: an url
+        '''
+        url = self._current(Id)
+        if url is not None:
+            return url
+        with self._fetchLocks[hash(Id) % FETCH_LOCK_STRIPES]:
+            # another thread may have fetched the url while we waited
+            url = self._current(Id)
+            if url is not None:
+                return url
+            fetched = time.time()
+            url = fetch(Id)
+            with self._lock:
+                self.misses += 1
+                self._urls[Id] = (url, self.getExpiry(url, fetched))
+            return url
+
+    def invalidate(self, Id, url=None):
+        '''
+        Removes the cached url of a file's content
+
+        :param Id: the file Id
+        :param url: (optional) remove the cached url only if it's this one, so that concurrent downloads refused with the same url fetch a new one only once; default None (remove any url)
+        '''
+        with self._lock:
+            if Id in self._urls and (url is None or self._urls[Id][0] == url):
+                del self._urls[Id]
+
+    def getExpiry(self, url, fetched=None):
+        '''
+        Returns the time (in seconds since the epoch) when a presigned url expires
+
+        :param url: the url
+        :param fetched: (optional) the time when the url was fetched, used if the url has no expiry parameters, default now
+        '''
+        if fetched is None:
+            fetched = time.time()
+        params = dict((key.lower(), value) for key, value in urlparse.parse_qsl(urlparse.urlparse(url).query))
+        try:
+            if 'expires' in params:
+                return float(params['expires'])
+            if 'x-amz-date' in params and 'x-amz-expires' in params:
+                signed = calendar.timegm(time.strptime(params['x-amz-date'], '%Y%m%dT%H%M%SZ'))
+                return signed + float(params['x-amz-expires'])
+        except ValueError:
+            pass
+        return fetched + self.maxAge
+
+    def getStats(self):
+        '''
+        Returns a dictionary of cache statistics: hits, misses, and entries (the number of cached urls)
+        '''
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._urls)}
+
+    def _current(self, Id):
+        '''
+        Returns the cached url of a file's content if it's not about to expire, or None
+        '''
+        with self._lock:
+            url, expiry = self._urls.get(Id, (None, 0))
+            if url is not None and time.time() < expiry - self.margin:
+                self.hits += 1
+                return url
+        return None
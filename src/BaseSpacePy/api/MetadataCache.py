@@ -0,0 +1,168 @@
+import os
+import json
+import time
+import urllib
+import hashlib
+import sqlite3
+import threading
+
+# the last access time of a cached response is updated at most this often (in seconds), so that most reads don't write
+ACCESS_UPDATE_INTERVAL = 60
+# eviction removes the least recently used responses until the cache is below this fraction of maxBytes
+EVICTION_TARGET = 0.9
+
+class MetadataCache(object):
+    '''
+    A persistent, SQLite-backed cache of the api responses of immutable BaseSpace resources
+    (completed Runs, Files whose upload is complete, and completed AppResults).
+
+    Responses are stored as json and deserialized on every read, so cached objects are never shared.
+    The cache file may be used by several processes at once, and is kept below a maximum size by
+    evicting the least recently used responses (in batches, down to EVICTION_TARGET of the maximum size).
+    The total size is kept up to date by triggers, and access times are updated at most every ACCESS_UPDATE_INTERVAL
+    seconds, so neither reads nor writes scan the cache. Responses are stored per api server and access token.
+
+    Example::
+
+        cache = MetadataCache('/data/bs_metadata.db')
+        myAPI = BaseSpaceAPI(profile='DEFAULT', metadataCache=cache)
+        run = myAPI.getRunById(runId)      # read from the cache file if the run was completed when last fetched
+        cache.invalidate('/runs/' + runId) # force the run to be fetched again
+    '''
+    def __init__(self, path=None, maxBytes=256*1024*1024):
+        '''
+        :param path: (optional) the path of the SQLite cache file, default ~/.basespacepy_metadata.db
+        :param maxBytes: (optional) the maximum total size in bytes of the cached responses, default 256 MB
+        '''
+        if path is None:
+            path = os.path.join(os.path.expanduser('~'), '.basespacepy_metadata.db')
+        self.path = path
+        self.maxBytes = maxBytes
+        self._reset()
+        conn = self._connection()
+        with conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS responses '
+                         '(key TEXT PRIMARY KEY, resource TEXT, data TEXT, size INTEGER, accessed REAL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+            # the running total size of the responses, shared by all processes using the cache file
+            conn.execute('CREATE TABLE IF NOT EXISTS stats (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER)')
+            conn.execute('INSERT OR IGNORE INTO stats (id, total) SELECT 0, COALESCE(SUM(size), 0) FROM responses')
+            conn.execute('CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses '
+                         'BEGIN UPDATE stats SET total = total + NEW.size WHERE id = 0; END')
+            conn.execute('CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses '
+                         'BEGIN UPDATE stats SET total = total - OLD.size WHERE id = 0; END')
+
+    def __getstate__(self):
+        '''
+        Pickle only the cache configuration; connections are opened again on unpickling
+        '''
+        return {'path': self.path, 'maxBytes': self.maxBytes}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self.maxBytes = state['maxBytes']
+        self._reset()
+
+    def _reset(self):
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._statsLock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self):
+        '''
+        Returns the SQLite connection of the current thread, opening it if needed; connections are not shared between threads or forked processes
+        '''
+        if self._pid != os.getpid():
+            self._reset()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def makeKey(apiServerAndVersion, resourcePath, queryParams, accessToken):
+        '''
+        Returns the cache key of a request; the access token is stored only as a hash
+
+        :param apiServerAndVersion: the url of the api server with api version
+        :param resourcePath: the api url path (without server and version)
+        :param queryParams: a dictionary of query parameters
+        :param accessToken: the access token of the request
+        '''
+        query = urllib.urlencode(sorted((k, v) for k, v in (queryParams or {}).iteritems() if v is not None))
+        token = hashlib.sha1(accessToken).hexdigest()
+        return '%s %s%s?%s' % (token, apiServerAndVersion, resourcePath, query)
+
+    def get(self, key):
+        '''
+        Returns the cached response (a dictionary) for a key, or None
+        '''
+        conn = self._connection()
+        row = conn.execute('SELECT data, accessed FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            with self._statsLock:
+                self.misses += 1
+            return None
+        now = time.time()
+        if now - row[1] >= ACCESS_UPDATE_INTERVAL:
+            with conn:
+                conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+        with self._statsLock:
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, resourcePath, response):
+        '''
+        Stores a response, then evicts least recently used responses if the cache is larger than maxBytes,
+        until it is below EVICTION_TARGET of maxBytes
+
+        :param key: the cache key, from makeKey()
+        :param resourcePath: the api url path of the resource (without server and version), used for invalidation
+        :param response: the api response, a dictionary
+        '''
+        data = json.dumps(response)
+        conn = self._connection()
+        with conn:
+            # delete rather than replace a previous response, so that the delete trigger updates the total size
+            conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            conn.execute('INSERT INTO responses (key, resource, data, size, accessed) VALUES (?, ?, ?, ?, ?)',
+                         (key, resourcePath, data, len(data), time.time()))
+            total = conn.execute('SELECT total FROM stats WHERE id = 0').fetchone()[0]
+            if total > self.maxBytes:
+                excess = total - int(self.maxBytes * EVICTION_TARGET)
+                evict = []
+                for oldKey, size in conn.execute('SELECT key, size FROM responses ORDER BY accessed'):
+                    if excess <= 0:
+                        break
+                    evict.append((oldKey,))
+                    excess -= size
+                conn.executemany('DELETE FROM responses WHERE key = ?', evict)
+
+    def invalidate(self, resourcePath=None):
+        '''
+        Removes cached responses
+
+        :param resourcePath: (optional) remove only responses for this resource path (without server and version) and its sub-paths, eg. '/runs/123'; default None (remove all responses)
+        '''
+        conn = self._connection()
+        with conn:
+            if resourcePath is None:
+                conn.execute('DELETE FROM responses')
+            else:
+                resourcePath = resourcePath.rstrip('/')
+                conn.execute("DELETE FROM responses WHERE resource = ? OR resource LIKE ? ESCAPE '\\'",
+                             (resourcePath, resourcePath.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '/%'))
+
+    def getStats(self):
+        '''
+        Returns a dictionary of cache statistics: hits and misses (in this process), entries, and bytes (total size of cached responses)
+        '''
+        conn = self._connection()
+        entries = conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        size = conn.execute('SELECT total FROM stats WHERE id = 0').fetchone()[0]
+        with self._statsLock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': entries, 'bytes': size}
@@ -0,0 +1,111 @@
+import time
+import uuid
+import multiprocessing
+
+# shared state of the token buckets created in this process (or inherited from a parent process by fork),
+# keyed by bucket id, so that a bucket unpickled in a worker process re-attaches to its parent's budget
+_SHARED_BUCKETS = {}
+
+
+class TokenBucket(object):
+    '''
+    A token bucket whose budget is shared between threads and between the worker processes forked after it was created.
+
+    Tokens are added continuously at the bucket's rate, up to its burst capacity; each request takes one token,
+    waiting until one is available.
+    '''
+    def __init__(self, rate, burst=None):
+        '''
+        :param rate: the sustained number of requests allowed per second
+        :param burst: (optional) the maximum number of requests allowed at once after an idle period, default is the rate (at least 1)
+        '''
+        if burst is None:
+            burst = max(1, rate)
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.bucketId = uuid.uuid4().hex
+        tokens = multiprocessing.RawValue('d', self.burst)
+        stamp = multiprocessing.RawValue('d', time.time())
+        _SHARED_BUCKETS[self.bucketId] = (tokens, stamp, multiprocessing.Lock())
+        self._attach()
+
+    def __getstate__(self):
+        '''
+        Shared memory can't be pickled; pickle the bucket id and re-attach to the shared state on unpickling
+        '''
+        return {'rate': self.rate, 'burst': self.burst, 'bucketId': self.bucketId}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.bucketId not in _SHARED_BUCKETS:
+            # not a forked child of the creating process, so the budget can't be shared
+            tokens = multiprocessing.RawValue('d', self.burst)
+            stamp = multiprocessing.RawValue('d', time.time())
+            _SHARED_BUCKETS[self.bucketId] = (tokens, stamp, multiprocessing.Lock())
+        self._attach()
+
+    def _attach(self):
+        self._tokens, self._stamp, self._lock = _SHARED_BUCKETS[self.bucketId]
+
+    def acquire(self, tokens=1, sleep=time.sleep):
+        '''
+        Takes tokens from the bucket, waiting until enough are available
+
+        :param tokens: (optional) the number of tokens to take, default 1
+        :param sleep: (optional) the function used to wait, default time.sleep
+        :returns: the number of seconds spent waiting
+        '''
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.time()
+                elapsed = max(0.0, now - self._stamp.value)
+                available = min(self.burst, self._tokens.value + elapsed * self.rate)
+                self._stamp.value = now
+                if available >= tokens:
+                    self._tokens.value = available - tokens
+                    return waited
+                self._tokens.value = available
+                delay = (tokens - available) / self.rate
+            sleep(delay)
+            waited += delay
+
+
+class RateLimiter(object):
+    '''
+    Client-side rate limiter with separate token buckets for BaseSpace API calls and for
+    storage calls (downloads from the pre-signed S3 urls of files).
+
+    A RateLimiter may be shared by several API instances and threads, and its budgets are shared
+    with the worker processes of multipart uploads and downloads, so that all requests made by
+    the program together stay within the configured rates.
+
+    Example::
+
+        limiter = RateLimiter(apiRate=20, storageRate=50)
+        myAPI = BaseSpaceAPI(profile='DEFAULT', rateLimiter=limiter)
+    '''
+    def __init__(self, apiRate=None, apiBurst=None, storageRate=None, storageBurst=None):
+        '''
+        :param apiRate: (optional) the maximum sustained number of API calls per second, default None (unlimited)
+        :param apiBurst: (optional) the maximum number of API calls at once after an idle period, default is the apiRate
+        :param storageRate: (optional) the maximum sustained number of storage calls per second, default None (unlimited)
+        :param storageBurst: (optional) the maximum number of storage calls at once after an idle period, default is the storageRate
+        '''
+        self.buckets = {}
+        if apiRate is not None:
+            self.buckets['api'] = TokenBucket(apiRate, apiBurst)
+        if storageRate is not None:
+            self.buckets['storage'] = TokenBucket(storageRate, storageBurst)
+
+    def acquire(self, kind='api'):
+        '''
+        Waits until a request of the provided kind is allowed
+
+        :param kind: (optional) 'api' or 'storage', default 'api'
+        :returns: the number of seconds spent waiting
+        '''
+        bucket = self.buckets.get(kind)
+        if bucket is None:
+            return 0.0
+        return bucket.acquire()
@@ -0,0 +1,95 @@
+import sys
+import time
+import threading
+
+
+class _Call(object):
+    '''
+    An in-flight call, whose result (or exception) is shared with the callers that wait for it
+    '''
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.excInfo = None
+
+
+class RequestCoalescer(object):
+    '''
+    Coalesces identical concurrent requests ("singleflight"): while a request is in flight, other threads
+    making the same request wait for it and share its result, instead of making their own network call.
+
+    Requests are only coalesced while they are in flight; nothing is cached after a request completes.
+    Callers that may modify the shared result should pass a copy function, so that each waiting caller gets its own copy.
+    '''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.savedCalls = 0
+
+    def __getstate__(self):
+        '''
+        Locks and in-flight calls can't be pickled; an unpickled coalescer starts empty
+        '''
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    @staticmethod
+    def makeKey(params):
+        '''
+        Returns a hashable key for a dictionary of request (query or header) parameters
+        '''
+        if not params:
+            return ()
+        return tuple(sorted(params.iteritems()))
+
+    def call(self, key, function, copy=None, timeout=None):
+        '''
+        Calls function, unless a call with the same key is already in flight, in which case
+        waits for that call and returns its result (or raises its exception). A caller that has waited
+        longer than timeout for a call in flight (eg. a hung request) makes its own call instead.
+
+        :param key: a hashable key that identifies the request, including everything that may change its response
+        :param function: a function without arguments that makes the request
+        :param copy: (optional) a function that returns a copy of a result, eg. copy.deepcopy, applied to the result of another thread's call; default None (share the same object)
+        :param timeout: (optional) the maximum number of seconds to wait for another thread's call, eg. the client's request timeout; default None (wait until it completes)
+        :returns: the return value of function, or (a copy of) the result of another thread's call
+        '''
+        with self._lock:
+            inFlight = self._calls.get(key)
+            if inFlight is None:
+                inFlight = self._calls[key] = _Call()
+                leader = True
+            else:
+                self.savedCalls += 1
+                leader = False
+        if not leader:
+            # wait in short steps, since a wait without a timeout can't be interrupted (eg. by Ctrl-C) on python 2
+            deadline = None if timeout is None else time.time() + timeout
+            while not inFlight.done.wait(1 if deadline is None else max(min(1, deadline - time.time()), 0)):
+                if deadline is not None and time.time() >= deadline:
+                    with self._lock:
+                        self.savedCalls -= 1
+                    return function()
+            if inFlight.excInfo is not None:
+                raise inFlight.excInfo[0], inFlight.excInfo[1], inFlight.excInfo[2]
+            if copy is not None:
+                return copy(inFlight.result)
+            return inFlight.result
+        try:
+            inFlight.result = function()
+        except Exception:
+            inFlight.excInfo = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            inFlight.done.set()
+        return inFlight.result
+
+    def getSavedCallCount(self):
+        '''
+        Returns the number of requests that were served by another thread's in-flight call
+        '''
+        return self.savedCalls
@@ -0,0 +1,158 @@
+import time
+import threading
+import urlparse
+from collections import OrderedDict
+
+
+class CacheEntry(object):
+    '''
+    A cached json response, with the validators needed to revalidate it with the server
+    '''
+    def __init__(self, data, size, expires, etag=None, lastModified=None):
+        self.data = data
+        self.size = size
+        self.expires = expires
+        self.etag = etag
+        self.lastModified = lastModified
+
+    def isFresh(self, now=None):
+        if now is None:
+            now = time.time()
+        return now < self.expires
+
+    def hasValidators(self):
+        return bool(self.etag or self.lastModified)
+
+
+class ResponseCache(object):
+    '''
+    An in-memory cache of decoded json responses to GET requests, bounded by total response size.
+
+    Responses are cached for a time-to-live; afterwards, a response with an ETag or Last-Modified header
+    is revalidated with a conditional GET (a 304 Not Modified response refreshes the entry without
+    re-downloading it), and other responses are fetched again. When the cache is full, the least
+    recently used responses are evicted. POST and PUT calls invalidate the cached responses of the
+    resource they modify, eg. a POST to /projects/123/appresults invalidates all cached /projects/123 responses.
+
+    Cached responses are shared between callers and must not be modified.
+
+    Example::
+
+        cache = ResponseCache(ttl=30, maxBytes=32*1024*1024)
+        myAPI = BaseSpaceAPI(profile='DEFAULT', responseCache=cache)
+        ...
+        print cache.getStats()
+    '''
+    def __init__(self, ttl=60, maxBytes=64*1024*1024):
+        '''
+        :param ttl: (optional) the number of seconds a response is used without revalidation, default 60
+        :param maxBytes: (optional) the maximum total size in bytes of the cached (json) responses, default 64 MB
+        '''
+        self.ttl = ttl
+        self.maxBytes = maxBytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def __getstate__(self):
+        '''
+        Pickle only the cache configuration, eg. when an API instance is sent to a multipart worker process
+        '''
+        return {'ttl': self.ttl, 'maxBytes': self.maxBytes}
+
+    def __setstate__(self, state):
+        self.__init__(state['ttl'], state['maxBytes'])
+
+    @staticmethod
+    def makeKey(url, accessToken):
+        '''
+        Returns the cache key of a GET request: the resource path and sorted query parameters, per access token
+
+        :param url: the full url of the request, including the query string
+        :param accessToken: the access token of the request
+        '''
+        parsed = urlparse.urlsplit(url)
+        query = tuple(sorted(urlparse.parse_qsl(parsed.query, keep_blank_values=True)))
+        return (accessToken, parsed.path, query)
+
+    def get(self, key):
+        '''
+        Returns the cache entry for a key (fresh or not), or None; also marks the entry as recently used
+        '''
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+            return entry
+
+    def put(self, key, data, size, etag=None, lastModified=None):
+        '''
+        Stores a decoded response, evicting least recently used responses if needed
+
+        :param key: the cache key, from makeKey()
+        :param data: the decoded json response
+        :param size: the size in bytes of the json response
+        :param etag: (optional) the ETag header of the response
+        :param lastModified: (optional) the Last-Modified header of the response
+        '''
+        if size > self.maxBytes:
+            return
+        entry = CacheEntry(data, size, time.time() + self.ttl, etag, lastModified)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old.size
+            self._entries[key] = entry
+            self._size += size
+            while self._size > self.maxBytes:
+                evictedKey, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+
+    def refresh(self, entry):
+        '''
+        Restarts the time-to-live of an entry after the server confirmed it is not modified
+        '''
+        entry.expires = time.time() + self.ttl
+
+    def recordHit(self, revalidated=False):
+        with self._lock:
+            if revalidated:
+                self.revalidations += 1
+            else:
+                self.hits += 1
+
+    def recordMiss(self):
+        with self._lock:
+            self.misses += 1
+
+    def invalidate(self, resourcePath=None):
+        '''
+        Removes cached responses
+
+        :param resourcePath: (optional) remove only responses for this resource path (without server and version) and its sub-paths, eg. '/projects/123'; default None (remove all responses)
+        '''
+        with self._lock:
+            if resourcePath is None:
+                self._entries.clear()
+                self._size = 0
+                return
+            resourcePath = resourcePath.rstrip('/')
+            for key in self._entries.keys():
+                path = key[1]
+                idx = path.find(resourcePath)
+                if idx >= 0 and path[idx + len(resourcePath):idx + len(resourcePath) + 1] in ['', '/']:
+                    self._size -= self._entries.pop(key).size
+
+    def getStats(self):
+        '''
+        Returns a dictionary of cache statistics: hits (fresh responses), revalidations (304 responses),
+        misses (downloaded responses), evictions, entries, and bytes (total size of cached responses)
+        '''
+        with self._lock:
+            return {'hits': self.hits, 'revalidations': self.revalidations, 'misses': self.misses,
+                    'evictions': self.evictions, 'entries': len(self._entries), 'bytes': self._size}
@@ -0,0 +1,149 @@
+import time
+import random
+import socket
+import errno
+import urllib2
+import email.utils
+
+from BaseSpacePy.api.BaseSpaceException import *
+
+# http statuses that indicate a transient server-side condition
+RETRYABLE_STATUSES = set([408, 429, 500, 502, 503, 504])
+
+# errors caused by the caller or the local machine, that a retry won't fix
+FATAL_EXCEPTIONS = (UndefinedParameterException, UnknownParameterException, IllegalParameterException,
+                    QueryParameterException, ByteRangeException, UploadPartSizeException,
+                    CredentialsException, ModelNotSupportedException, NotImplementedError)
+FATAL_ERRNOS = set([errno.ENOENT, errno.EACCES, errno.ENOSPC, errno.EROFS, errno.EISDIR])
+
+
+class RetryPolicy(object):
+    '''
+    Decides whether, and after what delay, a failed request or transfer task should be retried.
+
+    Errors are classified as retryable (connection errors, timeouts, and http statuses such as 429 and 503)
+    or fatal (eg. invalid parameters, a missing local file). Retries use capped exponential backoff with
+    full jitter, a server-provided Retry-After delay is honored up to maxDelay (or, with a deadline, as long
+    as it fits in the deadline), and no retry is started that would end after the overall deadline for the operation.
+
+    APIClient uses a RetryPolicy with the default settings unless given another one: GET and PUT requests are
+    attempted up to 5 times after connection errors and 408, 429, 500, 502, 503 and 504 responses, other requests
+    are retried only after 429 and 503 responses. Pass RetryPolicy(maxAttempts=1) for a single attempt.
+
+    The policy itself holds no per-operation state and may be shared between threads; call begin() at
+    the start of each operation to obtain a RetryState that counts its attempts.
+    '''
+    def __init__(self, maxAttempts=5, baseDelay=0.5, maxDelay=30, jitter=True, deadline=None, retryStatuses=None):
+        '''
+        :param maxAttempts: (optional) the maximum number of attempts, including the first, default 5
+        :param baseDelay: (optional) the delay in seconds before the first retry, doubled for each later retry, default 0.5
+        :param maxDelay: (optional) the maximum backoff delay in seconds, and the maximum Retry-After delay honored when there is no deadline, default 30
+        :param jitter: (optional) randomize each delay between 0 and the backoff delay, default True
+        :param deadline: (optional) the maximum total time in seconds for an operation including retries, default None (no deadline)
+        :param retryStatuses: (optional) a set of http status codes to retry, default 408, 429, 500, 502, 503 and 504
+        '''
+        self.maxAttempts = maxAttempts
+        self.baseDelay = baseDelay
+        self.maxDelay = maxDelay
+        self.jitter = jitter
+        self.deadline = deadline
+        if retryStatuses is None:
+            retryStatuses = RETRYABLE_STATUSES
+        self.retryStatuses = set(retryStatuses)
+
+    def begin(self):
+        '''
+        Returns a RetryState to track the attempts of a new operation
+        '''
+        return RetryState(self)
+
+    def isRetryableStatus(self, status):
+        '''
+        Returns True if a response with the provided http status code should be retried
+        '''
+        return status in self.retryStatuses
+
+    def isRetryableException(self, e):
+        '''
+        Returns True if the operation that raised the provided exception should be retried
+        '''
+        if isinstance(e, FATAL_EXCEPTIONS):
+            return False
+        if isinstance(e, urllib2.HTTPError):
+            return self.isRetryableStatus(e.code)
+        if isinstance(e, (IOError, OSError)) and not isinstance(e, (socket.error, urllib2.URLError)):
+            return e.errno not in FATAL_ERRNOS
+        return True
+
+    def getDelay(self, attempt, retryAfter=None):
+        '''
+        Returns the delay in seconds before the next attempt
+
+        :param attempt: the number of attempts made so far (1 after the first failure)
+        :param retryAfter: (optional) the value of a Retry-After response header, in seconds or as an http date
+        :returns: the delay in seconds
+        '''
+        serverDelay = self.parseRetryAfter(retryAfter)
+        if serverDelay is not None:
+            # without a deadline to bound it, don't let a server delay requests indefinitely
+            if self.deadline is None:
+                return min(self.maxDelay, serverDelay)
+            return serverDelay
+        delay = min(self.maxDelay, self.baseDelay * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def parseRetryAfter(retryAfter):
+        '''
+        Converts a Retry-After header value to a delay in seconds
+
+        :param retryAfter: the header value, either a number of seconds or an http date
+        :returns: the delay in seconds, or None if the value is missing or can't be parsed
+        '''
+        if not retryAfter:
+            return None
+        try:
+            return max(0.0, float(retryAfter))
+        except ValueError:
+            pass
+        parsed = email.utils.parsedate_tz(retryAfter)
+        if parsed is None:
+            return None
+        return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+
+class RetryState(object):
+    '''
+    Tracks the attempts of a single operation under a RetryPolicy
+    '''
+    def __init__(self, policy):
+        self.policy = policy
+        self.attempts = 1
+        self.startTime = time.time()
+
+    def retry(self, exc=None, status=None, retryAfter=None, sleep=time.sleep):
+        '''
+        Call after a failed attempt. If the failure is retryable and attempts and time remain,
+        waits for the backoff delay and returns True; otherwise returns False immediately.
+
+        :param exc: (optional) the exception raised by the failed attempt
+        :param status: (optional) the http status code of the failed attempt
+        :param retryAfter: (optional) the value of the Retry-After response header
+        :param sleep: (optional) the function used to wait, eg. an Event's wait() to allow interruption, default time.sleep
+        :returns: True if the operation should be attempted again
+        '''
+        policy = self.policy
+        if exc is not None and not policy.isRetryableException(exc):
+            return False
+        if status is not None and not policy.isRetryableStatus(status):
+            return False
+        if self.attempts >= policy.maxAttempts:
+            return False
+        delay = policy.getDelay(self.attempts, retryAfter)
+        if policy.deadline is not None and time.time() + delay - self.startTime > policy.deadline:
+            return False
+        sleep(delay)
+        self.attempts += 1
+        return True
@@ -1,2 +1,2 @@
 
-__all__ = ['APIClient','BaseSpaceAPI','BillingAPI','BaseAPI','BaseSpaceException']
+__all__ = ['APIClient','BaseSpaceAPI','BillingAPI','BaseAPI','BaseSpaceException','ConnectionPool','AsyncBaseSpaceAPI','RetryPolicy','RateLimiter','ResponseCache','MetadataCache','RequestCoalescer','BaseSpaceCrawler','ChangeFeed','ContentUrlCache']
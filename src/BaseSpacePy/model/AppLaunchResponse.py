@@ -1,23 +1,25 @@
 
-class AppLaunchResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
+
+class AppLaunchResponse(BaseModel):
     '''
     Represents a BaseSpace AppLaunch object.
     '''
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Name': 'str',
-            'DateCreated': 'datetime',
-            'ModifiedOn': 'datetime',
-            'Application': 'str',
-            'Id': 'str',
-            'Href': 'str',
-            'OriginatingUri': 'str',
-            'UserCreatedBy': 'UserCompact',
-            'Properties': 'PropertyList',
-            'Status': 'str',
-            'StatusSummary': 'str'
-        }
+    swaggerTypes = {
+        'Name': 'str',
+        'DateCreated': 'datetime',
+        'ModifiedOn': 'datetime',
+        'Application': 'str',
+        'Id': 'str',
+        'Href': 'str',
+        'OriginatingUri': 'str',
+        'UserCreatedBy': 'UserCompact',
+        'Properties': 'PropertyList',
+        'Status': 'str',
+        'StatusSummary': 'str'
+    }
+    __slots__ = tuple(swaggerTypes)
     
     def __str__(self):
         return self.Name
@@ -1,27 +1,28 @@
 
 from BaseSpacePy.api.BaseSpaceException import ModelNotInitializedException
 from BaseSpacePy.model.QueryParameters import QueryParameters as qp
+from BaseSpacePy.model.BaseModel import BaseModel
 
-class AppResult(object):
+class AppResult(BaseModel):
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Name': 'str',
-            'Status': 'str',
-            'Description': 'str',
-            'StatusSummary': 'str',
-            'HrefFiles': 'str',
-            'DateCreated': 'datetime',
-            'Id': 'str',
-            'Href': 'str',
-            'UserOwnedBy': 'UserCompact',
-            'StatusDetail': 'str',
-            'HrefGenome': 'str',
-            'AppSession':'AppSessionSemiCompact',
-            'References':'dict',
-            'TotalSize':'int',
-            'Properties': 'PropertyList',
-        }
+    swaggerTypes = {
+        'Name': 'str',
+        'Status': 'str',
+        'Description': 'str',
+        'StatusSummary': 'str',
+        'HrefFiles': 'str',
+        'DateCreated': 'datetime',
+        'Id': 'str',
+        'Href': 'str',
+        'UserOwnedBy': 'UserCompact',
+        'StatusDetail': 'str',
+        'HrefGenome': 'str',
+        'AppSession':'AppSessionSemiCompact',
+        'References':'dict',
+        'TotalSize':'int',
+        'Properties': 'PropertyList',
+    }
+    __slots__ = tuple(swaggerTypes)
     def __str__(self):
         return self.Name
     
@@ -71,18 +72,19 @@ class AppResult(object):
     def getReferencedSamples(self, api):
         '''        
         Returns the sample objects for the referenced sample(s). 
-        NOTE this method makes one request to REST server per sample.
+        NOTE this method makes one request to REST server per sample (the requests are made concurrently).
         If other reference types than Samples are present (they shouldn't be), they are ignored.
         
         :param api: A BaseSpaceAPI instance
+        :raises Exception: the error from the first sample that couldn't be retrieved
         :returns: A list of sample objects that are referenced by the AppResult.
         '''
         self.isInit()
-        res = []
         ids = self.getReferencedSamplesIds()
-        for sid in ids:            
-            sample = api.getSampleById(sid)
-            res.append(sample)                            
+        res = api.getSamplesByIds(ids)
+        for sample in res:
+            if isinstance(sample, Exception):
+                raise sample
         return res
     
     def getFiles(self, api, queryPars=None):
@@ -1,9 +1,11 @@
 
-class AppResultResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'AppResult',
-            'Notifications': 'list<Str>'
-        }
+class AppResultResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'AppResult',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -5,23 +5,23 @@ class AppSession(AppSessionSemiCompact):
     '''
     Returned from getAppSessionById() and getAppSesssion()
     '''
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id':'str',
-            'Href': 'str',
-            'Type': 'str',
-            'Name': 'str',
-            'UserCreatedBy':'UserCompact',
-            'DateCreated': 'datetime',
-            'ModifiedOn': 'datetime',
-            'Status':'str',
-            'StatusSummary': 'str',
-            'Application':'Application',
-            'References':'list<AppSessionLaunchObject>',
-            'Properties':'PropertyList',
-            'AuthorizationCode': 'str',
-            'OriginatingUri': 'str',
-        }
+    swaggerTypes = {
+        'Id':'str',
+        'Href': 'str',
+        'Type': 'str',
+        'Name': 'str',
+        'UserCreatedBy':'UserCompact',
+        'DateCreated': 'datetime',
+        'ModifiedOn': 'datetime',
+        'Status':'str',
+        'StatusSummary': 'str',
+        'Application':'Application',
+        'References':'list<AppSessionLaunchObject>',
+        'Properties':'PropertyList',
+        'AuthorizationCode': 'str',
+        'OriginatingUri': 'str',
+    }
+    __slots__ = tuple(attr for attr in swaggerTypes if attr not in AppSessionSemiCompact.swaggerTypes)
             
     def __deserializeReferences__(self, api):
         '''
@@ -1,13 +1,15 @@
 
-class AppSessionCompact(object):
+from BaseSpacePy.model.BaseModel import BaseModel
+
+class AppSessionCompact(BaseModel):
     '''
     Returned from GET purchases
     '''
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id':'str',
-            'Name':'str',
-        }
+    swaggerTypes = {
+        'Id':'str',
+        'Name':'str',
+    }
+    __slots__ = tuple(swaggerTypes)
         
     def __str__(self):
         return str(self.Name)
@@ -1,17 +1,19 @@
 
-class AppSessionLaunchObject(object):
+from BaseSpacePy.model.BaseModel import BaseModel
+
+class AppSessionLaunchObject(BaseModel):
     '''
     AppSession References contain a list of AppSessionLaunchObjects.
     They typically include the input project for an AppSession.
     '''
-    def __init__(self):
-        self.swaggerTypes = {
-            'Content': 'dict',
-            'Href': 'str',
-            'HrefContent': 'str',
-            'Rel': 'str',
-            'Type': 'str'
-        }
+    swaggerTypes = {
+        'Content': 'dict',
+        'Href': 'str',
+        'HrefContent': 'str',
+        'Rel': 'str',
+        'Type': 'str'
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return str(self.Type)
@@ -1,9 +1,11 @@
 
-class AppSessionResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'AppSession',
-            'Notifications': 'list<Str>'
-        }
+class AppSessionResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'AppSession',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
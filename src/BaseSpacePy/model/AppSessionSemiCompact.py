@@ -1,22 +1,23 @@
 
 from BaseSpacePy.api.BaseSpaceException import ModelNotInitializedException, AppSessionException
+from BaseSpacePy.model.BaseModel import BaseModel
 
-class AppSessionSemiCompact(object):
+class AppSessionSemiCompact(BaseModel):
     '''
     Returned from GET Samples and AppResults
     '''
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id':'str',
-            'Href': 'str',
-            'Name': 'str',
-            'UserCreatedBy':'UserCompact',
-            'Status': 'str',
-            'StatusSummary': 'str',
-            'Application':'Application',
-            'DateCreated': 'datetime',
-            'ModifiedOn': 'datetime',
-        }
+    swaggerTypes = {
+        'Id':'str',
+        'Href': 'str',
+        'Name': 'str',
+        'UserCreatedBy':'UserCompact',
+        'Status': 'str',
+        'StatusSummary': 'str',
+        'Application':'Application',
+        'DateCreated': 'datetime',
+        'ModifiedOn': 'datetime',
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return "App session by " + str(self.UserCreatedBy) + " - Id: " + str(self.Id) + " - status: " + self.Status
@@ -1,13 +1,15 @@
 
-class Application(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id': 'str',
-            'Href': 'str',
-            'Name':'str',
-            'HrefLogo': 'str',
-            'HomepageUri': 'str',
-            'ShortDescription': 'str',
-            'DateCreated': 'datetime'            
-        }
+class Application(BaseModel):
+
+    swaggerTypes = {
+        'Id': 'str',
+        'Href': 'str',
+        'Name':'str',
+        'HrefLogo': 'str',
+        'HomepageUri': 'str',
+        'ShortDescription': 'str',
+        'DateCreated': 'datetime'            
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,14 +1,16 @@
 
-class ApplicationCompact(object):
+from BaseSpacePy.model.BaseModel import BaseModel
+
+class ApplicationCompact(BaseModel):
     """
     Application data returned by GET purchase
     """
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id': 'str',
-            "Name":"str",
-            "CompanyName":"str"
-        }
+    swaggerTypes = {
+        'Id': 'str',
+        "Name":"str",
+        "CompanyName":"str"
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return str(self.Name)
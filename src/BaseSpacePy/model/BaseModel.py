@@ -0,0 +1,70 @@
+
+# returned by a lazy attribute converter when the attribute should not be set (eg. an unrecognized dynamic type)
+UNSET = object()
+
+
+class BaseModel(object):
+    '''
+    Parent class of the BaseSpace models (File, Sample, AppResult, ...)
+
+    Each model declares its attributes and their types once, in the class-level swaggerTypes dictionary
+    (which must not be modified), and stores them in __slots__ rather than in a per-instance dictionary,
+    to keep large listings compact. Attributes that aren't in swaggerTypes may still be set on an instance.
+    Attributes that weren't in the server response are not set, as before.
+
+    A model deserialized in lazy mode (see APIClient) keeps the decoded json of its nested objects, lists and datetimes
+    in _lazy, as a tuple of (dictionary of the decoded json values still to be converted, dictionary of attribute converters),
+    and converts each of these attributes on its first access. Each value is dropped once converted, and _lazy once all are.
+    '''
+    __slots__ = ('__dict__', '_lazy')
+
+    swaggerTypes = {}
+
+    def __getattr__(self, name):
+        '''
+        Called only for attributes that aren't set; materializes a lazily deserialized attribute
+        '''
+        if name != '_lazy':
+            try:
+                raw, converters = self._lazy
+            except AttributeError:
+                pass
+            else:
+                if name in converters and name in raw:
+                    value = converters[name](raw[name])
+                    if value is not UNSET:
+                        setattr(self, name, value)
+                    raw.pop(name, None)
+                    if not raw:
+                        try:
+                            del self._lazy
+                        except AttributeError:
+                            pass
+                    if value is not UNSET:
+                        return value
+            # another thread may have converted the attribute meanwhile
+            try:
+                return object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+
+    def __getstate__(self):
+        '''
+        Returns the set attributes (slots and any others) as a dictionary, for pickling;
+        lazily deserialized attributes are materialized first
+        '''
+        state = dict(self.__dict__)
+        for cls in type(self).__mro__:
+            for attr in cls.__dict__.get('__slots__', ()):
+                if attr not in ('__dict__', '_lazy') and hasattr(self, attr):
+                    state[attr] = getattr(self, attr)
+        return state
+
+    def __setstate__(self, state):
+        '''
+        Restores pickled attributes; also accepts the state of models pickled before swaggerTypes became class-level
+        '''
+        for attr, value in state.iteritems():
+            if attr != 'swaggerTypes':
+                setattr(self, attr, value)
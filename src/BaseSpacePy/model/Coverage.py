@@ -1,14 +1,16 @@
 
-class Coverage(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Chrom': 'str',
-            'BucketSize': 'int',
-            'MeanCoverage': 'list<int>',
-            'EndPos': 'int',
-            'StartPos': 'int'
-        }
+class Coverage(BaseModel):
+
+    swaggerTypes = {
+        'Chrom': 'str',
+        'BucketSize': 'int',
+        'MeanCoverage': 'list<int>',
+        'EndPos': 'int',
+        'StartPos': 'int'
+    }
+    __slots__ = tuple(swaggerTypes)
     def __str__(self):
         return 'Chr' + self.Chrom + ": " + str(self.StartPos) + "-" + str(self.EndPos) +\
              ": BucketSize=" + str(self.BucketSize)
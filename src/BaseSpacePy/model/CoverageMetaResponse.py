@@ -1,9 +1,11 @@
 
-class CoverageMetaResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'CoverageMetadata',
-            'Notifications': 'list<Str>'
-        }
+class CoverageMetaResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'CoverageMetadata',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,11 +1,13 @@
 
-class CoverageMetadata(object):
+from BaseSpacePy.model.BaseModel import BaseModel
+
+class CoverageMetadata(BaseModel):
     
-    def __init__(self):                
-        self.swaggerTypes = {
-            'MaxCoverage': 'int',
-            'CoverageGranularity': 'int'
-        }
+    swaggerTypes = {
+        'MaxCoverage': 'int',
+        'CoverageGranularity': 'int'
+    }
+    __slots__ = tuple(swaggerTypes)
     
     def __str__(self):
         return "CoverageMeta: max=" + str(self.MaxCoverage) + " gran=" + str(self.CoverageGranularity)
@@ -1,9 +1,11 @@
 
-class CoverageResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'Coverage',
-            'Notifications': 'list<Str>'
-        }
+class CoverageResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'Coverage',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,26 +1,27 @@
 
 from BaseSpacePy.api.BaseSpaceException import ModelNotInitializedException, WrongFiletypeException
+from BaseSpacePy.model.BaseModel import BaseModel
 
-class File(object):
+class File(BaseModel):
     '''
     Represents a BaseSpace file object
     '''
-    def __init__(self):
-        self.swaggerTypes = {
-            'Name': 'str',
-            'HrefCoverage': 'str',
-            'HrefParts': 'str',
-            'DateCreated': 'datetime',
-            'UploadStatus': 'str',
-            'Id': 'str',
-            'Href': 'str',
-            'HrefContent': 'str',
-            'HrefVariants': 'str',
-            'ContentType': 'str',
-            'Path': 'str',
-            'Size': 'int',
-            'Properties': 'PropertyList',
-        }
+    swaggerTypes = {
+        'Name': 'str',
+        'HrefCoverage': 'str',
+        'HrefParts': 'str',
+        'DateCreated': 'datetime',
+        'UploadStatus': 'str',
+        'Id': 'str',
+        'Href': 'str',
+        'HrefContent': 'str',
+        'HrefVariants': 'str',
+        'ContentType': 'str',
+        'Path': 'str',
+        'Size': 'int',
+        'Properties': 'PropertyList',
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return self.Name 
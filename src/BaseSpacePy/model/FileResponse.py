@@ -1,9 +1,11 @@
 
-class FileResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'File',
-            'Notifications': 'list<Str>'
-        }
+class FileResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'File',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,9 +1,11 @@
 
-class GenomeResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'GenomeV1',
-            'Notifications': 'list<Str>'
-        }
+class GenomeResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'GenomeV1',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
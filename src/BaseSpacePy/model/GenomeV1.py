@@ -1,15 +1,17 @@
 
-class GenomeV1(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Source': 'str',
-            'SpeciesName': 'str',
-            'Build': 'str',
-            'Id': 'str',
-            'Href': 'str',
-            'DisplayName': 'str'
-        }
+class GenomeV1(BaseModel):
+
+    swaggerTypes = {
+        'Source': 'str',
+        'SpeciesName': 'str',
+        'Build': 'str',
+        'Id': 'str',
+        'Href': 'str',
+        'DisplayName': 'str'
+    }
+    __slots__ = tuple(swaggerTypes)
         
     def __str__(self):        
         return self.DisplayName
@@ -1,24 +1,28 @@
 
+import ast
 import json
-from StringIO import StringIO
+from BaseSpacePy.model.BaseModel import BaseModel
 
-class ListResponse(object):
+class ListResponse(BaseModel):
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'ResourceList',
-            'Notifications': 'list<Str>'
-        }
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'ResourceList',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def _convertToObjectList(self):
         '''
-        Converts items in server response from list of strings to list of python objects (though not BaseSpacePy models)                
+        Returns the items in the server response as a list of python objects (though not BaseSpacePy models).
+        Items are decoded json dictionaries; items that are strings (json, or the repr of a dictionary) are parsed.
         '''
         l = []
         for m in self.Response.Items:
-            io = eval(m)
-            s = json.dumps(io)
-            mj = json.loads(s)
-            l.append(mj)
+            if isinstance(m, basestring):
+                try:
+                    m = json.loads(m)
+                except ValueError:
+                    m = ast.literal_eval(m)
+            l.append(m)
         return l
@@ -1,9 +1,11 @@
 
-class MultiValuePropertyAppResults(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id': 'str',
-            'Content': 'AppResult'
-        }
+class MultiValuePropertyAppResults(BaseModel):
+
+    swaggerTypes = {
+        'Id': 'str',
+        'Content': 'AppResult'
+    }
+    __slots__ = tuple(swaggerTypes)
 
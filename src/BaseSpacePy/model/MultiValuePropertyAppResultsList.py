@@ -1,15 +1,17 @@
 
-class MultiValuePropertyAppResultsList(object):
-
-    def __init__(self):
-        self.swaggerTypes = {
-            'Type': 'str',
-            'Items': 'list<MultiValuePropertyAppResults>',
-            'DisplayedCount': 'int',
-            'TotalCount': 'int',
-            'Offset': 'int',
-            'Limit': 'int',
-            'SortDir': 'str',
-            'SortBy': 'str'
-        }
+from BaseSpacePy.model.BaseModel import BaseModel
+
+class MultiValuePropertyAppResultsList(BaseModel):
+
+    swaggerTypes = {
+        'Type': 'str',
+        'Items': 'list<MultiValuePropertyAppResults>',
+        'DisplayedCount': 'int',
+        'TotalCount': 'int',
+        'Offset': 'int',
+        'Limit': 'int',
+        'SortDir': 'str',
+        'SortBy': 'str'
+    }
+    __slots__ = tuple(swaggerTypes)
 
@@ -1,9 +1,11 @@
 
-class MultiValuePropertyFiles(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id': 'str',
-            'Content': 'File'
-        }
+class MultiValuePropertyFiles(BaseModel):
+
+    swaggerTypes = {
+        'Id': 'str',
+        'Content': 'File'
+    }
+    __slots__ = tuple(swaggerTypes)
 
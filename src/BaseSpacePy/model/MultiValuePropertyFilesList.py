@@ -1,15 +1,17 @@
 
-class MultiValuePropertyFilesList(object):
-
-    def __init__(self):
-        self.swaggerTypes = {
-            'Type': 'str',
-            'Items': 'list<MultiValuePropertyFiles>',
-            'DisplayedCount': 'int',
-            'TotalCount': 'int',
-            'Offset': 'int',
-            'Limit': 'int',
-            'SortDir': 'str',
-            'SortBy': 'str'
-        }
+from BaseSpacePy.model.BaseModel import BaseModel
+
+class MultiValuePropertyFilesList(BaseModel):
+
+    swaggerTypes = {
+        'Type': 'str',
+        'Items': 'list<MultiValuePropertyFiles>',
+        'DisplayedCount': 'int',
+        'TotalCount': 'int',
+        'Offset': 'int',
+        'Limit': 'int',
+        'SortDir': 'str',
+        'SortBy': 'str'
+    }
+    __slots__ = tuple(swaggerTypes)
 
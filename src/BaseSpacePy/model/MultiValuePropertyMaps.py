@@ -1,9 +1,11 @@
 
-class MultiValuePropertyMaps(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id': 'str',
-            'Content': 'list<PropertyMapKeyValues>'
-        }
+class MultiValuePropertyMaps(BaseModel):
+
+    swaggerTypes = {
+        'Id': 'str',
+        'Content': 'list<PropertyMapKeyValues>'
+    }
+    __slots__ = tuple(swaggerTypes)
 
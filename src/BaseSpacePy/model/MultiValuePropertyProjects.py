@@ -1,8 +1,10 @@
 
-class MultiValuePropertyProjects(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id': 'str',
-            'Content': 'Project'
-        }
+class MultiValuePropertyProjects(BaseModel):
+
+    swaggerTypes = {
+        'Id': 'str',
+        'Content': 'Project'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,14 +1,16 @@
 
-class MultiValuePropertyProjectsList(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Type': 'str',
-            'Items': 'list<MultiValuePropertyProjects>',
-            'DisplayedCount': 'int',
-            'TotalCount': 'int',
-            'Offset': 'int',
-            'Limit': 'int',
-            'SortDir': 'str',
-            'SortBy': 'str'
-        }
+class MultiValuePropertyProjectsList(BaseModel):
+
+    swaggerTypes = {
+        'Type': 'str',
+        'Items': 'list<MultiValuePropertyProjects>',
+        'DisplayedCount': 'int',
+        'TotalCount': 'int',
+        'Offset': 'int',
+        'Limit': 'int',
+        'SortDir': 'str',
+        'SortBy': 'str'
+    }
+    __slots__ = tuple(swaggerTypes)
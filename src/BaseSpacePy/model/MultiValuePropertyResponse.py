@@ -1,5 +1,7 @@
 
-class MultiValuePropertyResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
+
+class MultiValuePropertyResponse(BaseModel):
 
     # Values for DynamicType, keyed by 'Type' in property response
     _dynamicType = { 'appresult[]': 'MultiValuePropertyAppResultsList',
@@ -11,9 +13,9 @@ class MultiValuePropertyResponse(object):
                      'string[]': 'MultiValuePropertyStringsList',
                     }  
 
-    def __init__(self):    
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'DynamicType',
-            'Notifications': 'list<Str>'
-        }
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'DynamicType',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
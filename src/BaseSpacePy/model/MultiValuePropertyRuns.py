@@ -1,9 +1,11 @@
 
-class MultiValuePropertyRuns(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id': 'str',
-            'Content': 'Run'
-        }
+class MultiValuePropertyRuns(BaseModel):
+
+    swaggerTypes = {
+        'Id': 'str',
+        'Content': 'Run'
+    }
+    __slots__ = tuple(swaggerTypes)
 
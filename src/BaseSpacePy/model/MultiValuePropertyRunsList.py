@@ -1,15 +1,17 @@
 
-class MultiValuePropertyRunsList(object):
-
-    def __init__(self):
-        self.swaggerTypes = {
-            'Type': 'str',
-            'Items': 'list<MultiValuePropertyRuns>',
-            'DisplayedCount': 'int',
-            'TotalCount': 'int',
-            'Offset': 'int',
-            'Limit': 'int',
-            'SortDir': 'str',
-            'SortBy': 'str'
-        }
+from BaseSpacePy.model.BaseModel import BaseModel
+
+class MultiValuePropertyRunsList(BaseModel):
+
+    swaggerTypes = {
+        'Type': 'str',
+        'Items': 'list<MultiValuePropertyRuns>',
+        'DisplayedCount': 'int',
+        'TotalCount': 'int',
+        'Offset': 'int',
+        'Limit': 'int',
+        'SortDir': 'str',
+        'SortBy': 'str'
+    }
+    __slots__ = tuple(swaggerTypes)
 
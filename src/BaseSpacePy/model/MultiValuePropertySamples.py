@@ -1,11 +1,13 @@
 
-class MultiValuePropertySamples(object):
+from BaseSpacePy.model.BaseModel import BaseModel
+
+class MultiValuePropertySamples(BaseModel):
     """
     A generic multi-value Property for use when a property is queried directly by name
     """
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id': 'str',
-            'Content': 'Sample', 
-        }
+    swaggerTypes = {
+        'Id': 'str',
+        'Content': 'Sample', 
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,9 +1,11 @@
 
-class MultiValuePropertyStrings(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id': 'str',
-            'Content': 'str'
-        }
+class MultiValuePropertyStrings(BaseModel):
+
+    swaggerTypes = {
+        'Id': 'str',
+        'Content': 'str'
+    }
+    __slots__ = tuple(swaggerTypes)
 
@@ -3,74 +3,82 @@ import time
 import os
 import math
 import multiprocessing
+import threading
 import Queue
 import shutil
 import signal
 import hashlib
-from subprocess import call
 import logging
+import json
 from BaseSpacePy.api.BaseSpaceException import MultiProcessingTaskFailedException
+from BaseSpacePy.api.ConnectionPool import FileRegion
+from BaseSpacePy.api.RetryPolicy import RetryPolicy
 
 LOGGER = logging.getLogger(__name__)
 
+# default retry settings for multipart transfer tasks
+TRANSFER_RETRY_SETTINGS = {'maxAttempts': 20, 'baseDelay': 1, 'maxDelay': 15}
+
 class UploadTask(object):
     '''
     Uploads a piece of a large local file.    
     '''    
-    def __init__(self, api, bs_file_id, piece, total_pieces, local_path, total_size, temp_dir):
+    def __init__(self, api, bs_file_id, piece, total_pieces, local_path, total_size, chunk_size, journal=None):
         self.api        = api
         self.bs_file_id = bs_file_id  # the BaseSpace File Id
         self.piece      = piece       # piece number 
         self.total_pieces = total_pieces # out of total piece count
         self.local_path = local_path  # the path of the local file to be uploaded, including file name        
         self.total_size = total_size  # total file size of upload, for reporting
-        self.temp_dir   = temp_dir    # temp location to store file chunks for upload
+        self.chunk_size = chunk_size  # the size in bytes of each piece (except the last piece)
+        self.journal    = journal     # optional: the UploadJournal in which to record the piece once it's uploaded
         
         # tasks must implement these attributes and execute()
         self.success  = False
         self.err_msg = "no error"      
+        self.exception = None
     
     def execute(self, lock):
         '''
-        Upload a piece of the target file, first splitting the local file into a temp file.
+        Upload a piece of the target file, streaming the piece's byte range directly from the local file.
         Calculate md5 of file piece and pass to upload method.
+        Once uploaded, the piece is recorded in the journal, if any.
         Lock is not used (but needed since worker sends it for multipart download)
         '''            
         try:
-            fname = os.path.basename(self.local_path)
-            # this relies on the way the calling function has split the file
-            # but we still need to pass around the piece numbers because the BaseSpace API needs them
-            # to reassemble the file at the other end
-            # the zfill(4) is to make sure we have a zero padded suffix that split -a 4 -d will make
-            transFile = os.path.join(self.temp_dir, fname + str(self.piece).zfill(4))
-            #cmd = ['split', '-d', '-n', str(self.piece) + '/' + str(self.total_pieces), self.local_path]                        
-            #with open(transFile, "w") as fp:                                                    
-            #    rc = call(cmd, stdout=fp)
-            #    if rc != 0:
-            #        self.sucess = False
-            #        self.err_msg = "Splitting local file failed for piece %s" % str(self.piece)
-            #        return self            
-            with open(transFile, "r") as f:
-                out = f.read()
-                self.md5 = hashlib.md5(out).digest().encode('base64')            
+            # the BaseSpace API needs the piece numbers to reassemble the file at the other end
+            offset = self.piece * self.chunk_size
+            length = min(self.chunk_size, self.total_size - offset)
+            region = FileRegion(self.local_path, offset, length)
+            md5 = hashlib.md5()
+            data = region.read(1024*1024)
+            while data:
+                md5.update(data)
+                data = region.read(1024*1024)
+            region.seek(0)
+            self.md5 = md5.digest().encode('base64')
             try:
-                res = self.api.__uploadMultipartUnit__(self.bs_file_id,self.piece+1,self.md5,transFile)
+                res = self.api.__uploadMultipartUnit__(self.bs_file_id,self.piece+1,self.md5,region)
             except Exception as e:
                 self.success = False
                 self.err_msg = str(e)                
+                self.exception = e
             else:
                 # ETag contains hex encoded MD5 of part data on success
                 if res and res['Response'].has_key('ETag'):                
+                    if self.journal is not None:
+                        self.journal.record(self.piece, self.md5, res['Response']['ETag'])
                     self.success = True
                 else:
                     self.success = False
                     self.err_msg = "Error - empty response from uploading file piece or missing ETag in response"
-            if self.success:
-                os.remove(transFile)
+            finally:
+                region.close()
         # capture exception, since unpickleable exceptions may block
         except Exception as e:
             self.success = False
             self.err_msg = str(e)
+            self.exception = e
         return self
         
     def __str__(self):
@@ -82,7 +90,7 @@ class DownloadTask(object):
     Downloads a piece of a large remote file.
     When temp_dir is set (debug mode), downloads to filename with piece number appended (i.e. temp file).
     '''    
-    def __init__(self, api, bs_file_id, file_name, local_dir, piece, total_pieces, part_size, total_size, temp_dir=None):
+    def __init__(self, api, bs_file_id, file_name, local_dir, piece, total_pieces, part_size, total_size, temp_dir=None, journal=None):
         self.api = api                # BaseSpace api object
         self.bs_file_id = bs_file_id  # the Id of the File in BaseSpace
         self.file_name = file_name    # the name of the file to download
@@ -92,15 +100,18 @@ class DownloadTask(object):
         self.total_size  = total_size # the total size of the file in bytes
         self.local_dir = local_dir    # the path in which to store the downloaded file        
         self.temp_dir = temp_dir      # optional: set temp_dir for debug mode, which writes downloaded chunks to individual temp files         
+        self.journal = journal        # optional: the DownloadJournal in which to record the piece once it's downloaded
         
         # tasks must implement these attributes and execute()
         self.success  = False
         self.err_msg = "no error"         
+        self.exception = None
     
     def execute(self, lock):
         '''
         Download a piece of the target file, first calculating start/end bytes for piece.
-        Lock is to ensure that multiple processes don't write to same file concurrently.
+        Lock is not used, since each piece is written to its own byte range of the file.
+        Once downloaded, the piece is recorded in the journal, if any.
         '''
         try:
             if self.temp_dir:
@@ -115,41 +126,49 @@ class DownloadTask(object):
                 standaloneRangeFile = False
             startbyte = (self.piece - 1) * self.part_size
             endbyte = (self.piece * self.part_size) - 1
-            if endbyte > self.total_size:
+            if endbyte >= self.total_size:
                 endbyte = self.total_size - 1            
             try:                
                 #self.api.__downloadFile__(self.bs_file_id, self.local_dir, transFile, [startbyte, endbyte], standaloneRangeFile, lock)
-                self.api.__downloadFile__(self.bs_file_id, local_dir, local_name, [startbyte, endbyte], standaloneRangeFile, lock)                                
+                if self.journal is None:
+                    self.api.__downloadFile__(self.bs_file_id, local_dir, local_name, [startbyte, endbyte], standaloneRangeFile, lock)                                
+                else:
+                    # journal the piece once its data is on disk, with the md5 of the data as it was written
+                    md5 = self.api.__downloadFile__(self.bs_file_id, local_dir, local_name, [startbyte, endbyte], standaloneRangeFile, lock,
+                                                    computeMd5=True, sync=True)
+                    self.journal.record(self.piece, md5)
             except Exception as e:
                 self.success = False
                 self.err_msg = str(e)                
+                self.exception = e
             else:                
                 self.success = True
         # capture exception, since unpickleable exceptions may block
         except Exception as e:
             self.success = False
             self.err_msg = str(e)
+            self.exception = e
         return self
         
     def __str__(self):                
         return 'File piece %d of %d, piece size %s of total %s' % (self.piece, self.total_pieces, Utils.readable_bytes(self.part_size), Utils.readable_bytes(self.total_size))
     
-class Consumer(multiprocessing.Process):
+class Worker(object):
     '''
-    Multi-processing worker that executes tasks from task queue with retry
+    Executes tasks from task queue with retry, in a process (Consumer) or a thread (ThreadConsumer)
     On failure after retries, alerts all workers to halt
     '''
     
-    def __init__(self, task_queue, result_queue, halt_event, lock):    
-        multiprocessing.Process.__init__(self)
+    def __init__(self, task_queue, result_queue, halt_event, lock, retry_policy=None):    
         self.task_queue = task_queue
         self.result_queue = result_queue        
         self.halt = halt_event
         self.lock = lock         
         
         self.get_task_timeout = 5 # secs
-        self.retry_wait = 1 # sec
-        self.retries = 20
+        if retry_policy is None:
+            retry_policy = RetryPolicy(**TRANSFER_RETRY_SETTINGS)
+        self.retry_policy = retry_policy
         
     def run(self):
         '''
@@ -157,16 +176,14 @@ class Consumer(multiprocessing.Process):
         signal is found, or something went wrong such as a timeout when getting
         new tasks. 
         
-        For download tasks, use lock to ensure sole access (among worker
-        processes) to downloaded file.
-        
-        Retries failed tasks, and add task results to result_queue.
-        When a task fails for all retries, set halt signal to alert other workers
+        Retries failed tasks according to the retry policy (waiting for the backoff 
+        delay, unless the halt signal is set meanwhile), and add task results to result_queue.
+        When a task fails with a fatal error or for all retries, set halt signal to alert other workers
         and purge task queue or remaining tasks (to unblock join() in parent process)
         
         Turn off SIGINT (Ctrl C), handle in parent process
         '''
-        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        self.ignore_interrupts()
         while True:                                
             try:
                 next_task = self.task_queue.get(True, self.get_task_timeout) # block until timeout
@@ -180,23 +197,24 @@ class Consumer(multiprocessing.Process):
             else:                                                       
                 # attempt to run tasks, with retry
                 LOGGER.debug('Worker %s processing task: %s' % (self.name, str(next_task)))
-                for i in xrange(1, self.retries + 1):                        
+                retry_state = self.retry_policy.begin()
+                while True:
                     if self.halt.is_set():
                         LOGGER.debug('Worker %s exiting, found halt signal' % self.name)
                         self.task_queue.task_done()
                         self.purge_task_queue()
                         return                                                            
-                    answer = next_task.execute(self.lock) # acquired lock will block other workers                                       
+                    answer = next_task.execute(self.lock)                                       
                     if answer.success == True:
                         self.task_queue.task_done()                   
                         self.result_queue.put(True)
                         break
-                    else:
-                        LOGGER.debug("Worker %s retrying task %s after failure, retry attempt %d, with error msg: %s" % (self.name, str(next_task), i, answer.err_msg))
-                        time.sleep(self.retry_wait)                    
+                    LOGGER.debug("Worker %s task %s failed on attempt %d, with error msg: %s" % (self.name, str(next_task), retry_state.attempts, answer.err_msg))
+                    if not retry_state.retry(exc=answer.exception, sleep=self.halt.wait):
+                        break
                 if not answer.success == True:
-                    LOGGER.debug("Worker %s exiting, too many failures with retry for worker %s" % (self.name, str(self)))
-                    LOGGER.warning("Task failed after too many retries")        
+                    LOGGER.debug("Worker %s exiting, task failed with a fatal error or too many failures with retry for worker %s" % (self.name, str(self)))
+                    LOGGER.warning("Task failed after %d attempts: %s" % (retry_state.attempts, answer.err_msg))
                     self.task_queue.task_done()                   
                     self.result_queue.put(False)
                     self.purge_task_queue() # purge task queue in case there's only one worker                    
@@ -218,6 +236,181 @@ class Consumer(multiprocessing.Process):
                 break
             else:
                 self.task_queue.task_done()
+
+    def ignore_interrupts(self):
+        '''
+        Called when the worker starts; Ctrl C is handled by the parent process
+        '''
+        pass
+
+class TransferJournal(object):
+    '''
+    Sidecar journal of the pieces of a multipart transfer that are complete, so that an interrupted transfer
+    (crash, Ctrl-C or host restart) can be resumed by transferring only its missing pieces.
+    
+    The journal is a text file: a json header line that identifies the transfer, then a json line for each complete
+    piece, with its number. Each line is appended by the worker that transferred the piece, then the journal is synced.
+    The pieces of a journal whose header doesn't match the transfer are ignored.
+    '''
+    def __init__(self, path, header):
+        '''
+        :param path:   the path of the journal file
+        :param header: a dictionary that identifies the transfer
+        '''
+        self.path = path
+        self.header = header
+    
+    def read(self):
+        '''
+        Returns the header of the journal (None if there is no journal) and a dictionary of the entries of the complete pieces, by piece number
+        '''
+        pieces = {}
+        if not os.path.exists(self.path):
+            return None, pieces
+        with open(self.path) as fp:
+            lines = fp.read().split('\n')
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return None, pieces
+        for line in lines[1:]:
+            # the last line may be incomplete if the transfer was interrupted while it was written
+            try:
+                entry = json.loads(line)
+                pieces[entry.pop('Piece')] = entry
+            except (ValueError, KeyError, TypeError, AttributeError):
+                pass
+        return header, pieces
+    
+    def load(self):
+        '''
+        Returns a dictionary of the entries of the complete pieces, by piece number; empty if there is no journal, or it's for another transfer
+        '''
+        header, pieces = self.read()
+        if header != self.header:
+            if header is not None:
+                LOGGER.info("Ignoring transfer journal %s, which is for another file or another part size" % self.path)
+            return {}
+        return pieces
+    
+    def start(self, pieces):
+        '''
+        Replaces the journal with the header and the given complete pieces
+        
+        :param pieces: a dictionary of the entries of the complete pieces, by piece number
+        '''
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as fp:
+            fp.write(json.dumps(self.header) + '\n')
+            for piece in sorted(pieces):
+                fp.write(json.dumps(dict(pieces[piece], Piece=piece)) + '\n')
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.rename(temp_path, self.path)
+    
+    def append(self, piece, entry):
+        '''
+        Appends the entry of a complete piece to the journal
+        
+        :param piece: the piece number
+        :param entry: a dictionary of the piece's attributes
+        '''
+        # appends of a single short line aren't interleaved with those of other workers
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, json.dumps(dict(entry, Piece=piece)) + '\n')
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def remove(self):
+        '''
+        Deletes the journal, once the transfer is complete
+        '''
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class DownloadJournal(TransferJournal):
+    '''
+    Journal of a multipart download. The header has the Id, size and ETag of the BaseSpace File and the piece size;
+    the entry of each piece has the md5 of its data. Pieces must be synced to disk before they are recorded.
+    '''
+    def record(self, piece, md5):
+        '''
+        Appends a downloaded piece to the journal
+        
+        :param piece: the piece number
+        :param md5:   the hex md5 of the piece's data
+        '''
+        self.append(piece, {'MD5': md5})
+
+class UploadJournal(TransferJournal):
+    '''
+    Journal of a multipart upload. The header has the upload's key (the local file's path, size and modification time,
+    the part size and the destination) and the Id of the BaseSpace File being uploaded;
+    the entry of each piece has its md5 and the ETag returned by BaseSpace.
+    '''
+    def __init__(self, path, key):
+        '''
+        :param path: the path of the journal file
+        :param key:  a dictionary that identifies the upload, without the File Id
+        '''
+        TransferJournal.__init__(self, path, key)
+        self.key = key
+    
+    def get_file_id(self):
+        '''
+        Returns the Id of the BaseSpace File of an interrupted upload with the same key, or None
+        '''
+        header, pieces = self.read()
+        if header is None or dict((k, header.get(k)) for k in self.key) != self.key:
+            return None
+        return header.get('FileId')
+    
+    def resume(self, file_id):
+        '''
+        Starts the journal of an upload to a BaseSpace File, keeping the pieces already uploaded to it
+        
+        :param file_id: the Id of the BaseSpace File
+        :returns: a dictionary of the entries of the pieces already uploaded, by piece number
+        '''
+        self.header = dict(self.key, FileId=file_id)
+        pieces = self.load()
+        self.start(pieces)
+        return pieces
+    
+    def record(self, piece, md5, etag):
+        '''
+        Appends an uploaded piece to the journal
+        
+        :param piece: the piece number
+        :param md5:   the base64 md5 of the piece
+        :param etag:  the ETag returned by BaseSpace for the piece
+        '''
+        self.append(piece, {'MD5': md5, 'ETag': etag})
+
+class Consumer(Worker, multiprocessing.Process):
+    '''
+    Multi-processing worker that executes tasks from task queue with retry
+    '''
+    def __init__(self, task_queue, result_queue, halt_event, lock, retry_policy=None):
+        multiprocessing.Process.__init__(self)
+        Worker.__init__(self, task_queue, result_queue, halt_event, lock, retry_policy)
+
+    def ignore_interrupts(self):
+        '''
+        Turn off SIGINT (Ctrl C) in the worker process
+        '''
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+class ThreadConsumer(Worker, threading.Thread):
+    '''
+    Worker thread that executes tasks from task queue with retry; SIGINT is only delivered to the main thread
+    '''
+    def __init__(self, task_queue, result_queue, halt_event, lock, retry_policy=None):
+        threading.Thread.__init__(self)
+        Worker.__init__(self, task_queue, result_queue, halt_event, lock, retry_policy)
+        self.daemon = True
                 
 class Executor(object):
     '''
@@ -226,13 +419,14 @@ class Executor(object):
     Result queue contains True/False results for task success/failure.
     Halt event will tell workers to halt themselves.
     
-    For downloads, lock is to ensure that only one worker writes to a local downloaded file at a time. 
+    Lock is passed to each task, though neither uploads nor downloads need it: download parts write their own byte ranges concurrently.
     '''
-    def __init__(self):                                        
+    def __init__(self, retry_policy=None):                                        
         self.tasks = multiprocessing.JoinableQueue()
         self.result_queue = multiprocessing.Queue()                        
         self.halt_event = multiprocessing.Event()
         self.lock = multiprocessing.Lock()
+        self.retry_policy = retry_policy
     
     def add_task(self, task):
         '''
@@ -244,7 +438,7 @@ class Executor(object):
         '''
         Added workers to internal list of workers, adding a poison pill for each to the task queue
         '''
-        self.consumers = [ Consumer(self.tasks, self.result_queue, self.halt_event, self.lock) for i in xrange(num_workers) ]
+        self.consumers = [ Consumer(self.tasks, self.result_queue, self.halt_event, self.lock, self.retry_policy) for i in xrange(num_workers) ]
         for c in self.consumers:
             self.tasks.put(None)
 
@@ -257,12 +451,12 @@ class Executor(object):
             w.start()        
         LOGGER.debug("Workers started")                
         try:
-            self.tasks.join()
+            self.join_tasks()
         except (KeyboardInterrupt, SystemExit):
             LOGGER.debug("Halting all workers -- received exit signal")
             self.result_queue.put(False)
             self.halt_event.set()
-            self.tasks.join() # wait for workers to finish current work then exit from response to halt signal
+            self.join_tasks() # wait for workers to finish current work then exit from response to halt signal
         else:                        
             LOGGER.debug("Workers finished - task queue joined")                                   
         finalize = True
@@ -280,11 +474,54 @@ class Executor(object):
         else:            
             raise MultiProcessingTaskFailedException("Multiprocessing task did not complete successfully")                                                 
 
+    def join_tasks(self):
+        '''
+        Wait until all tasks are done
+        '''
+        self.tasks.join()
+
+class ThreadExecutor(Executor):
+    '''
+    Multi-threaded task manager, with the same interface and retry and halt behavior as Executor.
+    
+    Workers are threads of the current process, so tasks (and the BaseSpace API object they hold) aren't pickled,
+    workers share the api's keep-alive connection pool, and no processes are started for each transfer.
+    Suited to transfers, which spend their time waiting on the network.
+    '''
+    def __init__(self, retry_policy=None):
+        self.tasks = Queue.Queue()
+        self.result_queue = Queue.Queue()
+        self.halt_event = threading.Event()
+        self.lock = threading.Lock()
+        self.retry_policy = retry_policy
+
+    def add_workers(self, num_workers):
+        '''
+        Added worker threads to internal list of workers, adding a poison pill for each to the task queue
+        '''
+        self.consumers = [ ThreadConsumer(self.tasks, self.result_queue, self.halt_event, self.lock, self.retry_policy) for i in xrange(num_workers) ]
+        for c in self.consumers:
+            self.tasks.put(None)
+
+    def join_tasks(self):
+        '''
+        Wait until all workers have exited; joins with a timeout, so that Ctrl C still interrupts the main thread
+        '''
+        for w in self.consumers:
+            while w.is_alive():
+                w.join(0.5)
+
+# the task managers that may be used for multipart transfers
+TRANSFER_ENGINES = {'process': Executor, 'thread': ThreadExecutor}
+
 class MultipartUpload(object):
     '''
     Uploads a (large) file by uploading file parts in separate processes.    
+    
+    With a journal, the uploaded parts are recorded in it, and the parts already recorded for the same BaseSpace File
+    (by an interrupted upload) aren't uploaded again.
     '''
-    def __init__(self, api, local_path, bs_file, process_count, part_size, temp_dir):
+    def __init__(self, api, local_path, bs_file, process_count, part_size, temp_dir, retry_policy=None, engine='process', journal=None):
         '''
         Create a multipart upload object
         
@@ -293,14 +530,22 @@ class MultipartUpload(object):
         :param bs_file:       the File object of the newly created BaseSpace File to upload 
         :param process_count: the number of process to use for uploading
         :param part_size:     in MB, the size of each uploaded part        
-        :param temp_dir:      temp directory to store file pieces for upload 
+        :param temp_dir:      (deprecated) no longer used, file pieces are uploaded directly from the local file
+        :param retry_policy:  (optional) the RetryPolicy for failed part uploads, default is up to 20 attempts with backoff
+        :param engine:        (optional) 'process' to upload parts in worker processes, or 'thread' to upload them in worker threads, default 'process'
+        :param journal:       (optional) the UploadJournal of the upload, to resume an interrupted upload to bs_file, default None (upload all parts)
         '''
+        if engine not in TRANSFER_ENGINES:
+            raise ValueError("Unknown transfer engine '%s', expected one of: %s" % (engine, ', '.join(sorted(TRANSFER_ENGINES))))
         self.api            = api    
         self.local_path     = local_path    
         self.remote_file    = bs_file
         self.process_count  = process_count
         self.part_size      = part_size
         self.temp_dir       = temp_dir               
+        self.retry_policy   = retry_policy
+        self.engine         = engine
+        self.journal        = journal
                                            
         self.start_chunk    = 0
     
@@ -317,36 +562,32 @@ class MultipartUpload(object):
         '''
         Determine number of file pieces to upload, add upload tasks to work queue         
         '''                
-        logfile = os.path.join(self.temp_dir, "main.log")
         total_size = os.path.getsize(self.local_path)        
         fileCount = int(total_size/(self.part_size*1024*1024)) + 1
 
         chunk_size = (total_size / fileCount) + 1
         assert chunk_size * fileCount > total_size
 
-        fname = os.path.basename(self.local_path)
-        prefix = os.path.join(self.temp_dir, fname)
-        # -a 4  always use 4 digit sufixes, to make sure we can predict the filenames
-        # -d    use digits as suffixes, not letters
-        # -b    chunk size (in bytes)
-        cmd = ['split', '-a', '4', '-d', '-b', str(chunk_size), self.local_path, prefix]
-        rc = call(cmd)
-        if rc != 0:
-            err_msg = "Splitting local file failed: %s" % str.local_path
-            raise MultiProcessingTaskFailedException(err_msg)
+        uploaded = {}
+        if self.journal is not None:
+            uploaded = self.journal.resume(self.remote_file.Id)
 
-        self.exe = Executor()                    
+        self.exe = TRANSFER_ENGINES[self.engine](self.retry_policy)                    
         for i in xrange(self.start_chunk, fileCount):
-            t = UploadTask(self.api, self.remote_file.Id, i, fileCount, self.local_path, total_size, self.temp_dir)            
+            if i in uploaded:
+                continue
+            t = UploadTask(self.api, self.remote_file.Id, i, fileCount, self.local_path, total_size, chunk_size, self.journal)            
             self.exe.add_task(t)            
         self.exe.add_workers(self.process_count)
-        self.task_total = fileCount - self.start_chunk + 1                                                
+        self.task_total = fileCount - self.start_chunk + 1 - len(uploaded)
 
         LOGGER.info("Total File Size %s" % Utils.readable_bytes(total_size))
         LOGGER.info("Using File Part Size %d MB" % self.part_size)
-        LOGGER.info("Processes %d" % self.process_count)
+        LOGGER.info("%s workers %d" % (self.engine.capitalize(), self.process_count))
         LOGGER.info("File Chunk Count %d" % self.task_total)
         LOGGER.info("Start Chunk %d" % self.start_chunk)    
+        if uploaded:
+            LOGGER.info("Resuming upload, %d of %d chunks already uploaded" % (len(uploaded), fileCount))
 
     def _start_workers(self):
         '''
@@ -361,14 +602,19 @@ class MultipartUpload(object):
         '''
         LOGGER.debug("Marking uploaded file status as complete")                                                   
         self.api.__finalizeMultipartFileUpload__(self.remote_file.Id)
+        if self.journal is not None:
+            self.journal.remove()
 
 class MultipartDownload(object):
     '''
     Downloads a (large) file by downloading file parts in separate processes.
     When temp_dir is set (debug mode), downloads chunks to individual temp files, then cats them together.
     Returns File object when complete.
+    
+    When resume is True, the complete parts are recorded in a DownloadJournal next to the partial file,
+    and a download that was interrupted is resumed by downloading only the parts missing from its journal.
     '''
-    def __init__(self, api, file_id, local_dir, process_count, part_size, create_bs_dir, temp_dir=""):
+    def __init__(self, api, file_id, local_dir, process_count, part_size, create_bs_dir, temp_dir="", retry_policy=None, engine='process', resume=False, verify=False):
         '''
         Create a multipart download object
         
@@ -379,7 +625,13 @@ class MultipartDownload(object):
         :param part_size:     in MB, the size of each file part to download        
         :param create_bs_dir: when True, create BaseSpace File's directory in local_dir; when False, ignore Bs directory
         :param temp_dir:      (optional) temp directory for debug mode        
+        :param retry_policy:  (optional) the RetryPolicy for failed part downloads, default is up to 20 attempts with backoff
+        :param engine:        (optional) 'process' to download parts in worker processes, or 'thread' to download them in worker threads, default 'process'
+        :param resume:        (optional) journal the complete parts (syncing each to disk), and resume an interrupted download of the same file and part size; when False, download all parts, default False
+        :param verify:        (optional) when resuming, check the md5 of each journaled part in the partial file, and download again those that don't match, default False
         '''
+        if engine not in TRANSFER_ENGINES:
+            raise ValueError("Unknown transfer engine '%s', expected one of: %s" % (engine, ', '.join(sorted(TRANSFER_ENGINES))))
         self.api            = api            
         self.file_id        = file_id         
         self.local_dir      = local_dir               
@@ -387,9 +639,15 @@ class MultipartDownload(object):
         self.part_size      = part_size              
         self.temp_dir       = temp_dir
         self.create_bs_dir  = create_bs_dir        
+        self.retry_policy   = retry_policy
+        self.engine         = engine
+        self.resume         = resume
+        self.verify         = verify
 
         self.start_chunk      = 1        
         self.partial_file_ext = ".partial"
+        self.journal_ext      = ".journal"
+        self.journal          = None
     
     def download(self):
         '''
@@ -407,6 +665,8 @@ class MultipartDownload(object):
         While download is in progress, name the file with a 'partial' extension 
         '''
         self.bs_file = self.api.getFileById(self.file_id)
+        # get the storage url of the file once, to be shared by (and pickled with) the part downloads
+        self.api.__getContentUrl__(self.file_id)
         self.file_name = self.bs_file.Name
         total_bytes = self.bs_file.Size
         part_size_bytes = self.part_size * (1024**2)
@@ -426,20 +686,48 @@ class MultipartDownload(object):
                 self.full_temp_dir = os.path.join(self.temp_dir, os.path.dirname(self.bs_file.Path))
                 if not os.path.exists(self.full_temp_dir):
                     os.makedirs(self.full_temp_dir)
+        complete = {}
+        if not self.temp_dir:
+            partial_path = os.path.join(self.full_local_dir, file_name)
+            if self.resume:
+                header = {'Id': self.file_id, 'Size': total_bytes, 'PartSize': part_size_bytes,
+                          'ETag': self.api.fileS3metadata(self.file_id)['etag']}
+                self.journal = DownloadJournal(partial_path + self.journal_ext, header)
+                if os.path.exists(partial_path):
+                    complete = self.journal.load()
+                if self.verify:
+                    complete = dict((i, entry) for i, entry in complete.iteritems()
+                                    if entry.get('MD5') == Utils.md5_for_region(partial_path, *self._piece_range(i, part_size_bytes, total_bytes)))
+                self.journal.start(complete)
+            # create the file at its full size, so that parts can write their byte ranges in any order
+            with open(partial_path, 'ab') as fp:
+                fp.truncate(total_bytes)
         
-        self.exe = Executor()                    
+        self.exe = TRANSFER_ENGINES[self.engine](self.retry_policy)                    
         for i in xrange(self.start_chunk, self.file_count+1):         
+            if i in complete:
+                continue
             t = DownloadTask(self.api, self.file_id, file_name, self.full_local_dir, 
-                             i, self.file_count, part_size_bytes, total_bytes, self.full_temp_dir)
+                             i, self.file_count, part_size_bytes, total_bytes, self.full_temp_dir, self.journal)
             self.exe.add_task(t)            
         self.exe.add_workers(self.process_count)        
-        self.task_total = self.file_count - self.start_chunk + 1                                                
+        self.task_total = self.file_count - self.start_chunk + 1 - len(complete)
                                  
         LOGGER.info("Total File Size %s" % Utils.readable_bytes(total_bytes))
         LOGGER.info("Using File Part Size %s MB" % str(self.part_size))
-        LOGGER.info("Processes %d" % self.process_count)
+        LOGGER.info("%s workers %d" % (self.engine.capitalize(), self.process_count))
         LOGGER.info("File Chunk Count %d" % self.file_count)
         LOGGER.info("Start Chunk %d" % self.start_chunk)
+        if complete:
+            LOGGER.info("Resuming download, %d of %d chunks already complete" % (len(complete), self.file_count))
+    
+    def _piece_range(self, piece, part_size_bytes, total_bytes):
+        '''
+        Returns the offset and length of a piece of the file, as downloaded by DownloadTask
+        '''
+        startbyte = (piece - 1) * part_size_bytes
+        endbyte = min(piece * part_size_bytes, total_bytes) - 1
+        return startbyte, endbyte - startbyte + 1
                             
     def _start_workers(self):
         '''
@@ -458,6 +746,8 @@ class MultipartDownload(object):
         final_file = os.path.join(self.full_local_dir, self.file_name)
         partial_file = final_file + self.partial_file_ext
         os.rename(partial_file, final_file) 
+        if self.journal is not None:
+            self.journal.remove()
     
     def _combine_file_chunks(self):
         '''
@@ -488,6 +778,17 @@ class Utils(object):
             md5.update(data)
         return md5.hexdigest()
     
+    @staticmethod
+    def md5_for_region(path, offset, length):
+        '''
+        Returns the md5 for a byte range of a local file
+        '''
+        region = FileRegion(path, offset, length)
+        try:
+            return Utils.md5_for_file(region)
+        finally:
+            region.close()
+    
     @staticmethod
     def readable_bytes(size, precision=2):
         """
@@ -1,15 +1,17 @@
 
-class Product(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Id': 'str',
-            'Name': 'str',
-            'Price': 'str',
-            'Quantity': 'str',
-            'PersistenceStatus': 'str', # NOPERSISTENCE, ACTIVE, EXPIRED
-            'Tags': 'list<str>',
-        }
+class Product(BaseModel):
+
+    swaggerTypes = {
+        'Id': 'str',
+        'Name': 'str',
+        'Price': 'str',
+        'Quantity': 'str',
+        'PersistenceStatus': 'str', # NOPERSISTENCE, ACTIVE, EXPIRED
+        'Tags': 'list<str>',
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return str(self.Name)
@@ -1,24 +1,25 @@
 
 from BaseSpacePy.api.BaseSpaceException import ModelNotInitializedException
 from BaseSpacePy.model.QueryParameters import QueryParameters as qp
+from BaseSpacePy.model.BaseModel import BaseModel
 
-class Project(object):
+class Project(BaseModel):
     '''
     Represents a BaseSpace Project object.
     '''
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Name': 'str',
-            'HrefSamples': 'str',
-            'HrefAppResults': 'str',
-            'HrefBaseSpaceUI': 'str',
-            'DateCreated': 'datetime',
-            'Id': 'str',
-            'Href': 'str',
-            'UserOwnedBy': 'UserCompact',
-            'Properties': 'PropertyList',
-        }
+    swaggerTypes = {
+        'Name': 'str',
+        'HrefSamples': 'str',
+        'HrefAppResults': 'str',
+        'HrefBaseSpaceUI': 'str',
+        'DateCreated': 'datetime',
+        'Id': 'str',
+        'Href': 'str',
+        'UserOwnedBy': 'UserCompact',
+        'Properties': 'PropertyList',
+    }
+    __slots__ = tuple(swaggerTypes)
     
     def __str__(self):
         return self.Name
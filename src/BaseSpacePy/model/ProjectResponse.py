@@ -1,10 +1,12 @@
 
-class ProjectResponse(object):
-
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'Project',
-            'Notifications': 'list<Str>'
-        }
+from BaseSpacePy.model.BaseModel import BaseModel
+
+class ProjectResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'Project',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
 
@@ -1,9 +1,11 @@
 
-class PropertiesResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):    
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'PropertyList',
-            'Notifications': 'list<Str>'
-        }
+class PropertiesResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'PropertyList',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,14 +1,16 @@
 
-class PropertyAppResult(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Type': 'str',
-            'Href': 'str',
-            'Name': 'str',
-            'Description': 'str',
-            'Content': 'AppResult'
-        }
+class PropertyAppResult(BaseModel):
+
+    swaggerTypes = {
+        'Type': 'str',
+        'Href': 'str',
+        'Name': 'str',
+        'Description': 'str',
+        'Content': 'AppResult'
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return str(self.Name)
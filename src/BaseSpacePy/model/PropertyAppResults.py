@@ -1,17 +1,19 @@
 
-class PropertyAppResults(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Type': 'str',
-            'Href': 'str',
-            'Name': 'str',
-            'Description': 'str',
-            'Items': 'list<AppResult>',
-            'HrefItems': 'str',
-            'ItemsDisplayedCount': 'int',
-            'ItemsTotalCount': 'int'
-        }
+class PropertyAppResults(BaseModel):
+
+    swaggerTypes = {
+        'Type': 'str',
+        'Href': 'str',
+        'Name': 'str',
+        'Description': 'str',
+        'Items': 'list<AppResult>',
+        'HrefItems': 'str',
+        'ItemsDisplayedCount': 'int',
+        'ItemsTotalCount': 'int'
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return str(self.Name)
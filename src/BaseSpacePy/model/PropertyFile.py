@@ -1,14 +1,16 @@
 
-class PropertyFile(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Type': 'str',
-            'Href': 'str',
-            'Name': 'str',
-            'Description': 'str',
-            'Content': 'File'
-        }
+class PropertyFile(BaseModel):
+
+    swaggerTypes = {
+        'Type': 'str',
+        'Href': 'str',
+        'Name': 'str',
+        'Description': 'str',
+        'Content': 'File'
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return str(self.Name)
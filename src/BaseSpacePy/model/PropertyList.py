@@ -1,5 +1,7 @@
 
-class PropertyList(object):
+from BaseSpacePy.model.BaseModel import BaseModel
+
+class PropertyList(BaseModel):
     
     # Values for DynamicType, keyed by 'Type' in each property Item
     _dynamicType = {'string': 'PropertyString',
@@ -18,14 +20,14 @@ class PropertyList(object):
                     'map[]': 'PropertyMaps',
                    }    
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Items': 'list<DynamicType>',
-            'Href': 'str', #
-            'DisplayedCount': 'int',
-            'TotalCount': 'int',            
-            'Offset': 'int',
-            'Limit': 'int',
-            'SortDir': 'str',
-            'SortBy': 'str'
-        }
+    swaggerTypes = {
+        'Items': 'list<DynamicType>',
+        'Href': 'str', #
+        'DisplayedCount': 'int',
+        'TotalCount': 'int',            
+        'Offset': 'int',
+        'Limit': 'int',
+        'SortDir': 'str',
+        'SortBy': 'str'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,14 +1,16 @@
 
-class PropertyMap(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Type': 'str',
-            'Href': 'str',
-            'Name': 'str',
-            'Description': 'str',
-            'Items': 'list<PropertyMapKeyValues>',           
-        }
+class PropertyMap(BaseModel):
+
+    swaggerTypes = {
+        'Type': 'str',
+        'Href': 'str',
+        'Name': 'str',
+        'Description': 'str',
+        'Items': 'list<PropertyMapKeyValues>',           
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return str(self.Name)
@@ -1,9 +1,11 @@
 
-class PropertyMapKeyValues(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Key': 'str',
-            'Values': 'list<Str>'                        
-        }    
+class PropertyMapKeyValues(BaseModel):
+
+    swaggerTypes = {
+        'Key': 'str',
+        'Values': 'list<Str>'                        
+    }
+    __slots__ = tuple(swaggerTypes)
     
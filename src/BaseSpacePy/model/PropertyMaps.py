@@ -1,17 +1,19 @@
 
-class PropertyMaps(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Type': 'str',
-            'Href': 'str',
-            'Name': 'str',
-            'Description': 'str',
-            'Items': 'listoflists<PropertyMapKeyValues>',
-            'HrefItems': 'str',
-            'ItemsDisplayedCount': 'int',
-            'ItemsTotalCount': 'int',
-        }
+class PropertyMaps(BaseModel):
+
+    swaggerTypes = {
+        'Type': 'str',
+        'Href': 'str',
+        'Name': 'str',
+        'Description': 'str',
+        'Items': 'listoflists<PropertyMapKeyValues>',
+        'HrefItems': 'str',
+        'ItemsDisplayedCount': 'int',
+        'ItemsTotalCount': 'int',
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return str(self.Name)
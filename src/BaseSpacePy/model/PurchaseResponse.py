@@ -1,9 +1,11 @@
 
-class PurchaseResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'Purchase',
-            'Notifications': 'list<Str>'
-        }
+class PurchaseResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'Purchase',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,18 +1,20 @@
 
-class PurchasedProduct(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'PurchaseId': 'str',
-            'DatePurchased': 'datetime',
-            'Id': 'str',
-            'Name': 'str',
-            'Price': 'str',
-            'Quantity': 'str',
-            'PersistenceStatus': 'str',
-            'Tags': 'list<str>',         # only if provided as a query parameter
-            'ProductIds': 'list<str>',   # only if provided as a query parameter
-        }
+class PurchasedProduct(BaseModel):
+
+    swaggerTypes = {
+        'PurchaseId': 'str',
+        'DatePurchased': 'datetime',
+        'Id': 'str',
+        'Name': 'str',
+        'Price': 'str',
+        'Quantity': 'str',
+        'PersistenceStatus': 'str',
+        'Tags': 'list<str>',         # only if provided as a query parameter
+        'ProductIds': 'list<str>',   # only if provided as a query parameter
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return str(self.Name)
@@ -1,9 +1,11 @@
 
-class RefundPurchaseResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'Purchase',
-            'Notifications': 'list<Str>'
-        }
+class RefundPurchaseResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'Purchase',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,13 +1,15 @@
 
-class ResourceList(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Items': 'list<Str>',
-            'DisplayedCount': 'int',
-            'SortDir': 'str',
-            'TotalCount': 'int',
-            'Offset': 'int',
-            'SortBy': 'str',
-            'Limit': 'int'
-        }
+class ResourceList(BaseModel):
+
+    swaggerTypes = {
+        'Items': 'list<dict>',
+        'DisplayedCount': 'int',
+        'SortDir': 'str',
+        'TotalCount': 'int',
+        'Offset': 'int',
+        'SortBy': 'str',
+        'Limit': 'int'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,10 +1,12 @@
 
-class ResponseStatus(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Message': 'str',
-            'Errors': 'list<Str>',
-            'ErrorCode': 'str',
-            'StackTrace': 'str'
-        }
+class ResponseStatus(BaseModel):
+
+    swaggerTypes = {
+        'Message': 'str',
+        'Errors': 'list<Str>',
+        'ErrorCode': 'str',
+        'StackTrace': 'str'
+    }
+    __slots__ = tuple(swaggerTypes)
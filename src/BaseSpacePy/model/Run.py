@@ -1,42 +1,43 @@
 
 from BaseSpacePy.api.BaseSpaceException import ModelNotInitializedException
 from BaseSpacePy.model.QueryParameters import QueryParameters as qp
+from BaseSpacePy.model.BaseModel import BaseModel
 
-class Run(object):
+class Run(BaseModel):
     '''
     A BaseSpace Run object
     '''
-    def __init__(self):
-        self.swaggerTypes = {
-            'Name': 'str',
-            'Number': 'int',
-            'HrefFiles': 'str',
-            'HrefSamples': 'str',
-            'UserUploadedBy': 'UserCompact',
-            'UserOwnedBy': 'UserCompact',
-            'DateUploadCompleted': 'datetime',
-            'DateUploadStarted': 'datetime',
-            'HrefBaseSpaceUI': 'str',
-            'Id': 'str',
-            'Href': 'str',
-            'ExperimentName': 'str',
-            'Status': 'str',
-            'DateCreated': 'datetime',
-            'DateModified': 'datetime',
-            'Properties': 'PropertyList',
-            'ReagentBarcode': 'str',
-            'FlowcellBarcode': 'str',
-            'TotalSize': 'int',
-            'PlatformName': 'str',
-            'Workflow': 'str',
-            'InstrumentName': 'str',
-            'InstrumentType': 'str',
-            'NumCyclesRead1': 'int',
-            'NumCyclesRead2': 'int',
-            'NumCyclesIndex1': 'int',
-            'NumCyclesIndex2': 'int',
-            'LibraryCount': 'int',                                
-        }
+    swaggerTypes = {
+        'Name': 'str',
+        'Number': 'int',
+        'HrefFiles': 'str',
+        'HrefSamples': 'str',
+        'UserUploadedBy': 'UserCompact',
+        'UserOwnedBy': 'UserCompact',
+        'DateUploadCompleted': 'datetime',
+        'DateUploadStarted': 'datetime',
+        'HrefBaseSpaceUI': 'str',
+        'Id': 'str',
+        'Href': 'str',
+        'ExperimentName': 'str',
+        'Status': 'str',
+        'DateCreated': 'datetime',
+        'DateModified': 'datetime',
+        'Properties': 'PropertyList',
+        'ReagentBarcode': 'str',
+        'FlowcellBarcode': 'str',
+        'TotalSize': 'int',
+        'PlatformName': 'str',
+        'Workflow': 'str',
+        'InstrumentName': 'str',
+        'InstrumentType': 'str',
+        'NumCyclesRead1': 'int',
+        'NumCyclesRead2': 'int',
+        'NumCyclesIndex1': 'int',
+        'NumCyclesIndex2': 'int',
+        'LibraryCount': 'int',                                
+    }
+    __slots__ = tuple(swaggerTypes)
     def __str__(self):
         return self.Name
     
@@ -1,9 +1,11 @@
 
-class RunResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'Run',
-            'Notifications': 'list<Str>'
-        }
+class RunResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'Run',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,36 +1,37 @@
 
 from BaseSpacePy.model.QueryParameters import QueryParameters as qp
 from BaseSpacePy.api.BaseSpaceException import ModelNotInitializedException
+from BaseSpacePy.model.BaseModel import BaseModel
 
-class Sample(object):
+class Sample(BaseModel):
     '''
     A BaseSpace Sample object.
     '''
-    def __init__(self):
-        self.swaggerTypes = {
-            'HrefGenome': 'str',
-            'SampleNumber': 'int',
-            'ExperimentName': 'str',
-            'HrefFiles': 'str',
-            'IsPairedEnd':'int',
-            'Read1':'int',
-            'Read2':'int',
-            'NumReadsRaw':'int',
-            'NumReadsPF':'int',
-            'Id': 'str',
-            'Href': 'str',
-            'UserOwnedBy': 'UserCompact',
-            'Name': 'str',
-            'SampleId': 'str',
-            'Status': 'str',
-            'StatusSummary': 'str',
-            'DateCreated': 'datetime',
-            'References':'dict',
-            'TotalSize': 'int',
-            'AppSession': 'AppSessionSemiCompact',
-            'Properties': 'PropertyList',
-            'Projects': 'list<Project>',
-        }
+    swaggerTypes = {
+        'HrefGenome': 'str',
+        'SampleNumber': 'int',
+        'ExperimentName': 'str',
+        'HrefFiles': 'str',
+        'IsPairedEnd':'int',
+        'Read1':'int',
+        'Read2':'int',
+        'NumReadsRaw':'int',
+        'NumReadsPF':'int',
+        'Id': 'str',
+        'Href': 'str',
+        'UserOwnedBy': 'UserCompact',
+        'Name': 'str',
+        'SampleId': 'str',
+        'Status': 'str',
+        'StatusSummary': 'str',
+        'DateCreated': 'datetime',
+        'References':'dict',
+        'TotalSize': 'int',
+        'AppSession': 'AppSessionSemiCompact',
+        'Properties': 'PropertyList',
+        'Projects': 'list<Project>',
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return self.Name
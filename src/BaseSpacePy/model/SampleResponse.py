@@ -1,9 +1,11 @@
 
-class SampleResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'Sample',
-            'Notifications': 'list<Str>'
-        }
+class SampleResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'Sample',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,19 +1,20 @@
 
 from BaseSpacePy.api.BaseSpaceException import ModelNotInitializedException
+from BaseSpacePy.model.BaseModel import BaseModel
 
-class User(object):    
-    def __init__(self):
-        self.swaggerTypes = {
-            'Name': 'str',
-            'Email': 'str',
-            'DateLastActive': 'datetime',
-            'GravatarUrl': 'str',
-            'HrefProjects': 'str',
-            'DateCreated': 'datetime',
-            'Id': 'str',
-            'Href': 'str',
-            'HrefRuns': 'str'
-        }
+class User(BaseModel):    
+    swaggerTypes = {
+        'Name': 'str',
+        'Email': 'str',
+        'DateLastActive': 'datetime',
+        'GravatarUrl': 'str',
+        'HrefProjects': 'str',
+        'DateCreated': 'datetime',
+        'Id': 'str',
+        'Href': 'str',
+        'HrefRuns': 'str'
+    }
+    __slots__ = tuple(swaggerTypes)
     
     def __str__(self):
         return self.Name
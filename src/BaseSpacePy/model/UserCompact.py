@@ -1,13 +1,15 @@
 
-class UserCompact(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Name': 'str',
-            'Id': 'str',
-            'Href': 'str',
-            'GravatarUrl': 'str',
-        }
+class UserCompact(BaseModel):
+
+    swaggerTypes = {
+        'Name': 'str',
+        'Id': 'str',
+        'Href': 'str',
+        'GravatarUrl': 'str',
+    }
+    __slots__ = tuple(swaggerTypes)
 
     def __str__(self):
         return self.Name
@@ -1,9 +1,11 @@
 
-class UserResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'User',
-            'Notifications': 'list<Str>'
-        }
+class UserResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'User',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
@@ -1,18 +1,20 @@
 
-class Variant(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'CHROM': 'str',                 
-            'ALT': 'str',
-            'ID': 'list<Str>',
-            'SampleFormat': 'dict',
-            'FILTER': 'str',
-            'INFO': 'dict',
-            'POS':'int',
-            'QUAL':'int',
-            'REF':'str'
-        }
+class Variant(BaseModel):
+
+    swaggerTypes = {
+        'CHROM': 'str',                 
+        'ALT': 'str',
+        'ID': 'list<Str>',
+        'SampleFormat': 'dict',
+        'FILTER': 'str',
+        'INFO': 'dict',
+        'POS':'int',
+        'QUAL':'int',
+        'REF':'str'
+    }
+    __slots__ = tuple(swaggerTypes)
         
     def __str__(self):
         return "Variant - " + self.CHROM + ": " + str(self.POS) + " id=" + str(self.ID)
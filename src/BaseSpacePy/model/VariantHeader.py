@@ -1,12 +1,14 @@
 
-class VariantHeader(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'Metadata': 'dict',
-            'Samples': 'dict',
-            'Legends': 'dict',
-        }
+class VariantHeader(BaseModel):
+
+    swaggerTypes = {
+        'Metadata': 'dict',
+        'Samples': 'dict',
+        'Legends': 'dict',
+    }
+    __slots__ = tuple(swaggerTypes)
         
     def __str__(self):
         return "VariantHeader: SampleCount=" + str(len(self.Samples))
@@ -1,9 +1,11 @@
 
-class VariantsHeaderResponse(object):
+from BaseSpacePy.model.BaseModel import BaseModel
 
-    def __init__(self):
-        self.swaggerTypes = {
-            'ResponseStatus': 'ResponseStatus',
-            'Response': 'VariantHeader',
-            'Notifications': 'list<Str>'
-        }
+class VariantsHeaderResponse(BaseModel):
+
+    swaggerTypes = {
+        'ResponseStatus': 'ResponseStatus',
+        'Response': 'VariantHeader',
+        'Notifications': 'list<Str>'
+    }
+    __slots__ = tuple(swaggerTypes)
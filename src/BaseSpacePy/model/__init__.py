@@ -1,5 +1,6 @@
 
 __all__= [
+ 'BaseModel',
  'ListResponse',
  'ResponseStatus',
  'File',
@@ -0,0 +1,303 @@
+"""
+Micro-benchmarks for the deserialization of large BaseSpace listings. These run offline, on synthetic
+responses shaped like the responses of the BaseSpace REST API.
+
+Usage: python benchmarks.py [number of items, default 10000]
+"""
+import re
+import sys
+import json
+import time
+import resource
+import subprocess
+import dateutil.parser
+from BaseSpacePy.api.APIClient import APIClient, _parseDatetime
+from BaseSpacePy.api.BaseAPI import BaseAPI
+from BaseSpacePy.model import *
+
+
+def legacyDeserialize(obj, objClass):
+    '''
+    The original APIClient.deserialize, which resolves type names with eval() and list types with a regex
+    for every attribute of every object; kept as the baseline for the benchmarks
+    '''
+    if type(objClass) == str:
+        try:
+            if (not str(objClass)=='File'):
+                objClass = eval(objClass.lower())
+            else:
+                objClass = eval(objClass + '.' + objClass)
+        except NameError: # not a native type, must be model class
+            objClass = eval(objClass + '.' + objClass)
+    if objClass in [str, int, float, bool]:
+        return objClass(obj)
+    instance = objClass()
+    for attr, attrType in instance.swaggerTypes.iteritems():
+        if attr in obj:
+            value = obj[attr]
+            if attrType in ['str', 'int', 'float', 'bool']:
+                attrType = eval(attrType)
+                try:
+                    value = attrType(value)
+                except UnicodeEncodeError:
+                    value = unicode(value)
+                setattr(instance, attr, value)
+            elif attrType == 'DynamicType':
+                try:
+                    model_name = instance._dynamicType[value['Type']]
+                except KeyError:
+                    pass
+                else:
+                    setattr(instance, attr, legacyDeserialize(value, model_name))
+            elif 'list<' in attrType:
+                match = re.match('list<(.*)>', attrType)
+                subClass = match.group(1)
+                subValues = []
+                if subClass == 'DynamicType':
+                    for subValue in value:
+                        try:
+                            new_type = instance._dynamicType[subValue['Type']]
+                        except KeyError:
+                            pass
+                        else:
+                            subValues.append(legacyDeserialize(subValue, new_type))
+                    setattr(instance, attr, subValues)
+                else:
+                    for subValue in value:
+                        subValues.append(legacyDeserialize(subValue, subClass))
+                    setattr(instance, attr, subValues)
+            elif 'listoflists<' in attrType:
+                match = re.match('listoflists<(.*)>', attrType)
+                subClass = match.group(1)
+                outvals = []
+                for outval in value:
+                    invals = []
+                    for inval in outval:
+                        invals.append(legacyDeserialize(inval, subClass))
+                    outvals.append(invals)
+                setattr(instance, attr, outvals)
+            elif attrType=='dict':
+                setattr(instance, attr, value)
+            elif attrType=='datetime':
+                dt = dateutil.parser.parse(value)
+                setattr(instance, attr, dt)
+            else:
+                setattr(instance, attr, legacyDeserialize(value, attrType))
+    return instance
+
+
+def legacyListRequest(api, response, modelClass):
+    '''
+    The original list-response path of BaseAPI.__listRequest__: each item was converted to a string
+    (ResourceList Items were 'list<Str>'), then eval()'d, json-dumped and json-loaded by
+    ListResponse._convertToObjectList, before being deserialized into a model
+    '''
+    items = [str(item) for item in response['Response']['Items']]
+    converted = [json.loads(json.dumps(eval(m))) for m in items]
+    return [api.deserialize(c, modelClass) for c in converted]
+
+
+class LegacyFile(object):
+    '''
+    A File with the original model layout: a swaggerTypes dictionary built by each instance,
+    and attributes stored in a per-instance __dict__
+    '''
+    def __init__(self):
+        self.swaggerTypes = dict(File.File.swaggerTypes)
+
+
+def makeFile(i, properties=True):
+    '''
+    Returns a decoded json File, as returned by getRunFilesById()
+    '''
+    item = {
+        'Id': str(1000000 + i),
+        'Href': 'v1pre3/files/%d' % (1000000 + i),
+        'HrefContent': 'v1pre3/files/%d/content' % (1000000 + i),
+        'Name': 's_1_%04d_R1.fastq.gz' % i,
+        'Path': 'Data/Intensities/BaseCalls/L001/s_1_%04d_R1.fastq.gz' % i,
+        'ContentType': 'application/octet-stream',
+        'UploadStatus': 'complete',
+        'Size': 123456789 + i,
+        'DateCreated': '2014-08-07T18:54:52.0000000',
+        }
+    if properties:
+        item['Properties'] = {'Items': [{'Type': 'string', 'Name': 'Input.Lane', 'Content': '1'}],
+                              'DisplayedCount': 1, 'TotalCount': 1, 'Href': 'v1pre3/files/%d/properties' % i}
+    return item
+
+
+def makeSample(i):
+    '''
+    Returns a decoded json Sample, as returned by getSamplesByProject()
+    '''
+    return {
+        'Id': str(2000000 + i),
+        'Href': 'v1pre3/samples/%d' % (2000000 + i),
+        'HrefGenome': 'v1pre3/genomes/4',
+        'UserOwnedBy': {'Id': '1463464', 'Href': 'v1pre3/users/1463464', 'Name': 'Some User'},
+        'Name': 'Sample-%d' % i,
+        'SampleId': 'S%d' % i,
+        'SampleNumber': i,
+        'ExperimentName': 'Experiment',
+        'IsPairedEnd': True,
+        'Read1': 151,
+        'Read2': 151,
+        'NumReadsRaw': 1000000 + i,
+        'NumReadsPF': 900000 + i,
+        'Status': 'Complete',
+        'StatusSummary': '',
+        'DateCreated': '2014-08-07T18:54:52.0000000',
+        'Reference': {'Rel': 'Using', 'Type': 'Run', 'Href': 'v1pre3/runs/1'},
+        }
+
+
+def timeIt(function, repeat=3):
+    '''
+    Returns the best wall-clock time in seconds of several calls to function
+    '''
+    best = None
+    for i in xrange(repeat):
+        start = time.time()
+        function()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def benchmarkDeserialize(count):
+    '''
+    Compares the legacy and the precompiled deserializers on lists of Files and Samples
+    '''
+    api = APIClient('', '')
+    for label, makeItem, modelClass in [('File', makeFile, File.File), ('Sample', makeSample, Sample.Sample)]:
+        items = [makeItem(i) for i in xrange(count)]
+        legacy = timeIt(lambda: [legacyDeserialize(item, modelClass) for item in items])
+        planned = timeIt(lambda: [api.deserialize(item, modelClass) for item in items])
+        print "deserialize %6d %-6s  legacy %7.3fs  plan %7.3fs  speedup %.1fx" % (count, label, legacy, planned, legacy / planned)
+
+
+def benchmarkDatetime(count):
+    '''
+    Compares dateutil and the BaseSpace timestamp parser of the deserializer
+    '''
+    values = ['2014-08-07T18:%02d:%02d.%07d' % (i / 60 % 60, i % 60, i) for i in xrange(count)]
+    general = timeIt(lambda: [dateutil.parser.parse(value) for value in values])
+    fast = timeIt(lambda: [_parseDatetime(value) for value in values])
+    print "datetime %6d         dateutil %6.3fs  fast %7.3fs  speedup %.1fx" % (count, general, fast, general / fast)
+
+
+def benchmarkLazyScan(count):
+    '''
+    Compares eager and lazy deserialization on lists of Files and Samples, for a scan that reads only Id and Name
+    '''
+    eager = APIClient('', '')
+    lazy = APIClient('', '', lazyDeserialization=True)
+    for label, makeItem, modelClass in [('File', makeFile, File.File), ('Sample', makeSample, Sample.Sample)]:
+        items = [makeItem(i) for i in xrange(count)]
+        scan = lambda api: [(obj.Id, obj.Name) for obj in [api.deserialize(item, modelClass) for item in items]]
+        eagerTime = timeIt(lambda: scan(eager))
+        lazyTime = timeIt(lambda: scan(lazy))
+        print "scan     %6d %-6s  eager  %7.3fs  lazy %7.3fs  speedup %.1fx" % (count, label, eagerTime, lazyTime, eagerTime / lazyTime)
+
+
+def benchmarkPrefetch(count, pageSize=100, latency=0.02):
+    '''
+    Compares sequential and prefetching iteration over a File listing, with a simulated round-trip latency per page
+    '''
+    files = [makeFile(i, properties=False) for i in xrange(count)]
+    def callAPI(resourcePath, method, queryParams, postData, headerParams, forcePost=False):
+        time.sleep(latency)
+        offset, limit = queryParams['Offset'], queryParams['Limit']
+        items = files[offset:offset + limit]
+        return {'Response': {'Items': items, 'DisplayedCount': len(items), 'TotalCount': count}, 'ResponseStatus': {}}
+    api = BaseAPI('', '', None)
+    api.apiClient.callAPI = callAPI
+    iterate = lambda prefetch: sum(1 for f in api.__iterListRequest__(File.File, '/runs/1/files', 'GET', {}, {}, pageSize=pageSize, prefetch=prefetch))
+    sequential = timeIt(lambda: iterate(0), repeat=1)
+    prefetched = timeIt(lambda: iterate(8), repeat=1)
+    print "prefetch %6d File    sequential %6.3fs  prefetch=8 %6.3fs  speedup %.1fx  (%d ms per page of %d)" % (
+        count, sequential, prefetched, sequential / prefetched, latency * 1000, pageSize)
+
+
+def listRequest(path, count):
+    '''
+    Runs one list-response path ('legacy', 'direct' or 'fields') on a File listing, and returns
+    (elapsed seconds, peak memory increase in MB over the decoded json response)
+    '''
+    body = json.dumps({'Response': {'Items': [makeFile(i) for i in xrange(count)], 'DisplayedCount': count,
+                                    'TotalCount': count, 'Offset': 0, 'Limit': count}, 'ResponseStatus': {}})
+    api = BaseAPI('', '', None)
+    api.apiClient.callAPI = lambda *args, **kwargs: json.loads(body)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+    if path == 'legacy':
+        files = legacyListRequest(api.apiClient, api.apiClient.callAPI(), File.File)
+    elif path == 'fields':
+        files = api.__listRequest__(File.File, '/runs/1/files', 'GET', {}, {}, fields=['Id', 'Path', 'Size'])
+    else:
+        files = api.__listRequest__(File.File, '/runs/1/files', 'GET', {}, {})
+    elapsed = time.time() - start
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, (after - before) / 1024.0
+
+
+def modelMemory(layout, count):
+    '''
+    Deserializes a listing of Files (without properties) with the slotted ('slots') or the
+    original ('legacy') model layout, and returns the peak memory increase in MB while holding the listing
+    '''
+    api = APIClient('', '')
+    modelClass = LegacyFile if layout == 'legacy' else File.File
+    items = [makeFile(i, properties=False) for i in xrange(count)]
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    files = [api.deserialize(item, modelClass) for item in items]
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return (after - before) / 1024.0,
+
+
+def benchmarkModelMemory(count):
+    '''
+    Compares the memory held by a File listing with the original and the slotted model layouts
+    '''
+    results = {}
+    for layout in ['legacy', 'slots']:
+        output = subprocess.check_output([sys.executable, __file__, '--model-memory', layout, str(count)])
+        results[layout] = float(output)
+    print "memory   %6d File    legacy %6.1f MB  slots %6.1f MB  (%.0f vs %.0f bytes per File)" % (
+        count, results['legacy'], results['slots'], results['legacy'] * 1024 * 1024 / count, results['slots'] * 1024 * 1024 / count)
+
+
+def benchmarkListRequest(count):
+    '''
+    Compares the legacy and the current list-response path of __listRequest__ on a File listing,
+    and a projection of the fields Id, Path and Size;
+    each path runs in a new python process, so that its peak memory is measured from the same baseline
+    '''
+    results = {}
+    for path in ['legacy', 'direct', 'fields']:
+        output = subprocess.check_output([sys.executable, __file__, '--list-request', path, str(count)])
+        results[path] = [float(v) for v in output.split()]
+    print "list     %6d File    legacy %7.3fs %6.1f MB  direct %7.3fs %6.1f MB  speedup %.1fx" % (
+        count, results['legacy'][0], results['legacy'][1], results['direct'][0], results['direct'][1],
+        results['legacy'][0] / results['direct'][0])
+    print "list     %6d File    direct %7.3fs %6.1f MB  fields %7.3fs %6.1f MB  speedup %.1fx" % (
+        count, results['direct'][0], results['direct'][1], results['fields'][0], results['fields'][1],
+        results['direct'][0] / results['fields'][0])
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--list-request':
+        print "%f %f" % listRequest(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+    if len(sys.argv) == 4 and sys.argv[1] == '--model-memory':
+        print "%f" % modelMemory(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    benchmarkDeserialize(count)
+    benchmarkDatetime(count)
+    benchmarkLazyScan(count)
+    benchmarkListRequest(count)
+    benchmarkPrefetch(count)
+    benchmarkModelMemory(count * 10)